@@ -0,0 +1,286 @@
+"""Drive both architectures through scripted conversations against a deterministic offline model.
+
+The scripted model plays the part of the LLM: it routes or delegates to the right place, makes the
+tool calls each task needs, then answers. No API calls are made, but each model request can sleep for
+a simulated latency so round-trip counts show up in wall time.
+
+Run from the repository root, e.g.
+    python -m benchmarks.conversations --sizes 1000 100000 --latency 0.05 --output bench.json
+"""
+import argparse
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field, asdict
+from datetime import timedelta
+import json
+import resource
+import time
+from typing import Any
+
+from pydantic_ai import ModelMessage
+from pydantic_ai.messages import (
+    ModelRequest, ModelResponse, RetryPromptPart, TextPart, ToolCallPart, ToolReturnPart, UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from src.history import estimate_tokens
+from src.instrumentation import Instrumentation
+from src.repositories import InMemoryJobRepository, InMemoryApprovalRepository
+from src.stores import JobStore, ApprovalStore
+
+from .data import build_stores, EPOCH
+
+ToolCall = tuple[str, dict[str, Any]]
+
+
+@dataclass
+class Task:
+    name: str
+    prompt: str
+    mode: str
+    calls: Callable[[JobStore, ApprovalStore], list[ToolCall]]
+    
+    
+TASKS = [
+    Task(
+        "list_pending_jobs",
+        "Which jobs are still pending in the first week of January?",
+        "jobs",
+        lambda jobs, approvals: [("get_jobs", {"status": ["pending"], "lte_date": (EPOCH + timedelta(days=7)).isoformat(), "limit": 20})],
+    ),
+    Task(
+        "inspect_job",
+        "Show me the details of the first job.",
+        "jobs",
+        lambda jobs, approvals: [("get_job", {"job_id": next(iter(jobs)).id})],
+    ),
+    Task(
+        "bulk_create_jobs",
+        "Create five follow-up jobs due at the end of March.",
+        "jobs",
+        lambda jobs, approvals: [(
+            "add_jobs",
+            {"jobs": [{"name": f"follow-up {index}", "deadline": "2026-03-31T17:00:00"} for index in range(5)]},
+        )],
+    ),
+    Task(
+        "complete_job",
+        "Mark the first job as completed and then show it again.",
+        "jobs",
+        lambda jobs, approvals: [
+            ("update_job", {"id": next(iter(jobs)).id, "status": "completed"}),
+            ("get_job", {"job_id": next(iter(jobs)).id}),
+        ],
+    ),
+    Task(
+        "approve_request",
+        "Approve the first approval request.",
+        "approvals",
+        lambda jobs, approvals: [("update_approval", {"id": next(iter(approvals)).id, "status": "approved"})],
+    ),
+]
+
+
+@dataclass
+class Counters:
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    tool_calls: int = 0
+    
+    
+def _current_turn(messages: list[ModelMessage]) -> tuple[str, list[ModelMessage]]:
+    # Tool results can carry extra content as user prompt parts; only a request without tool
+    # returns or retries holds the user's own prompt.
+    for index in range(len(messages) - 1, -1, -1):
+        message = messages[index]
+        if isinstance(message, ModelRequest) and not any(
+            isinstance(part, ToolReturnPart | RetryPromptPart) for part in message.parts
+        ):
+            prompts = [part.content for part in message.parts if isinstance(part, UserPromptPart)]
+            if prompts:
+                return str(prompts[-1]), messages[index:]
+    return "", messages
+
+
+def _returned_tools(turn: list[ModelMessage]) -> list[str]:
+    return [
+        part.tool_name
+        for message in turn if isinstance(message, ModelRequest)
+        for part in message.parts if isinstance(part, ToolReturnPart)
+    ]
+
+
+class ScriptedModel:
+    """Deterministic stand-in for the LLM, shared by the core agent and any sub-agents."""
+    
+    def __init__(self, tasks: list[Task], jobs: JobStore, approvals: ApprovalStore, latency: float):
+        self.tasks = {task.prompt: task for task in tasks}
+        self.calls = {task.prompt: task.calls(jobs, approvals) for task in tasks}
+        self.latency = latency
+        self.counters = Counters()
+        self.model = FunctionModel(self.respond, model_name="scripted")
+        
+    async def respond(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        response = self.next_response(messages, info)
+        self.counters.requests += 1
+        self.counters.input_tokens += sum(estimate_tokens(message) for message in messages)
+        self.counters.output_tokens += estimate_tokens(response)
+        self.counters.tool_calls += sum(isinstance(part, ToolCallPart) for part in response.parts)
+        return response
+    
+    def next_response(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        prompt, turn = _current_turn(messages)
+        returned = _returned_tools(turn)
+        tool_names = {tool.name for tool in info.function_tools}
+        task = self.tasks.get(prompt)
+        if task is None:
+            # Sub-agents see the delegated description wrapped in the library's task instructions.
+            task = next((task for known, task in self.tasks.items() if known in prompt), None)
+        if task is None:
+            return ModelResponse(parts=[TextPart("I don't know how to help with that.")])
+        if "task" in tool_names:
+            if "task" not in returned:
+                return ModelResponse(parts=[ToolCallPart("task", {"description": task.prompt, "subagent_type": f"{task.mode}_agent"})])
+            return ModelResponse(parts=[TextPart(f"Done: {task.name}")])
+        scripted = self.calls[task.prompt]
+        already_routed = all(tool_name in tool_names for tool_name, _ in scripted)
+        if "route_to_agent" in tool_names and "route_to_agent" not in returned and not already_routed:
+            return ModelResponse(parts=[ToolCallPart("route_to_agent", {"agent_mode": task.mode})])
+        done = sum(1 for name in returned if name != "route_to_agent")
+        if done < len(scripted):
+            tool_name, args = scripted[done]
+            return ModelResponse(parts=[ToolCallPart(tool_name, args)])
+        return ModelResponse(parts=[TextPart(f"Done: {task.name}")])
+    
+    
+@dataclass
+class TaskResult:
+    architecture: str
+    size: int
+    task: str
+    wall_ms: float
+    requests: int
+    input_tokens: int
+    output_tokens: int
+    tool_calls: int
+    
+    
+@dataclass
+class RunSummary:
+    architecture: str
+    size: int
+    load_ms: float
+    max_rss_mb: float
+    tasks: list[TaskResult] = field(default_factory=list)
+    
+    
+def build_agent_and_deps(
+    architecture: str,
+    model: FunctionModel,
+    jobs: JobStore,
+    approvals: ApprovalStore,
+    pre_route: bool = False,
+    sticky: bool = False,
+    instrumentation: Instrumentation | None = None,
+) -> tuple[Any, Any]:
+    repositories = {"jobs": InMemoryJobRepository(jobs), "approvals": InMemoryApprovalRepository(approvals)}
+    if architecture == "agent_modes":
+        from src.agent_modes.core import create_core_agent
+        from src.agent_modes.deps import Deps
+        from src.agent_modes.enums import ModeRetention
+        from src.agent_modes.pre_router import KeywordPreRouter
+        return create_core_agent(model=model, instrumentation=instrumentation), Deps(
+            **repositories,
+            pre_router=KeywordPreRouter() if pre_route else None,
+            mode_retention=ModeRetention.STICKY if sticky else ModeRetention.RESET,
+        )
+    from src.sub_agents.core import create_core_agent
+    from src.sub_agents.deps import Deps
+    return create_core_agent(model=model, instrumentation=instrumentation), Deps(**repositories)
+
+
+async def run_architecture(
+    architecture: str,
+    size: int,
+    latency: float,
+    seed: int,
+    pre_route: bool = False,
+    sticky: bool = False,
+) -> RunSummary:
+    start = time.perf_counter()
+    jobs, approvals = build_stores(size, size // 2, seed)
+    load_ms = (time.perf_counter() - start) * 1000
+    scripted = ScriptedModel(TASKS, jobs, approvals, latency)
+    agent, deps = build_agent_and_deps(architecture, scripted.model, jobs, approvals, pre_route, sticky)
+    if hasattr(deps, "agent_mode"):
+        from src.agent_modes.main import start_turn
+    else:
+        start_turn = None
+    summary = RunSummary(architecture, size, load_ms, 0.0)
+    history: list[ModelMessage] = []
+    for task in TASKS:
+        if start_turn is not None:
+            start_turn(deps, task.prompt)
+        before = asdict(scripted.counters)
+        start = time.perf_counter()
+        result = await agent.run(task.prompt, message_history=history, deps=deps)
+        wall_ms = (time.perf_counter() - start) * 1000
+        history = result.all_messages()
+        after = asdict(scripted.counters)
+        summary.tasks.append(TaskResult(
+            architecture=architecture,
+            size=size,
+            task=task.name,
+            wall_ms=wall_ms,
+            **{key: after[key] - before[key] for key in after},
+        ))
+    summary.max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return summary
+
+
+def print_summary(summary: RunSummary) -> None:
+    print(f"\n{summary.architecture} | {summary.size} jobs | load {summary.load_ms:.0f} ms | max RSS {summary.max_rss_mb:.0f} MB")
+    print(f"  {'task':<20} {'wall ms':>9} {'requests':>9} {'in tok':>8} {'out tok':>8} {'tools':>6}")
+    for result in summary.tasks:
+        print(
+            f"  {result.task:<20} {result.wall_ms:>9.1f} {result.requests:>9} "
+            f"{result.input_tokens:>8} {result.output_tokens:>8} {result.tool_calls:>6}"
+        )
+    total = lambda key: sum(getattr(result, key) for result in summary.tasks)
+    print(
+        f"  {'total':<20} {total('wall_ms'):>9.1f} {total('requests'):>9} "
+        f"{total('input_tokens'):>8} {total('output_tokens'):>8} {total('tool_calls'):>6}"
+    )
+    
+    
+async def run(args: argparse.Namespace) -> list[RunSummary]:
+    summaries = []
+    for size in args.sizes:
+        for architecture in args.architectures:
+            summary = await run_architecture(architecture, size, args.latency, args.seed, args.pre_route, args.sticky)
+            print_summary(summary)
+            summaries.append(summary)
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000], help="Number of synthetic jobs (approvals are half that)")
+    parser.add_argument("--architectures", nargs="+", choices=["agent_modes", "sub_agents"], default=["agent_modes", "sub_agents"])
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated seconds per model request")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pre-route", action="store_true", help="Let agent_modes pick obvious modes without a route_to_agent call")
+    parser.add_argument("--sticky", action="store_true", help="Keep the agent_modes mode across turns instead of resetting to the router")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+    summaries = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump([asdict(summary) for summary in summaries], f, indent=2)
+            
+            
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Synthetic, reproducible jobs and approvals for benchmarks."""
+from datetime import datetime, timedelta
+import random
+from uuid import UUID
+
+from src.schemas import Job, JobStatus, Approval, ApprovalStatus
+from src.stores import JobStore, ApprovalStore
+
+NAME_WORDS = ["deploy", "audit", "migrate", "backup", "report", "review", "invoice", "onboard", "patch", "forecast"]
+PEOPLE = ["alice", "bob", "carol", "dave", "erin", "frank", "grace", "heidi"]
+EPOCH = datetime(2026, 1, 1)
+
+
+def generate_jobs(count: int, seed: int = 0) -> list[Job]:
+    rng = random.Random(seed)
+    statuses = list(JobStatus)
+    return [
+        Job(
+            id=f"job_{UUID(int=index)}",
+            name=f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)} #{index}",
+            deadline=EPOCH + timedelta(minutes=rng.randrange(365 * 24 * 60)),
+            status=rng.choice(statuses),
+        )
+        for index in range(count)
+    ]
+
+
+def generate_approvals(count: int, jobs: list[Job], seed: int = 0) -> list[Approval]:
+    rng = random.Random(seed + 1)
+    # A separate generator, so adding creation times left the other fields unchanged.
+    created = random.Random(seed + 2)
+    statuses = list(ApprovalStatus)
+    return [
+        Approval(
+            id=f"approval_{UUID(int=index)}",
+            person=rng.choice(PEOPLE),
+            request=f"Sign off {rng.choice(NAME_WORDS)} for {job.name}",
+            status=rng.choice(statuses),
+            job_id=job.id,
+            created_at=EPOCH - timedelta(minutes=created.randrange(90 * 24 * 60)),
+        )
+        for index, job in ((index, rng.choice(jobs)) for index in range(count))
+    ] if jobs else []
+
+
+def build_stores(job_count: int, approval_count: int, seed: int = 0) -> tuple[JobStore, ApprovalStore]:
+    jobs = generate_jobs(job_count, seed)
+    return JobStore(jobs), ApprovalStore(generate_approvals(approval_count, jobs, seed))
@@ -0,0 +1,117 @@
+"""Replay a recorded conversation offline through the core agent to profile local overhead.
+
+The recording's model responses are fed back through a stub model, so no API calls are made and
+the time left is tools, stores, serialization and agent plumbing. Record a session with
+`--record session.jsonl` on either CLI, then run from the repository root, e.g.
+    python -m benchmarks.replay session.jsonl --output before.json
+    (make a change)
+    python -m benchmarks.replay session.jsonl --baseline before.json
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass, asdict
+import json
+import time
+
+from pydantic_ai import ModelMessage
+
+from src.instrumentation import Instrumentation
+from src.recording import RecordedTurn, ReplayModel, load_recording
+from src.stores import JobStore, ApprovalStore
+
+from .conversations import build_agent_and_deps
+from .data import build_stores
+
+
+@dataclass
+class TurnReplay:
+    turn: int
+    input: str
+    recorded_ms: float
+    replay_ms: float
+    requests: int
+    tool_calls: int
+    diverged: int
+
+
+async def replay(
+    turns: list[RecordedTurn],
+    architecture: str,
+    size: int,
+    seed: int,
+) -> tuple[list[TurnReplay], Instrumentation, ReplayModel]:
+    instrumentation = Instrumentation()
+    stub = ReplayModel()
+    jobs, approvals = build_stores(size, size // 2, seed) if size else (JobStore(), ApprovalStore())
+    agent, deps = build_agent_and_deps(architecture, stub.model, jobs, approvals, instrumentation=instrumentation)
+    history: list[ModelMessage] = []
+    results = []
+    for index, turn in enumerate(turns):
+        stub.start(turn)
+        if turn.mode is not None and hasattr(deps, "agent_mode"):
+            deps.agent_mode = type(deps.agent_mode)(turn.mode)
+        diverged = stub.diverged
+        start = time.perf_counter()
+        result = await agent.run(turn.input, message_history=history, deps=deps)
+        replay_ms = (time.perf_counter() - start) * 1000
+        history = result.all_messages()
+        usage = result.usage()
+        results.append(TurnReplay(
+            turn=index,
+            input=turn.input,
+            recorded_ms=turn.wall_ms,
+            replay_ms=replay_ms,
+            requests=usage.requests,
+            tool_calls=usage.tool_calls,
+            diverged=stub.diverged - diverged,
+        ))
+    return results, instrumentation, stub
+
+
+def print_results(results: list[TurnReplay], baseline: list[dict] | None) -> None:
+    header = f"  {'turn':>4} {'input':<32} {'recorded ms':>12} {'replay ms':>10} {'requests':>9} {'tools':>6} {'diverged':>9}"
+    print(header + (f" {'baseline ms':>12} {'change':>8}" if baseline else ""))
+    for result in results:
+        line = (
+            f"  {result.turn:>4} {result.input[:32]:<32} {result.recorded_ms:>12.1f} {result.replay_ms:>10.2f} "
+            f"{result.requests:>9} {result.tool_calls:>6} {result.diverged:>9}"
+        )
+        if baseline and result.turn < len(baseline):
+            before = baseline[result.turn]["replay_ms"]
+            line += f" {before:>12.2f} {(result.replay_ms - before) / before:>+8.1%}" if before else ""
+        print(line)
+    total = lambda key: sum(getattr(result, key) for result in results)
+    line = f"  {'':>4} {'total':<32} {total('recorded_ms'):>12.1f} {total('replay_ms'):>10.2f} {total('requests'):>9} {total('tool_calls'):>6} {total('diverged'):>9}"
+    if baseline:
+        before = sum(turn["replay_ms"] for turn in baseline)
+        line += f" {before:>12.2f} {(total('replay_ms') - before) / before:>+8.1%}" if before else ""
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("recording", help="JSON-lines file written with --record")
+    parser.add_argument("--architecture", choices=["agent_modes", "sub_agents"], default="agent_modes")
+    parser.add_argument("--size", type=int, default=0, help="Synthetic jobs to preload (approvals are half that); the live session's data is not recorded")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write per-turn results as JSON to this path")
+    parser.add_argument("--baseline", help="A previous --output file to compare replay times against")
+    args = parser.parse_args()
+    turns = load_recording(args.recording)
+    results, instrumentation, stub = asyncio.run(replay(turns, args.architecture, args.size, args.seed))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["turns"]
+    print(f"\n{args.recording} | {len(turns)} turns | {args.architecture}")
+    print_results(results, baseline)
+    if stub.misses:
+        print(f"  {stub.misses} model requests went past the end of the recording")
+    print(instrumentation.report())
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"turns": [asdict(result) for result in results]}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Measure CLI import time per architecture and the cost of building agents cold vs. from the registry.
+
+Run from the repository root with `python -m benchmarks.startup`.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def time_subprocess(code: str, repeat: int) -> float:
+    env = {**os.environ, "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY", "benchmark")}
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True, env=env)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    
+    print(f"{'scenario':<45} {'median (ms)':>12}")
+    scenarios = {
+        "python interpreter only": "pass",
+        "import src (CLI entry point)": "import src.__main__",
+        "import agent_modes CLI": "import src.agent_modes.main",
+        "import sub_agents CLI": "import src.sub_agents.main",
+        "import both CLIs": "import src.agent_modes.main, src.sub_agents.main",
+    }
+    for name, code in scenarios.items():
+        print(f"{name:<45} {time_subprocess(code, args.repeat) * 1000:>12.1f}")
+        
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    from src.registry import get_core_agent
+    for architecture in ("agent_modes", "sub_agents"):
+        start = time.perf_counter()
+        get_core_agent(architecture)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        get_core_agent(architecture)
+        warm = time.perf_counter() - start
+        print(f"{'build ' + architecture + ' agent (first)':<45} {cold * 1000:>12.1f}")
+        print(f"{'build ' + architecture + ' agent (registry hit)':<45} {warm * 1000:>12.3f}")
+        
+        
+if __name__ == "__main__":
+    main()
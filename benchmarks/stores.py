@@ -0,0 +1,99 @@
+"""Compare memory and throughput of the model-per-record stores against the columnar stores.
+
+Run from the repository root, e.g. `python -m benchmarks.stores --sizes 100000 1000000`.
+"""
+import argparse
+from collections.abc import Callable
+from datetime import timedelta
+import gc
+from itertools import islice
+import random
+import time
+import tracemalloc
+
+from src.schemas import JobStatus, ApprovalStatus
+from src.stores import JobStore, ApprovalStore, ColumnarJobStore, ColumnarApprovalStore
+
+from .data import generate_jobs, generate_approvals, EPOCH
+
+LAYOUTS = {
+    "models": (JobStore, ApprovalStore),
+    "columnar": (ColumnarJobStore, ColumnarApprovalStore),
+}
+
+
+def measure_build(layout: str, size: int, seed: int) -> tuple[object, object, float, float]:
+    """Build both stores from freshly generated models, returning them with load seconds and retained MB."""
+    job_store_type, approval_store_type = LAYOUTS[layout]
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    jobs = generate_jobs(size, seed)
+    approvals = generate_approvals(size // 2, jobs, seed)
+    job_store, approval_store = job_store_type(jobs), approval_store_type(approvals)
+    del jobs, approvals
+    load = time.perf_counter() - start
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    return job_store, approval_store, load, retained
+
+
+def ops_per_second(operation: Callable[[], object], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        operation()
+    return repeat / (time.perf_counter() - start)
+
+
+def run(layout: str, size: int, seed: int, repeat: int) -> dict[str, float]:
+    job_store, approval_store, load, retained = measure_build(layout, size, seed)
+    rng = random.Random(seed)
+    job_ids = [job.id for job in islice(job_store, 1000)]
+    week = (EPOCH + timedelta(days=90), EPOCH + timedelta(days=97))
+    results = {
+        "load s": load,
+        "retained MB": retained,
+        "get/s": ops_per_second(lambda: job_store.get(rng.choice(job_ids)), repeat * 10),
+        "page/s": ops_per_second(
+            lambda: list(islice(job_store.query(statuses=[JobStatus.FAILED]), 20)), repeat
+        ),
+        "week scan/s": ops_per_second(
+            lambda: sum(1 for _ in job_store.query(gte_date=week[0], lte_date=week[1], statuses=[JobStatus.PENDING])), repeat
+        ),
+        "status count/s": ops_per_second(
+            lambda: sum(1 for _ in approval_store.by_status([ApprovalStatus.PENDING])), max(repeat // 100, 1)
+        ),
+        "stats/s": ops_per_second(
+            lambda: (job_store.status_counts(), approval_store.status_counts(), approval_store.person_counts("alice")), repeat * 10
+        ),
+        "search/s": ops_per_second(lambda: job_store.search(str(rng.randrange(size))), repeat * 10),
+        "fuzzy search/s": ops_per_second(lambda: job_store.search("deplyo", offset=100), repeat * 10),
+        "2-word search/s": ops_per_second(lambda: job_store.search("deploy audit"), max(repeat // 100, 1)),
+        "histogram/s": ops_per_second(
+            lambda: job_store.deadline_histogram([JobStatus.PENDING, JobStatus.IN_PROGRESS]), max(repeat // 10, 1)
+        ),
+        "waits/s": ops_per_second(approval_store.pending_by_person, max(repeat // 10, 1)),
+        "update/s": ops_per_second(
+            lambda: job_store.update(rng.choice(job_ids), {"status": rng.choice(list(JobStatus))}), repeat
+        ),
+    }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000], help="Number of synthetic jobs (approvals are half that)")
+    parser.add_argument("--repeat", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for size in args.sizes:
+        print(f"\n{size} jobs, {size // 2} approvals")
+        rows = {layout: run(layout, size, args.seed, args.repeat) for layout in LAYOUTS}
+        print(f"  {'metric':<16}" + "".join(f"{layout:>14}" for layout in rows))
+        for metric in rows["models"]:
+            print(f"  {metric:<16}" + "".join(f"{values[metric]:>14.2f}" for values in rows.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import importlib
+import sys
+
+from .registry import ARCHITECTURES
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in ARCHITECTURES:
+        print(f"usage: python -m src {{{','.join(ARCHITECTURES)}}} [options]", file=sys.stderr)
+        sys.exit(2)
+    architecture = sys.argv.pop(1)
+    # Only the selected architecture is imported, so startup doesn't pay for the other one.
+    importlib.import_module(f".{architecture}.main", __package__).main()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,96 @@
 from typing import cast
 
-from pydantic_ai import Agent, RunContext, ModelMessage
+from pydantic_ai import Agent
+from pydantic_ai.models import Model
 
 from .deps import Deps
 from .tools import (
     create_router_toolset,
     create_approvals_toolset,
     create_jobs_toolset,
+    create_estimations_toolset,
+    create_stats_toolset,
+    ModeGatedToolset,
 )
 from .enums import AgentModes
-from ..utils import model_factory
+from ..history import create_history_processor
+from ..instrumentation import Instrumentation, InstrumentedModel, InstrumentedToolset
+from ..registry import get_model, shared_toolset
+from ..retry_budget import RetryBudgetToolset
     
     
-def get_system_prompt() -> str:
-    return (
+def get_system_prompt(stable_tools: bool = False) -> str:
+    prompt = (
         "You are a helpful assistant that provides information to users based on their requests. "
         "You can only help the user via tool calls and responding with information. "
         "All information must come from the tools you use and the context available to you. "
         "Do not invent information or tools."
     )
+    if stable_tools:
+        prompt += (
+            " Job tools only work in jobs mode, approval tools only in approvals mode and "
+            "workload, overdue and approval-wait estimates only in estimations mode, "
+            "so call route_to_agent to switch mode before using them."
+        )
+    return prompt
 
 
-def context_processor(
-    ctx: RunContext[Deps],
-    messages: list[ModelMessage],
-) -> list[ModelMessage]:
-    if len(messages) >= ctx.deps.max_messages:
-        messages = messages[-ctx.deps.reduce_messages_to:]
-    return messages
-
-
-def create_core_agent() -> Agent[Deps]:
+def create_core_agent(
+    stable_tools: bool = False,
+    model: Model | None = None,
+    instrumentation: Instrumentation | None = None,
+) -> Agent[Deps]:
+    """Create the core agent.
+    
+    With `stable_tools`, every tool is listed on every request and mode gating happens when a
+    tool is called, so the instructions and tool definitions stay byte-identical across turns
+    and mode switches and the provider's prompt prefix cache keeps hitting.
+    
+    Retries the tools ask for are capped per run by `Deps.retry_budget`.
+    
+    With `instrumentation`, every model request and tool call, route_to_agent hops included,
+    is recorded as a span.
+    """
+    if stable_tools:
+        mode_toolsets = [
+            ModeGatedToolset(shared_toolset(create_jobs_toolset, max_retries=5), agent_mode=AgentModes.JOBS),
+            ModeGatedToolset(shared_toolset(create_approvals_toolset, max_retries=5), agent_mode=AgentModes.APPROVALS),
+            ModeGatedToolset(shared_toolset(create_estimations_toolset, max_retries=5), agent_mode=AgentModes.ESTIMATIONS),
+        ]
+    else:
+        mode_toolsets = [
+            shared_toolset(create_jobs_toolset, max_retries=5).filtered(
+                filter_func=lambda ctx, _: cast(Deps, ctx.deps).agent_mode == AgentModes.JOBS
+            ),
+            shared_toolset(create_approvals_toolset, max_retries=5).filtered(
+                filter_func=lambda ctx, _: cast(Deps, ctx.deps).agent_mode == AgentModes.APPROVALS
+            ),
+            shared_toolset(create_estimations_toolset, max_retries=5).filtered(
+                filter_func=lambda ctx, _: cast(Deps, ctx.deps).agent_mode == AgentModes.ESTIMATIONS
+            ),
+        ]
+    toolsets = [
+        RetryBudgetToolset(toolset)
+        for toolset in (
+            shared_toolset(create_router_toolset, max_retries=5),
+            # Counts are answered in any mode, without a route_to_agent hop.
+            shared_toolset(create_stats_toolset, max_retries=5),
+            *mode_toolsets,
+        )
+    ]
+    model = model or get_model()
+    if instrumentation is not None:
+        model = InstrumentedModel(model, instrumentation)
+        toolsets = [InstrumentedToolset(toolset, instrumentation) for toolset in toolsets]
     agent = Agent(
-        model=model_factory(),
-        instructions=get_system_prompt(),
+        model=model,
+        instructions=get_system_prompt(stable_tools),
         deps_type=Deps,
         name="Core Agent",
         history_processors=[
-            context_processor
+            create_history_processor(),
         ],
         retries=5,
-        toolsets=[
-            create_router_toolset(max_retries=5),
-            create_jobs_toolset(max_retries=5).filtered(
-                filter_func=lambda ctx, _: cast(Deps, ctx.deps).agent_mode == AgentModes.JOBS
-            ),
-            create_approvals_toolset(max_retries=5).filtered(
-                filter_func=lambda ctx, _: cast(Deps, ctx.deps).agent_mode == AgentModes.APPROVALS
-            ),
-        ],
+        toolsets=toolsets,
     )
     return agent
\ No newline at end of file
@@ -1,13 +1,32 @@
 from dataclasses import dataclass, field
 
-from .enums import AgentModes
-from ..schemas import Job, Approval
+from .enums import AgentModes, ModeRetention
+from .pre_router import PreRouter
+from .routing import RoutingStats
+from ..instrumentation import Instrumentation
+from ..prompt_cache import PromptCacheStats
+from ..read_memo import RunMemo
+from ..recording import ConversationRecorder
+from ..response_cache import ResponseCache
+from ..retry_budget import RetryBudget
+from ..repositories import JobRepository, ApprovalRepository, InMemoryJobRepository, InMemoryApprovalRepository
 
 
 @dataclass
 class Deps:
     agent_mode: AgentModes = AgentModes.ROUTER
-    jobs: list[Job] = field(default_factory=list)
-    approvals: list[Approval] = field(default_factory=list)
-    max_messages: int = 15
-    reduce_messages_to: int = 10
\ No newline at end of file
+    jobs: JobRepository = field(default_factory=InMemoryJobRepository)
+    approvals: ApprovalRepository = field(default_factory=InMemoryApprovalRepository)
+    history_token_budget: int = 8000
+    summary_token_budget: int = 1000
+    max_result_tokens: int = 4000
+    prompt_cache: PromptCacheStats = field(default_factory=PromptCacheStats)
+    pre_router: PreRouter | None = None
+    mode_retention: ModeRetention = ModeRetention.RESET
+    routing: RoutingStats = field(default_factory=RoutingStats)
+    response_cache: ResponseCache | None = None
+    instrumentation: Instrumentation | None = None
+    recorder: ConversationRecorder | None = None
+    retry_budget: RetryBudget = field(default_factory=RetryBudget)
+    job_reads: RunMemo = field(default_factory=RunMemo)
+    approval_reads: RunMemo = field(default_factory=RunMemo)
\ No newline at end of file
@@ -8,10 +8,15 @@ class AgentModes(str, Enum):
     ESTIMATIONS = "estimations"
     
     
+class ModeRetention(str, Enum):
+    RESET = "reset"
+    STICKY = "sticky"
+    
+    
 class SelectableAgentModes(str, Enum):
     JOBS = "jobs"
     APPROVALS = "approvals"
-    # ESTIMATIONS = "estimations"
+    ESTIMATIONS = "estimations"
     
     
 def convert_agent_mode_to_selectable(agent_mode: AgentModes) -> SelectableAgentModes | None:
@@ -20,8 +25,8 @@ def convert_agent_mode_to_selectable(agent_mode: AgentModes) -> SelectableAgentM
             return SelectableAgentModes.JOBS
         case AgentModes.APPROVALS.value:
             return SelectableAgentModes.APPROVALS
-        # case AgentModes.ESTIMATIONS.value:
-        #     return SelectableAgentModes.ESTIMATIONS
+        case AgentModes.ESTIMATIONS.value:
+            return SelectableAgentModes.ESTIMATIONS
         case _:
             return None
         
@@ -31,7 +36,7 @@ def convert_selectable_agent_mode_to_agent_mode(selectable_agent_mode: Selectabl
             return AgentModes.JOBS
         case SelectableAgentModes.APPROVALS.value:
             return AgentModes.APPROVALS
-        # case SelectableAgentModes.ESTIMATIONS.value:
-        #     return AgentModes.ESTIMATIONS
+        case SelectableAgentModes.ESTIMATIONS.value:
+            return AgentModes.ESTIMATIONS
         case _:
             raise ValueError("Invalid selectable agent mode: " + selectable_agent_mode.value)
\ No newline at end of file
@@ -0,0 +1,53 @@
+from collections.abc import Callable, Mapping
+import math
+import re
+
+from .enums import SelectableAgentModes
+
+PreRouter = Callable[[str], SelectableAgentModes | None]
+"""Classifies a user message into a mode before the first model request, or returns None to leave it to the LLM."""
+
+MODE_KEYWORDS: dict[SelectableAgentModes, frozenset[str]] = {
+    SelectableAgentModes.JOBS: frozenset({
+        "job", "jobs", "deadline", "deadlines", "due", "overdue", "complete", "completed", "finish",
+        "finished", "progress", "failed", "pending", "schedule", "scheduled",
+    }),
+    SelectableAgentModes.APPROVALS: frozenset({
+        "approval", "approvals", "approve", "approved", "approver", "approvers", "reject", "rejected",
+        "decline", "declined", "signoff", "sign", "pending",
+    }),
+    SelectableAgentModes.ESTIMATIONS: frozenset({
+        "estimate", "estimates", "estimation", "forecast", "forecasts", "projection", "projected", "risk",
+        "workload", "capacity", "histogram", "wait", "waiting", "overdue", "late",
+    }),
+}
+
+_WORD = re.compile(r"[a-z]+")
+
+
+class KeywordPreRouter:
+    """Score each mode by the IDF-weighted keywords it shares with the message.
+
+    A keyword that several modes claim (like "pending") weighs less than one unique to a mode.
+    The winning mode is used only if it holds at least `min_confidence` of the total score, so
+    messages that mention several modes, or none, still go through route_to_agent.
+    """
+
+    def __init__(self, keywords: Mapping[SelectableAgentModes, frozenset[str]] = MODE_KEYWORDS, min_confidence: float = 0.7):
+        self.keywords = keywords
+        self.min_confidence = min_confidence
+        modes = len(keywords)
+        self.weights: dict[str, float] = {}
+        for terms in keywords.values():
+            for term in terms:
+                claimed = sum(term in other for other in keywords.values())
+                self.weights[term] = math.log(1 + modes / claimed)
+
+    def __call__(self, user_input: str) -> SelectableAgentModes | None:
+        words = set(_WORD.findall(user_input.lower()))
+        scores = {mode: sum(self.weights[word] for word in words & terms) for mode, terms in self.keywords.items()}
+        total = sum(scores.values())
+        if not total:
+            return None
+        mode, best = max(scores.items(), key=lambda item: item[1])
+        return mode if best / total >= self.min_confidence else None
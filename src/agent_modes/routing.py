@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RoutingStats:
+    """Per-session counts of turns that started in a mode without a route_to_agent round-trip.
+    
+    A turn starts in a mode either because the pre-router picked it or because the previous
+    turn's mode was retained. A route_to_agent call made while already in a mode means that
+    head start was wrong (or the user moved on), so it does not count as a saved request.
+    """
+    
+    turns: int = 0
+    pre_routed: int = 0
+    retained: int = 0
+    rerouted: int = 0
+    head_start: bool = field(default=False, repr=False)
+    
+    def record_start(self, pre_routed: bool = False, retained: bool = False) -> None:
+        self.turns += 1
+        self.pre_routed += pre_routed
+        self.retained += retained
+        self.head_start = pre_routed or retained
+        
+    def record_route(self) -> None:
+        """Count the first route_to_agent call of a turn that had a head start."""
+        if self.head_start:
+            self.rerouted += 1
+            self.head_start = False
+        
+    @property
+    def saved_requests(self) -> int:
+        return max(self.pre_routed + self.retained - self.rerouted, 0)
+    
+    @property
+    def hit_rate(self) -> float:
+        return (self.pre_routed + self.retained) / self.turns if self.turns else 0.0
+    
+    def report(self) -> str:
+        return (
+            f"Routing: {self.hit_rate:.1%} of {self.turns} turns started in a mode "
+            f"({self.pre_routed} pre-routed, {self.retained} retained, {self.rerouted} re-routed), "
+            f"{self.saved_requests} model requests saved"
+        )
@@ -1,10 +1,15 @@
 from .router import route_to_agent, create_router_toolset
+from .gating import ModeGatedToolset
 from .jobs import (
     add_job,
     update_job,
     delete_job,
     get_job,
     get_jobs,
+    search_jobs,
+    add_jobs,
+    update_jobs,
+    delete_jobs,
     create_jobs_toolset
 )
 from .approvals import (
@@ -12,21 +17,47 @@ from .approvals import (
     update_approval,
     delete_approval,
     get_approval,
+    search_approvals,
+    add_approvals,
+    update_approvals,
+    delete_approvals,
     create_approvals_toolset,
 )
+from .stats import get_stats, create_stats_toolset
+from .estimations import (
+    get_workload,
+    get_overdue_projection,
+    get_approval_waits,
+    create_estimations_toolset,
+)
 
 __all__ = [
     "route_to_agent",
     "create_router_toolset",
+    "ModeGatedToolset",
     "add_job",
     "update_job",
     "delete_job",
     "get_job",
     "get_jobs",
+    "search_jobs",
+    "add_jobs",
+    "update_jobs",
+    "delete_jobs",
     "create_jobs_toolset",
     "add_approval",
     "update_approval",
     "delete_approval",
     "get_approval",
+    "search_approvals",
+    "add_approvals",
+    "update_approvals",
+    "delete_approvals",
     "create_approvals_toolset",
+    "get_workload",
+    "get_overdue_projection",
+    "get_approval_waits",
+    "create_estimations_toolset",
+    "get_stats",
+    "create_stats_toolset",
 ]
\ No newline at end of file
@@ -1,9 +1,11 @@
-import json
-
 from pydantic_ai import ToolReturn, RunContext, ModelRetry, FunctionToolset, Tool
 
 from ..deps import Deps
+from ...repositories import RecordsNotFoundError
+from ...retry_budget import not_found
+from ...serialization import dump_record, dump_compact
 from ...schemas import Approval, ApprovalCreate, ApprovalUpdate, ApprovalDelete
+from .jobs import SearchQuery, search_summary
 
 
 async def add_approval(ctx: RunContext[Deps], approval: ApprovalCreate) -> ToolReturn:
@@ -11,47 +13,104 @@ async def add_approval(ctx: RunContext[Deps], approval: ApprovalCreate) -> ToolR
     new_approval = Approval(
         **approval.model_dump(),
     )
-    ctx.deps.approvals.append(new_approval)
+    before = ctx.deps.approvals.version
+    await ctx.deps.approvals.add(new_approval)
+    payload = dump_record(new_approval)
+    ctx.deps.approval_reads.put(ctx.run_id, before, ctx.deps.approvals.version, new_approval.id, payload)
     return ToolReturn(
         return_value="Created a new approval request for: " + new_approval.person,
-        content=json.dumps(new_approval.model_dump(mode="json")),
+        content=payload,
     )
     
     
 async def update_approval(ctx: RunContext[Deps], approval: ApprovalUpdate) -> ToolReturn:
     """Update an existing approval request with the given ID and new data."""
     data = approval.model_dump(exclude_unset=True)
-    existing_approval = next((a for a in ctx.deps.approvals if a.id == approval.id), None)
+    before = ctx.deps.approvals.version
+    existing_approval = await ctx.deps.approvals.update(approval.id, data)
     if not existing_approval:
-        return ModelRetry("Approval not found with ID: " + approval.id)
-    for key, value in data.items():
-        setattr(existing_approval, key, value)
+        return await not_found(ctx, ctx.deps.approvals, Approval, [approval.id])
+    payload = dump_record(existing_approval)
+    ctx.deps.approval_reads.put(ctx.run_id, before, ctx.deps.approvals.version, approval.id, payload)
     return ToolReturn(
         return_value="Updated approval with ID: " + approval.id,
-        content=json.dumps(existing_approval.model_dump(mode="json")),
+        content=payload,
     )
     
     
 async def delete_approval(ctx: RunContext[Deps], approval: ApprovalDelete) -> ToolReturn:
     """Delete an existing approval request with the given ID from the list of approvals in the dependencies."""
-    existing_approval = next((a for a in ctx.deps.approvals if a.id == approval.id), None)
+    before = ctx.deps.approvals.version
+    existing_approval = await ctx.deps.approvals.delete(approval.id)
     if not existing_approval:
-        return ModelRetry("Approval not found with ID: " + approval.id)
-    ctx.deps.approvals.remove(existing_approval)
+        return await not_found(ctx, ctx.deps.approvals, Approval, [approval.id])
+    ctx.deps.approval_reads.discard(ctx.run_id, before, ctx.deps.approvals.version, [approval.id])
     return ToolReturn(
         return_value="Deleted approval with ID: " + approval.id,
-        content=json.dumps(existing_approval.model_dump(mode="json")),
+        content=dump_record(existing_approval),
     )
     
     
 async def get_approval(ctx: RunContext[Deps], approval_id: str) -> ToolReturn:
     """Get an existing approval request with the given ID from the list of approvals in the dependencies."""
-    existing_approval = next((a for a in ctx.deps.approvals if a.id == approval_id), None)
-    if not existing_approval:
-        return ModelRetry("Approval not found with ID: " + approval_id)
+    payload = await ctx.deps.approval_reads.get(ctx.run_id, ctx.deps.approvals.version, approval_id, ctx.deps.approvals.get_json)
+    if payload is None:
+        return await not_found(ctx, ctx.deps.approvals, Approval, [approval_id])
     return ToolReturn(
         return_value="Found approval with ID: " + approval_id,
-        content=json.dumps(existing_approval.model_dump(mode="json")),
+        content=payload,
+    )
+    
+    
+async def add_approvals(ctx: RunContext[Deps], approvals: list[ApprovalCreate]) -> ToolReturn:
+    """Create several new approval requests in one call, and add them all to the approvals in the dependencies."""
+    before = ctx.deps.approvals.version
+    new_approvals = await ctx.deps.approvals.add_many([Approval(**approval.model_dump()) for approval in approvals])
+    ctx.deps.approval_reads.discard(ctx.run_id, before, ctx.deps.approvals.version, [approval.id for approval in new_approvals])
+    return ToolReturn(
+        return_value=f"Created {len(new_approvals)} approval requests",
+        content=dump_compact([{"id": approval.id, "person": approval.person} for approval in new_approvals]),
+    )
+    
+    
+async def update_approvals(ctx: RunContext[Deps], approvals: list[ApprovalUpdate]) -> ToolReturn:
+    """Update several existing approval requests in one call. Either every update is applied or none are."""
+    updates = {approval.id: approval.model_dump(exclude_unset=True) for approval in approvals}
+    if len(updates) != len(approvals):
+        raise ModelRetry("Each approval ID may only appear once per call")
+    before = ctx.deps.approvals.version
+    try:
+        updated_approvals = await ctx.deps.approvals.update_many(updates)
+    except RecordsNotFoundError as e:
+        return await not_found(ctx, ctx.deps.approvals, Approval, e.ids, "No approvals were updated. ")
+    ctx.deps.approval_reads.discard(ctx.run_id, before, ctx.deps.approvals.version, list(updates))
+    return ToolReturn(
+        return_value=f"Updated {len(updated_approvals)} approval requests",
+        content=dump_compact([{"id": approval_id, "updated": [key for key in data if key != "id"]} for approval_id, data in updates.items()]),
+    )
+    
+    
+async def delete_approvals(ctx: RunContext[Deps], approvals: list[ApprovalDelete]) -> ToolReturn:
+    """Delete several existing approval requests in one call. Either every approval is deleted or none are."""
+    approval_ids = list(dict.fromkeys(approval.id for approval in approvals))
+    before = ctx.deps.approvals.version
+    try:
+        deleted_approvals = await ctx.deps.approvals.delete_many(approval_ids)
+    except RecordsNotFoundError as e:
+        return await not_found(ctx, ctx.deps.approvals, Approval, e.ids, "No approvals were deleted. ")
+    ctx.deps.approval_reads.discard(ctx.run_id, before, ctx.deps.approvals.version, approval_ids)
+    return ToolReturn(
+        return_value=f"Deleted {len(deleted_approvals)} approval requests",
+        content=dump_compact([{"id": approval.id, "person": approval.person} for approval in deleted_approvals]),
+    )
+    
+    
+async def search_approvals(ctx: RunContext[Deps], query: SearchQuery) -> ToolReturn:
+    """Find approval requests by words in the approver's name or the request, returning the IDs of the best matches first."""
+    page = await ctx.deps.approvals.search(query.text, offset=query.offset, limit=query.limit)
+    return ToolReturn(
+        return_value=search_summary("approvals", query, page.total, len(page.keys)),
+        content=dump_compact(page.keys) if page.keys else None,
     )
     
     
@@ -61,6 +120,10 @@ def create_approvals_toolset(**tools_kwargs) -> FunctionToolset[Deps]:
             Tool(function=add_approval, name="add_approval", description="Add a new approval request", **tools_kwargs),
             Tool(function=update_approval, name="update_approval", description="Update an existing approval request", **tools_kwargs),
             Tool(function=delete_approval, name="delete_approval", description="Delete an existing approval request by ID", **tools_kwargs),
+            Tool(function=add_approvals, name="add_approvals", description="Add several new approval requests in a single call", **tools_kwargs),
+            Tool(function=update_approvals, name="update_approvals", description="Update several existing approval requests in a single call", **tools_kwargs),
+            Tool(function=delete_approvals, name="delete_approvals", description="Delete several existing approval requests by ID in a single call", **tools_kwargs),
             Tool(function=get_approval, name="get_approval", description="Get an existing approval request by ID", **tools_kwargs),
+            Tool(function=search_approvals, name="search_approvals", description="Search approvers and requests, tolerating typos, for matching approval IDs", **tools_kwargs),
         ],
     )
\ No newline at end of file
@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic_ai import RunContext, ModelRetry
+from pydantic_ai.toolsets import WrapperToolset, ToolsetTool
+
+from ..deps import Deps
+from ..enums import AgentModes
+
+
+@dataclass
+class ModeGatedToolset(WrapperToolset[Deps]):
+    """Always advertise the wrapped tools, but only run them in the given agent mode.
+    
+    Keeping the tool list identical on every request lets providers reuse the cached
+    prompt prefix across turns and mode switches.
+    """
+    
+    agent_mode: AgentModes = AgentModes.ROUTER
+    
+    async def call_tool(self, name: str, tool_args: dict[str, Any], ctx: RunContext[Deps], tool: ToolsetTool[Deps]) -> Any:
+        if ctx.deps.agent_mode != self.agent_mode:
+            raise ModelRetry(
+                f"Tool {name} is only available in {self.agent_mode.value} mode. "
+                f"Call route_to_agent with {self.agent_mode.value} first."
+            )
+        return await super().call_tool(name, tool_args, ctx, tool)
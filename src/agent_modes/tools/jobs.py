@@ -1,10 +1,13 @@
 from datetime import datetime
-import json
 
 from pydantic import BaseModel, Field
 from pydantic_ai import ToolReturn, RunContext, ModelRetry, FunctionToolset, Tool
 
 from ..deps import Deps
+from ...repositories import RecordsNotFoundError
+from ...retry_budget import not_found
+from ...serialization import dump_record, dump_records, dump_compact
+from ...stores import encode_cursor, decode_cursor
 from ...schemas import JobCreate, JobUpdate, JobDelete, Job, JobStatus
 
 
@@ -13,74 +16,159 @@ async def add_job(ctx: RunContext[Deps], job: JobCreate) -> ToolReturn:
     new_job = Job(
         **job.model_dump(),
     )
-    ctx.deps.jobs.append(new_job)
+    before = ctx.deps.jobs.version
+    await ctx.deps.jobs.add(new_job)
+    payload = dump_record(new_job)
+    ctx.deps.job_reads.put(ctx.run_id, before, ctx.deps.jobs.version, new_job.id, payload)
     return ToolReturn(
         return_value="Created a new job called: " + job.name,
-        content=json.dumps(new_job.model_dump(mode="json")),
+        content=payload,
     )
     
     
 async def update_job(ctx: RunContext[Deps], job: JobUpdate) -> ToolReturn:
     """Update an existing job with the given ID and new data."""
     data = job.model_dump(exclude_unset=True)
-    existing_job = next((j for j in ctx.deps.jobs if j.id == job.id), None)
+    before = ctx.deps.jobs.version
+    existing_job = await ctx.deps.jobs.update(job.id, data)
     if not existing_job:
-        return ModelRetry("Job not found with ID: " + job.id)
-    for key, value in data.items():
-        setattr(existing_job, key, value)
+        return await not_found(ctx, ctx.deps.jobs, Job, [job.id])
+    payload = dump_record(existing_job)
+    ctx.deps.job_reads.put(ctx.run_id, before, ctx.deps.jobs.version, job.id, payload)
     return ToolReturn(
         return_value="Updated job with ID: " + job.id,
-        content=json.dumps(existing_job.model_dump(mode="json")),
+        content=payload,
     )
     
     
 async def delete_job(ctx: RunContext[Deps], job: JobDelete) -> ToolReturn:
     """Delete an existing job with the given ID from the list of jobs in the dependencies."""
-    existing_job = next((j for j in ctx.deps.jobs if j.id == job.id), None)
+    before = ctx.deps.jobs.version
+    existing_job = await ctx.deps.jobs.delete(job.id)
     if not existing_job:
-        return ModelRetry("Job not found with ID: " + job.id)
-    ctx.deps.jobs.remove(existing_job)
+        return await not_found(ctx, ctx.deps.jobs, Job, [job.id])
+    ctx.deps.job_reads.discard(ctx.run_id, before, ctx.deps.jobs.version, [job.id])
     return ToolReturn(
         return_value="Deleted job with ID: " + job.id,
-        content=json.dumps(existing_job.model_dump(mode="json")),
+        content=dump_record(existing_job),
     )
     
     
 async def get_job(ctx: RunContext[Deps], job_id: str) -> ToolReturn:
     """Get an existing job with the given ID from the list of jobs in the dependencies."""
-    existing_job = next((j for j in ctx.deps.jobs if j.id == job_id), None)
-    if not existing_job:
-        return ModelRetry("Job not found with ID: " + job_id)
+    payload = await ctx.deps.job_reads.get(ctx.run_id, ctx.deps.jobs.version, job_id, ctx.deps.jobs.get_json)
+    if payload is None:
+        return await not_found(ctx, ctx.deps.jobs, Job, [job_id])
     return ToolReturn(
         return_value="Found job with ID: " + job_id,
-        content=json.dumps(existing_job.model_dump(mode="json")),
+        content=payload,
+    )
+    
+    
+async def add_jobs(ctx: RunContext[Deps], jobs: list[JobCreate]) -> ToolReturn:
+    """Create several new jobs in one call, and add them all to the jobs in the dependencies."""
+    before = ctx.deps.jobs.version
+    new_jobs = await ctx.deps.jobs.add_many([Job(**job.model_dump()) for job in jobs])
+    ctx.deps.job_reads.discard(ctx.run_id, before, ctx.deps.jobs.version, [job.id for job in new_jobs])
+    return ToolReturn(
+        return_value=f"Created {len(new_jobs)} jobs",
+        content=dump_compact([{"id": job.id, "name": job.name} for job in new_jobs]),
+    )
+    
+    
+async def update_jobs(ctx: RunContext[Deps], jobs: list[JobUpdate]) -> ToolReturn:
+    """Update several existing jobs in one call. Either every update is applied or none are."""
+    updates = {job.id: job.model_dump(exclude_unset=True) for job in jobs}
+    if len(updates) != len(jobs):
+        raise ModelRetry("Each job ID may only appear once per call")
+    before = ctx.deps.jobs.version
+    try:
+        updated_jobs = await ctx.deps.jobs.update_many(updates)
+    except RecordsNotFoundError as e:
+        return await not_found(ctx, ctx.deps.jobs, Job, e.ids, "No jobs were updated. ")
+    ctx.deps.job_reads.discard(ctx.run_id, before, ctx.deps.jobs.version, list(updates))
+    return ToolReturn(
+        return_value=f"Updated {len(updated_jobs)} jobs",
+        content=dump_compact([{"id": job_id, "updated": [key for key in data if key != "id"]} for job_id, data in updates.items()]),
+    )
+    
+    
+async def delete_jobs(ctx: RunContext[Deps], jobs: list[JobDelete]) -> ToolReturn:
+    """Delete several existing jobs in one call. Either every job is deleted or none are."""
+    job_ids = list(dict.fromkeys(job.id for job in jobs))
+    before = ctx.deps.jobs.version
+    try:
+        deleted_jobs = await ctx.deps.jobs.delete_many(job_ids)
+    except RecordsNotFoundError as e:
+        return await not_found(ctx, ctx.deps.jobs, Job, e.ids, "No jobs were deleted. ")
+    ctx.deps.job_reads.discard(ctx.run_id, before, ctx.deps.jobs.version, job_ids)
+    return ToolReturn(
+        return_value=f"Deleted {len(deleted_jobs)} jobs",
+        content=dump_compact([{"id": job.id, "name": job.name} for job in deleted_jobs]),
     )
     
     
 class ListFilter(BaseModel):
-    limit: int = Field(default=10, description="Maximum number of items to return")
-    offset: int = Field(default=0, description="Number of items to skip before starting to collect the result set")
+    limit: int = Field(default=10, ge=1, le=100, description="Maximum number of items to return")
+    offset: int = Field(default=0, ge=0, description="Number of items to skip before starting to collect the result set")
+    cursor: str | None = Field(default=None, description="Cursor returned by a previous call to continue from where it stopped")
     gte_date: datetime | None = Field(default=None, description="Filter items with a date greater than or equal to this value")
     lte_date: datetime | None = Field(default=None, description="Filter items with a date less than or equal to this value")
     status: list[JobStatus] | None = Field(default=None, description="Filter items with a specific status")
     
     
 async def get_jobs(ctx: RunContext[Deps], filters: ListFilter) -> ToolReturn:
-    """Get all existing jobs from the list of jobs in the dependencies."""
-    if not ctx.deps.jobs:
+    """Get a page of existing jobs ordered by deadline, with optional filters."""
+    try:
+        after = decode_cursor(filters.cursor) if filters.cursor else None
+    except ValueError:
+        raise ModelRetry("Invalid cursor: " + filters.cursor)
+    jobs = await ctx.deps.jobs.query(
+        gte_date=filters.gte_date,
+        lte_date=filters.lte_date,
+        statuses=filters.status,
+        after=after,
+        offset=filters.offset,
+        limit=filters.limit + 1,
+    )
+    if not jobs:
         return ToolReturn(
             return_value="No jobs found",
         )
-    jobs = ctx.deps.jobs
-    if filters.gte_date:
-        jobs = [job for job in jobs if job.deadline >= filters.gte_date]
-    if filters.lte_date:
-        jobs = [job for job in jobs if job.deadline <= filters.lte_date]
-    if filters.status:
-        jobs = [job for job in jobs if job.status in filters.status]
+    has_more = len(jobs) > filters.limit
+    serialized = dump_records(jobs[:filters.limit], max_tokens=ctx.deps.max_result_tokens)
+    summary = f"Found {serialized.returned} jobs"
+    if serialized.truncated:
+        summary += f" (truncated from {serialized.total} to fit the {ctx.deps.max_result_tokens} token result budget)"
+    if has_more or serialized.truncated:
+        summary += ", more available with cursor: " + encode_cursor(jobs[serialized.returned - 1])
+    return ToolReturn(
+        return_value=summary,
+        content=serialized.payload,
+    )
+    
+    
+class SearchQuery(BaseModel):
+    text: str = Field(description="Words to look for; close misspellings still match")
+    limit: int = Field(default=10, ge=1, le=100, description="Maximum number of IDs to return")
+    offset: int = Field(default=0, ge=0, description="Number of best matches to skip, to fetch later pages")
+    
+    
+def search_summary(kind: str, query: SearchQuery, total: int, returned: int) -> str:
+    if not returned:
+        return f"No {kind} found matching: {query.text}"
+    summary = f"Found {total} {kind} matching: {query.text}, showing {query.offset + 1}-{query.offset + returned}, best first"
+    if query.offset + returned < total:
+        summary += f", more available with offset: {query.offset + returned}"
+    return summary
+    
+    
+async def search_jobs(ctx: RunContext[Deps], query: SearchQuery) -> ToolReturn:
+    """Find jobs by words in their names, returning the IDs of the best matches first."""
+    page = await ctx.deps.jobs.search(query.text, offset=query.offset, limit=query.limit)
     return ToolReturn(
-        return_value=f"Found {len(jobs)} jobs",
-        content=[job.model_dump(mode="json") for job in jobs],
+        return_value=search_summary("jobs", query, page.total, len(page.keys)),
+        content=dump_compact(page.keys) if page.keys else None,
     )
     
     
@@ -90,7 +178,11 @@ def create_jobs_toolset(**tools_kwargs) -> FunctionToolset[Deps]:
             Tool(function=add_job, name="add_job", description="Add a new job with a name and deadline", **tools_kwargs),
             Tool(function=update_job, name="update_job", description="Update an existing job with new data", **tools_kwargs),
             Tool(function=delete_job, name="delete_job", description="Delete an existing job by ID", **tools_kwargs),
+            Tool(function=add_jobs, name="add_jobs", description="Add several new jobs in a single call", **tools_kwargs),
+            Tool(function=update_jobs, name="update_jobs", description="Update several existing jobs in a single call", **tools_kwargs),
+            Tool(function=delete_jobs, name="delete_jobs", description="Delete several existing jobs by ID in a single call", **tools_kwargs),
             Tool(function=get_job, name="get_job", description="Get an existing job by ID", **tools_kwargs),
-            Tool(function=get_jobs, name="get_jobs", description="Get all existing jobs with optional filters", **tools_kwargs),
+            Tool(function=get_jobs, name="get_jobs", description="Get all existing jobs with optional filters; use get_stats to count them instead", **tools_kwargs),
+            Tool(function=search_jobs, name="search_jobs", description="Search job names, tolerating typos, for matching job IDs", **tools_kwargs),
         ],
     )
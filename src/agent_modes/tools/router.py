@@ -1,6 +1,6 @@
 from pydantic_ai import ToolReturn, RunContext, FunctionToolset, Tool
 
-from ..enums import SelectableAgentModes, convert_selectable_agent_mode_to_agent_mode
+from ..enums import AgentModes, SelectableAgentModes, convert_selectable_agent_mode_to_agent_mode
 from ..deps import Deps
 
 
@@ -9,6 +9,8 @@ async def route_to_agent(ctx: RunContext[Deps], agent_mode: SelectableAgentModes
     Switch to an agent mode to handle the user's request.
     Each agent mode has access to specific tools appropriate for that mode.
     """
+    if ctx.deps.agent_mode != AgentModes.ROUTER:
+        ctx.deps.routing.record_route()
     ctx.deps.agent_mode = convert_selectable_agent_mode_to_agent_mode(agent_mode)
     
     return ToolReturn(
@@ -0,0 +1,151 @@
+"""Workload, overdue and approval-wait estimates computed from per-day counts.
+
+The repositories hand back how many jobs are due, or approvals were requested, on each day; the
+in-memory stores keep those counts up to date on every write. Every estimate here therefore costs
+time in the number of distinct days involved, not in the number of records, and is exact to the
+day rather than to the minute.
+"""
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+import math
+
+
+@dataclass
+class Workload:
+    bucket_days: int
+    buckets: list[tuple[date, int]]
+    """Start day of each bucket and the number of jobs due within it."""
+    before: int = 0
+    """Jobs due before the first bucket."""
+    after: int = 0
+    """Jobs due after the last bucket."""
+
+
+@dataclass
+class OverdueProjection:
+    today: date
+    overdue: int
+    """Jobs whose deadline day has already passed."""
+    due_today: int
+    capacity_per_day: float | None = None
+    at_risk: int = 0
+    """Jobs due today or later that would still be open after their deadline day."""
+    at_risk_days: list[tuple[date, int]] = field(default_factory=list)
+    """The earliest days with jobs at risk, and how many of that day's jobs are."""
+    cleared_by: date | None = None
+    """The day the last of these jobs would be finished."""
+
+
+@dataclass
+class ApproverWaits:
+    person: str
+    pending: int
+    mean_days: float
+    oldest_days: int
+
+
+@dataclass
+class ApprovalWaits:
+    pending: int
+    mean_days: float = 0.0
+    median_days: int = 0
+    p90_days: int = 0
+    oldest_days: int = 0
+    approvers: list[ApproverWaits] = field(default_factory=list)
+    """The approvers with the most pending approvals, most first."""
+
+
+def utc_today() -> date:
+    """Today's date in UTC, the calendar the per-day counts use for aware timestamps."""
+    return datetime.now(timezone.utc).date()
+
+
+def workload(days: dict[date, int], start: date, bucket_days: int, buckets: int) -> Workload:
+    """Histogram of jobs due in `buckets` consecutive periods of `bucket_days` from `start`."""
+    counts = [0] * buckets
+    before = after = 0
+    span = bucket_days * buckets
+    for day, jobs in days.items():
+        offset = (day - start).days
+        if offset < 0:
+            before += jobs
+        elif offset >= span:
+            after += jobs
+        else:
+            counts[offset // bucket_days] += jobs
+    return Workload(
+        bucket_days=bucket_days,
+        buckets=[(start + timedelta(days=index * bucket_days), count) for index, count in enumerate(counts)],
+        before=before,
+        after=after,
+    )
+
+
+def project_overdue(days: dict[date, int], today: date, capacity_per_day: float | None = None, limit: int = 10) -> OverdueProjection:
+    """Count overdue jobs and, given a capacity, project which of the rest will miss their deadline.
+
+    Jobs are assumed to be worked earliest deadline first, overdue ones included, at
+    `capacity_per_day` from the start of `today`. The k-th job is then done after k / capacity
+    days, so a day's jobs are at risk once the running total passes the capacity to that day's end.
+    `days` must be in day order, as the repositories return it.
+    """
+    projection = OverdueProjection(
+        today=today,
+        overdue=sum(jobs for day, jobs in days.items() if day < today),
+        due_today=days.get(today, 0),
+        capacity_per_day=capacity_per_day,
+    )
+    if not capacity_per_day:
+        return projection
+    total = 0
+    for day, jobs in days.items():
+        previous, total = total, total + jobs
+        offset = (day - today).days
+        if offset < 0:
+            continue
+        late = total - max(previous, math.floor(capacity_per_day * (offset + 1)))
+        if late > 0:
+            projection.at_risk += late
+            if len(projection.at_risk_days) < limit:
+                projection.at_risk_days.append((day, late))
+    if total:
+        projection.cleared_by = today + timedelta(days=math.ceil(total / capacity_per_day) - 1)
+    return projection
+
+
+def _percentile(ages: list[tuple[int, int]], count: int, fraction: float) -> int:
+    """The age at `fraction` of the way through (age, count) pairs sorted by age."""
+    target = max(1, math.ceil(fraction * count))
+    seen = 0
+    for age, number in ages:
+        seen += number
+        if seen >= target:
+            return age
+    return ages[-1][0]
+
+
+def approval_waits(by_person: dict[str, dict[date, int]], today: date, top: int = 5) -> ApprovalWaits:
+    """How long pending approvals have waited so far, overall and for the busiest approvers."""
+    ages: dict[int, int] = {}
+    approvers = []
+    for person, days in by_person.items():
+        pending = sum(days.values())
+        waited = 0
+        for day, count in days.items():
+            age = (today - day).days
+            ages[age] = ages.get(age, 0) + count
+            waited += age * count
+        approvers.append(ApproverWaits(person, pending, round(waited / pending, 1), (today - min(days)).days))
+    pending = sum(ages.values())
+    if not pending:
+        return ApprovalWaits(pending=0)
+    ordered = sorted(ages.items())
+    approvers.sort(key=lambda approver: (-approver.pending, approver.person))
+    return ApprovalWaits(
+        pending=pending,
+        mean_days=round(sum(age * count for age, count in ordered) / pending, 1),
+        median_days=_percentile(ordered, pending, 0.5),
+        p90_days=_percentile(ordered, pending, 0.9),
+        oldest_days=ordered[-1][0],
+        approvers=approvers[:top],
+    )
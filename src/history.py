@@ -0,0 +1,118 @@
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+from pydantic_ai import RunContext, ModelMessage
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    RetryPromptPart,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+
+from .serialization import BYTES_PER_TOKEN
+
+SUMMARY_REF = "history_summary"
+SUMMARY_HEADER = "Summary of the earlier conversation:\n"
+MAX_LINE_CHARS = 200
+
+Summarizer = Callable[[str, Sequence[ModelMessage], int], Awaitable[str]]
+
+
+def estimate_tokens(message: ModelMessage) -> int:
+    size = 0
+    for part in message.parts:
+        if isinstance(part, ToolCallPart):
+            size += len(part.tool_name) + len(part.args_as_json_str())
+        else:
+            content = getattr(part, "content", "")
+            size += len(content) if isinstance(content, str) else len(str(content))
+    return size // BYTES_PER_TOKEN + 1
+
+
+def _summary_lines(messages: Sequence[ModelMessage]) -> list[str]:
+    lines: list[str] = []
+    for message in messages:
+        for part in message.parts:
+            match part:
+                case UserPromptPart(content=str(content)):
+                    lines.append("User: " + content)
+                case TextPart(content=content) if isinstance(message, ModelResponse):
+                    lines.append("Assistant: " + content)
+                case ToolCallPart(tool_name=tool_name):
+                    lines.append(f"Called {tool_name}({part.args_as_json_str()})")
+                case ToolReturnPart(tool_name=tool_name):
+                    lines.append(f"{tool_name} returned: {part.model_response_str()}")
+    return [line[:MAX_LINE_CHARS] for line in lines]
+
+
+async def extractive_summary(previous: str, dropped: Sequence[ModelMessage], max_tokens: int) -> str:
+    """Append one short line per dropped part to the previous summary, keeping the most recent lines within budget."""
+    lines = (previous.splitlines() if previous else []) + _summary_lines(dropped)
+    kept: list[str] = []
+    size = 0
+    for line in reversed(lines):
+        size += len(line) + 1
+        if size > max_tokens * BYTES_PER_TOKEN:
+            break
+        kept.append(line)
+    return "\n".join(reversed(kept))
+
+
+def _is_summary(message: ModelMessage) -> bool:
+    return (
+        isinstance(message, ModelRequest)
+        and len(message.parts) == 1
+        and isinstance(message.parts[0], SystemPromptPart)
+        and message.parts[0].dynamic_ref == SUMMARY_REF
+    )
+
+
+def _starts_turn(message: ModelMessage) -> bool:
+    # Tool results can carry extra content as user prompt parts; only a request without tool
+    # returns or retries holds the user's own prompt.
+    return (
+        isinstance(message, ModelRequest)
+        and any(isinstance(part, UserPromptPart) for part in message.parts)
+        and not any(isinstance(part, ToolReturnPart | RetryPromptPart) for part in message.parts)
+    )
+
+
+def create_history_processor(
+    summarizer: Summarizer = extractive_summary,
+) -> Callable[[RunContext[Any], list[ModelMessage]], Awaitable[list[ModelMessage]]]:
+    """Build a history processor that keeps the newest whole turns within `deps.history_token_budget`.
+    
+    History is only cut where a user prompt starts a turn, so tool calls always stay with their
+    returns. Turns that fall out of the window are folded into a running summary kept as the first
+    message of the history, and only newly dropped messages are passed to the summarizer.
+    """
+    
+    async def history_processor(ctx: RunContext[Any], messages: list[ModelMessage]) -> list[ModelMessage]:
+        summary = ""
+        if messages and _is_summary(messages[0]):
+            summary = messages[0].parts[0].content.removeprefix(SUMMARY_HEADER)
+            messages = messages[1:]
+        budget = ctx.deps.history_token_budget - len(summary) // BYTES_PER_TOKEN
+        cut: int | None = None
+        size = 0
+        for index in range(len(messages) - 1, -1, -1):
+            size += estimate_tokens(messages[index])
+            if _starts_turn(messages[index]):
+                if size > budget and cut is not None:
+                    break
+                cut = index
+        else:
+            cut = 0
+        if cut > 0:
+            summary = await summarizer(summary, messages[:cut], ctx.deps.summary_token_budget)
+            messages = messages[cut:]
+        if not summary:
+            return messages
+        summary_message = ModelRequest(parts=[SystemPromptPart(content=SUMMARY_HEADER + summary, dynamic_ref=SUMMARY_REF)])
+        return [summary_message, *messages]
+    
+    return history_processor
@@ -0,0 +1,240 @@
+"""In-process timings and counters for model requests, tool calls and sub-agent runs.
+
+Spans are timed with perf_counter and kept in a bounded buffer, while per-(kind, name)
+totals are kept for the life of the process, so the summary and Prometheus export stay
+complete after the buffer wraps. Nothing leaves the process except through `export`.
+"""
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict, dataclass, field
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+from pydantic_ai import RunContext
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.toolsets import WrapperToolset, ToolsetTool
+from pydantic_ai.usage import RunUsage
+
+from .repositories import JobRepository, ApprovalRepository
+
+
+@dataclass
+class Span:
+    kind: str
+    name: str
+    start: float
+    """Wall-clock start, in seconds since the epoch."""
+    duration: float
+    error: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class SpanTotals:
+    count: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class Instrumentation:
+    def __init__(self, directory: str | Path | None = None, max_spans: int = 10_000):
+        self.directory = directory
+        self.spans: deque[Span] = deque(maxlen=max_spans)
+        self.totals: dict[tuple[str, str], SpanTotals] = {}
+        self.counters: dict[tuple[str, str], float] = {}
+        self.gauges: dict[tuple[str, str], float] = {}
+        self._recorded = 0
+        self._exported = 0
+        self._export_lock = threading.Lock()
+
+    @contextmanager
+    def span(self, kind: str, name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+        """Time the block as one span; the yielded dict can be filled in with more attributes."""
+        start, clock = time.time(), time.perf_counter()
+        error = None
+        try:
+            yield attributes
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.record(Span(kind, name, start, time.perf_counter() - clock, error, attributes))
+
+    def record(self, span: Span) -> None:
+        self.spans.append(span)
+        self._recorded += 1
+        totals = self.totals.get((span.kind, span.name))
+        if totals is None:
+            totals = self.totals[span.kind, span.name] = SpanTotals()
+        totals.count += 1
+        totals.errors += span.error is not None
+        totals.seconds += span.duration
+        totals.max_seconds = max(totals.max_seconds, span.duration)
+
+    def count(self, metric: str, label: str, value: float = 1) -> None:
+        self.counters[metric, label] = self.counters.get((metric, label), 0) + value
+
+    def gauge(self, metric: str, label: str, value: float) -> None:
+        self.gauges[metric, label] = value
+
+    def record_usage(self, usage: RunUsage) -> None:
+        """Add a finished run's token and request totals, as reported by `RunResult.usage()`."""
+        self.count("runs", "agent")
+        self.count("requests", "model", usage.requests)
+        self.count("requests", "tool", usage.tool_calls)
+        self.count("tokens", "input", usage.input_tokens)
+        self.count("tokens", "output", usage.output_tokens)
+        self.count("tokens", "cache_read", usage.cache_read_tokens)
+
+    async def record_store_sizes(self, jobs: JobRepository, approvals: ApprovalRepository) -> None:
+        self.gauge("store_records", "jobs", await jobs.count())
+        self.gauge("store_records", "approvals", await approvals.count())
+
+    async def end_turn(self, usage: RunUsage, jobs: JobRepository, approvals: ApprovalRepository) -> None:
+        """Record a finished turn's usage and the store sizes, then export if a directory was given.
+
+        The export is taken on the event loop but written from a worker thread, so slow disks do not
+        stall other sessions.
+        """
+        self.record_usage(usage)
+        await self.record_store_sizes(jobs, approvals)
+        if self.directory is not None:
+            await asyncio.to_thread(self._write_export, self.directory, *self._take_export())
+
+    def prometheus(self) -> str:
+        lines = [
+            "# TYPE agent_span_seconds summary",
+            "# TYPE agent_span_errors_total counter",
+            "# TYPE agent_span_max_seconds gauge",
+        ]
+        for (kind, name), totals in sorted(self.totals.items()):
+            labels = f'kind="{_label(kind)}",name="{_label(name)}"'
+            lines += [
+                f"agent_span_seconds_count{{{labels}}} {totals.count}",
+                f"agent_span_seconds_sum{{{labels}}} {totals.seconds:.6f}",
+                f"agent_span_errors_total{{{labels}}} {totals.errors}",
+                f"agent_span_max_seconds{{{labels}}} {totals.max_seconds:.6f}",
+            ]
+        for metrics, kind, suffix in ((self.counters, "counter", "_total"), (self.gauges, "gauge", "")):
+            for metric in sorted({metric for metric, _ in metrics}):
+                lines.append(f"# TYPE agent_{metric}{suffix} {kind}")
+                lines += [
+                    f'agent_{metric}{suffix}{{name="{_label(label)}"}} {value:g}'
+                    for (name, label), value in sorted(metrics.items()) if name == metric
+                ]
+        return "\n".join(lines) + "\n"
+
+    def export(self, directory: str | Path) -> None:
+        """Append spans recorded since the last export to spans.jsonl and rewrite metrics.prom."""
+        self._write_export(directory, *self._take_export())
+
+    def _take_export(self) -> tuple[list[str], str]:
+        """JSON lines for the spans recorded since the last export, and the Prometheus text."""
+        new = min(self._recorded - self._exported, len(self.spans))
+        lines = [
+            json.dumps(asdict(self.spans[index]), default=str) + "\n"
+            for index in range(len(self.spans) - new, len(self.spans))
+        ]
+        self._exported = self._recorded
+        return lines, self.prometheus()
+
+    def _write_export(self, directory: str | Path, lines: list[str], metrics: str) -> None:
+        directory = Path(directory)
+        with self._export_lock:
+            directory.mkdir(parents=True, exist_ok=True)
+            with open(directory / "spans.jsonl", "a") as f:
+                f.writelines(lines)
+            temporary = directory / "metrics.prom.tmp"
+            temporary.write_text(metrics)
+            os.replace(temporary, directory / "metrics.prom")
+
+    def report(self) -> str:
+        durations: dict[tuple[str, str], list[float]] = {}
+        for span in self.spans:
+            durations.setdefault((span.kind, span.name), []).append(span.duration)
+        lines = [
+            f"Instrumentation: {self._recorded} spans",
+            f"  {'kind':<8} {'name':<22} {'count':>7} {'errors':>7} {'total s':>9} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9}",
+        ]
+        for (kind, name), totals in sorted(self.totals.items(), key=lambda item: -item[1].seconds):
+            lines.append(
+                f"  {kind:<8} {name:<22} {totals.count:>7} {totals.errors:>7} {totals.seconds:>9.3f} "
+                f"{totals.seconds / totals.count * 1000:>9.1f} "
+                f"{_percentile(durations.get((kind, name), []), 0.95) * 1000:>9.1f} {totals.max_seconds * 1000:>9.1f}"
+            )
+        for metrics in (self.counters, self.gauges):
+            for (metric, label), value in sorted(metrics.items()):
+                lines.append(f"  {metric} {label}: {value:g}")
+        return "\n".join(lines)
+
+
+class InstrumentedModel(WrapperModel):
+    """Record a "model" span with token usage for every request, streamed or not."""
+
+    def __init__(self, wrapped: Model, instrumentation: Instrumentation):
+        super().__init__(wrapped)
+        self.instrumentation = instrumentation
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        with self.instrumentation.span("model", self.model_name, messages=len(messages)) as attributes:
+            response = await super().request(messages, model_settings, model_request_parameters)
+            attributes.update(input_tokens=response.usage.input_tokens, output_tokens=response.usage.output_tokens)
+        return response
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        run_context: RunContext[Any] | None = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        with self.instrumentation.span("model", self.model_name, messages=len(messages), stream=True) as attributes:
+            async with super().request_stream(
+                messages, model_settings, model_request_parameters, run_context
+            ) as response_stream:
+                yield response_stream
+            usage = response_stream.usage()
+            attributes.update(input_tokens=usage.input_tokens, output_tokens=usage.output_tokens)
+
+
+@dataclass
+class InstrumentedToolset(WrapperToolset[Any]):
+    """Record a "tool" span for every call, and count calls that are retries."""
+
+    instrumentation: Instrumentation = field(default_factory=Instrumentation)
+
+    async def call_tool(self, name: str, tool_args: dict[str, Any], ctx: RunContext[Any], tool: ToolsetTool[Any]) -> Any:
+        if ctx.retry:
+            self.instrumentation.count("tool_retries", name)
+        attributes: dict[str, Any] = {"retry": ctx.retry}
+        if "subagent_type" in tool_args:
+            attributes["subagent"] = tool_args["subagent_type"]
+        with self.instrumentation.span("tool", name, **attributes):
+            return await super().call_tool(name, tool_args, ctx, tool)
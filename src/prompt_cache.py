@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+
+from pydantic_ai.usage import RunUsage
+
+
+@dataclass
+class PromptCacheStats:
+    """Running totals of how much of the prompt input was served from the provider's prefix cache."""
+    
+    requests: int = 0
+    input_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_write_tokens: int = 0
+    
+    def record(self, usage: RunUsage) -> None:
+        self.requests += usage.requests
+        self.input_tokens += usage.input_tokens
+        self.cache_read_tokens += usage.cache_read_tokens
+        self.cache_write_tokens += usage.cache_write_tokens
+        
+    @property
+    def cached_ratio(self) -> float:
+        return self.cache_read_tokens / self.input_tokens if self.input_tokens else 0.0
+    
+    def report(self) -> str:
+        return (
+            f"Prompt cache: {self.cached_ratio:.1%} of {self.input_tokens} input tokens read from cache "
+            f"over {self.requests} requests ({self.cache_write_tokens} tokens written)"
+        )
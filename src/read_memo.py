@@ -0,0 +1,51 @@
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+
+@dataclass
+class RunMemo:
+    """Serialized records already read during the current agent run, keyed by ID.
+    
+    Entries belong to one run: the first lookup with a different run ID clears them. Tools that
+    write a record replace or discard just its entry, passing the repository version from before
+    and after the write. Any other change of version means someone else wrote, a sub-agent or
+    another session sharing the repository, and clears every entry.
+    """
+    
+    run_id: str | None = None
+    version: int | None = None
+    hits: int = 0
+    misses: int = 0
+    _payloads: dict[str, str] = field(default_factory=dict, repr=False)
+    
+    def _scope(self, run_id: str | None, version: int) -> None:
+        if run_id != self.run_id or version != self.version:
+            self._payloads.clear()
+            self.run_id, self.version = run_id, version
+            
+    async def get(
+        self, run_id: str | None, version: int, record_id: str, load: Callable[[str], Awaitable[str | None]],
+    ) -> str | None:
+        self._scope(run_id, version)
+        payload = self._payloads.get(record_id)
+        if payload is not None:
+            self.hits += 1
+            return payload
+        self.misses += 1
+        payload = await load(record_id)
+        if payload is not None and version == self.version:
+            self._payloads[record_id] = payload
+        return payload
+    
+    def put(self, run_id: str | None, before: int, after: int, record_id: str, payload: str) -> None:
+        """Keep a record this run just wrote, moving the version from `before` to `after`."""
+        self._scope(run_id, before)
+        self._payloads[record_id] = payload
+        self.version = after
+        
+    def discard(self, run_id: str | None, before: int, after: int, record_ids: list[str]) -> None:
+        """Forget records this run just wrote, moving the version from `before` to `after`."""
+        self._scope(run_id, before)
+        for record_id in record_ids:
+            self._payloads.pop(record_id, None)
+        self.version = after
@@ -0,0 +1,177 @@
+"""Record conversations turn by turn, and replay them offline through a stub model.
+
+A recording is a JSON-lines file with one turn per line: the user input, the mode the turn
+started in, its wall time and usage, and the turn's new messages (tool calls, tool results and
+their timestamps included) in pydantic-ai's own message format.
+"""
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass, replace
+from enum import Enum
+import json
+from pathlib import Path
+import re
+from typing import Any
+
+from pydantic_ai import ModelMessage, ModelMessagesTypeAdapter
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    ModelResponsePart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.usage import RunUsage
+
+_RECORD_ID = re.compile(r"\b(?:job|approval)_[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b")
+
+
+@dataclass
+class RecordedTurn:
+    input: str
+    mode: str | None
+    wall_ms: float
+    usage: dict[str, Any]
+    messages: list[ModelMessage]
+
+
+class ConversationRecorder:
+    """Append each finished turn to a JSON-lines file. One recorder can be shared by every session."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def record(
+        self,
+        user_input: str,
+        messages: Sequence[ModelMessage],
+        wall_seconds: float,
+        usage: RunUsage,
+        mode: Enum | str | None = None,
+    ) -> None:
+        line = {
+            "input": user_input,
+            "mode": mode.value if isinstance(mode, Enum) else mode,
+            "wall_ms": round(wall_seconds * 1000, 3),
+            "usage": {key: value for key, value in asdict(usage).items() if value},
+            "messages": ModelMessagesTypeAdapter.dump_python(list(messages), mode="json"),
+        }
+        with open(self.path, "a") as f:
+            f.write(json.dumps(line, separators=(",", ":")) + "\n")
+
+
+def load_recording(path: str | Path) -> list[RecordedTurn]:
+    turns = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            data["messages"] = ModelMessagesTypeAdapter.validate_python(data["messages"])
+            turns.append(RecordedTurn(**data))
+    return turns
+
+
+def _contents(request: ModelRequest) -> list[str]:
+    """What the tools gave back in a request: return values, plus content sent as user prompt parts."""
+    return [str(part.content) for part in request.parts if isinstance(part, (ToolReturnPart, UserPromptPart))]
+
+
+def _delegated_outputs(messages: Sequence[ModelMessage]) -> dict[str, str]:
+    """What each sub-agent answered, by the task description it was given."""
+    tasks = {
+        part.tool_call_id: part.args_as_dict()["description"]
+        for message in messages if isinstance(message, ModelResponse)
+        for part in message.parts if isinstance(part, ToolCallPart) and part.tool_name == "task"
+    }
+    outputs: dict[str, str] = {}
+    for message in messages:
+        if not isinstance(message, ModelRequest):
+            continue
+        for part in message.parts:
+            if isinstance(part, ToolReturnPart) and part.tool_call_id in tasks:
+                outputs[tasks[part.tool_call_id]] = str(part.content)
+            elif isinstance(part, UserPromptPart) and isinstance(part.content, str) and part.content.startswith("[{"):
+                # fan_out results: one object per task with its description and output.
+                try:
+                    branches = json.loads(part.content)
+                except ValueError:
+                    continue
+                for branch in branches:
+                    if isinstance(branch, dict) and "subagent_type" in branch and "description" in branch:
+                        outputs[branch["description"]] = branch.get("output") or branch.get("error") or ""
+    return outputs
+
+
+def _prompts(messages: list[ModelMessage]) -> list[str]:
+    return [
+        str(part.content)
+        for message in messages if isinstance(message, ModelRequest)
+        for part in message.parts if isinstance(part, UserPromptPart)
+    ]
+
+
+class ReplayModel:
+    """Stub model that answers with a recording's responses instead of calling a provider.
+
+    Tools still run for real, so a replay exercises the tools, stores and serialization as the
+    live session did, minus the model latency. IDs the live session created are mapped to the
+    ones the replay creates, so later tool calls still find their records. Requests from
+    sub-agents (any request that does not carry the turn's input) get the answer the sub-agent
+    gave in the recording, so their own tool calls are not replayed.
+
+    `diverged` counts requests whose tool results differ from the recording once IDs are masked,
+    and `misses` counts requests made after the recording ran out of responses.
+    """
+
+    def __init__(self):
+        self.model = FunctionModel(self.respond, model_name="replay")
+        self.diverged = 0
+        self.misses = 0
+        self._input = ""
+        self._requests: list[ModelRequest] = []
+        self._responses: list[ModelResponse] = []
+        self._step = 0
+        self._delegated: dict[str, str] = {}
+        self._ids: dict[str, str] = {}
+
+    def start(self, turn: RecordedTurn) -> None:
+        self._input = turn.input
+        self._requests = [message for message in turn.messages if isinstance(message, ModelRequest)]
+        self._responses = [message for message in turn.messages if isinstance(message, ModelResponse)]
+        self._step = 0
+        self._delegated = _delegated_outputs(turn.messages)
+
+    async def respond(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        prompts = _prompts(messages)
+        if self._input not in prompts:
+            output = next(
+                (output for description, output in self._delegated.items() if any(description in prompt for prompt in prompts)),
+                "",
+            )
+            return ModelResponse(parts=[TextPart(output)])
+        step, self._step = self._step, self._step + 1
+        if 0 < step < len(self._requests) and isinstance(messages[-1], ModelRequest):
+            self._compare(self._requests[step], messages[-1])
+        if step >= len(self._responses):
+            self.misses += 1
+            return ModelResponse(parts=[TextPart("")])
+        recorded = self._responses[step]
+        return ModelResponse(parts=[self._remap(part) for part in recorded.parts], usage=recorded.usage)
+
+    def _compare(self, recorded: ModelRequest, replayed: ModelRequest) -> None:
+        old, new = _contents(recorded), _contents(replayed)
+        for old_content, new_content in zip(old, new):
+            for old_id, new_id in zip(_RECORD_ID.findall(old_content), _RECORD_ID.findall(new_content)):
+                if old_id != new_id:
+                    self._ids[old_id] = new_id
+        if [_RECORD_ID.sub("<id>", content) for content in old] != [_RECORD_ID.sub("<id>", content) for content in new]:
+            self.diverged += 1
+
+    def _remap(self, part: ModelResponsePart) -> ModelResponsePart:
+        if not self._ids or not isinstance(part, ToolCallPart):
+            return part
+        args = _RECORD_ID.sub(lambda match: self._ids.get(match.group(), match.group()), part.args_as_json_str())
+        return replace(part, args=args)
@@ -0,0 +1,66 @@
+"""Process-wide, lazily built model, provider, HTTP client, toolset and agent instances.
+
+Everything here is built on first use and then shared, so agents, sub-agents and
+server sessions reuse one connection pool instead of each opening their own.
+"""
+from collections.abc import Callable
+from functools import cache
+import importlib
+import os
+from typing import Any
+
+from dotenv import load_dotenv
+import httpx
+
+from pydantic_ai import Agent
+from pydantic_ai.models import ModelSettings
+from pydantic_ai.models.openai import OpenAIChatModel
+from pydantic_ai.providers.openai import OpenAIProvider
+from pydantic_ai.toolsets import AbstractToolset
+
+load_dotenv()
+
+MODEL_NAME = "gpt-5.2"
+ARCHITECTURES = ("agent_modes", "sub_agents")
+
+
+@cache
+def get_http_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(600, connect=5),
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "20")),
+        ),
+    )
+
+
+@cache
+def get_provider() -> OpenAIProvider:
+    return OpenAIProvider(api_key=os.getenv("OPENAI_API_KEY"), http_client=get_http_client())
+
+
+@cache
+def get_model() -> OpenAIChatModel:
+    return OpenAIChatModel(
+        model_name=MODEL_NAME,
+        provider=get_provider(),
+        settings=ModelSettings(
+            max_tokens=1000,
+        )
+    )
+    
+    
+@cache
+def shared_toolset[T: AbstractToolset[Any]](factory: Callable[..., T], **tools_kwargs: Any) -> T:
+    """Build a toolset once per (factory, kwargs) and hand out the same instance afterwards."""
+    return factory(**tools_kwargs)
+
+
+@cache
+def get_core_agent(architecture: str, **options: Any) -> Agent[Any]:
+    """Build the core agent for one architecture, importing only that architecture's modules."""
+    if architecture not in ARCHITECTURES:
+        raise ValueError("Unknown architecture: " + architecture)
+    core = importlib.import_module(f".{architecture}.core", __package__)
+    return core.create_core_agent(**options)
@@ -0,0 +1,47 @@
+import os
+
+from .base import JobRepository, ApprovalRepository, RecordsNotFoundError
+from .memory import InMemoryJobRepository, InMemoryApprovalRepository
+from .sqlite import SQLiteDatabase, SQLiteJobRepository, SQLiteApprovalRepository
+from .views import (
+    ReadOnlyRepositoryError,
+    ReadOnlyJobRepository,
+    ReadOnlyApprovalRepository,
+    CopyOnWriteJobRepository,
+    CopyOnWriteApprovalRepository,
+)
+from ..stores import ColumnarJobStore, ColumnarApprovalStore
+
+
+def create_repositories(database_path: str | None = None, columnar: bool | None = None) -> tuple[JobRepository, ApprovalRepository]:
+    """Create SQLite-backed repositories if a database path is given (or set in DATABASE_PATH), else in-memory ones.
+    
+    In-memory repositories use the compact columnar stores if `columnar` is set (or COLUMNAR_STORE=1).
+    """
+    database_path = database_path or os.getenv("DATABASE_PATH")
+    if not database_path:
+        if columnar is None:
+            columnar = os.getenv("COLUMNAR_STORE", "").lower() in ("1", "true", "yes")
+        if columnar:
+            return InMemoryJobRepository(ColumnarJobStore()), InMemoryApprovalRepository(ColumnarApprovalStore())
+        return InMemoryJobRepository(), InMemoryApprovalRepository()
+    database = SQLiteDatabase(database_path)
+    return SQLiteJobRepository(database), SQLiteApprovalRepository(database)
+
+
+__all__ = [
+    "JobRepository",
+    "ApprovalRepository",
+    "RecordsNotFoundError",
+    "InMemoryJobRepository",
+    "InMemoryApprovalRepository",
+    "SQLiteDatabase",
+    "SQLiteJobRepository",
+    "SQLiteApprovalRepository",
+    "ReadOnlyRepositoryError",
+    "ReadOnlyJobRepository",
+    "ReadOnlyApprovalRepository",
+    "CopyOnWriteJobRepository",
+    "CopyOnWriteApprovalRepository",
+    "create_repositories",
+]
@@ -0,0 +1,154 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from datetime import date, datetime
+from typing import Any
+
+from ..schemas import Job, JobStatus, Approval, ApprovalStatus
+from ..search import SearchPage
+from ..serialization import dump_record
+
+
+class RecordsNotFoundError(LookupError):
+    """Raised by batch operations, before anything is changed, when some IDs do not exist."""
+    
+    def __init__(self, ids: list[str]):
+        super().__init__("Records not found with IDs: " + ", ".join(ids))
+        self.ids = ids
+        
+        
+class JobRepository(ABC):
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        """A counter that goes up on every write, so callers can tell whether anything changed."""
+        
+    async def current_version(self) -> int:
+        """`version`, brought up to date with writes made outside this process where the backend allows."""
+        return self.version
+        
+    @abstractmethod
+    async def add(self, job: Job) -> Job: ...
+    
+    @abstractmethod
+    async def get(self, job_id: str) -> Job | None: ...
+    
+    async def get_json(self, job_id: str) -> str | None:
+        """The job serialized as JSON, for callers that only pass it on."""
+        job = await self.get(job_id)
+        return None if job is None else dump_record(job)
+    
+    @abstractmethod
+    async def update(self, job_id: str, data: dict[str, Any]) -> Job | None: ...
+    
+    @abstractmethod
+    async def delete(self, job_id: str) -> Job | None: ...
+    
+    @abstractmethod
+    async def add_many(self, jobs: list[Job]) -> list[Job]: ...
+    
+    @abstractmethod
+    async def update_many(self, updates: dict[str, dict[str, Any]]) -> list[Job]:
+        """Apply all updates atomically, raising RecordsNotFoundError without changes if any ID is missing."""
+        
+    @abstractmethod
+    async def delete_many(self, job_ids: list[str]) -> list[Job]:
+        """Delete all records atomically, raising RecordsNotFoundError without changes if any ID is missing."""
+    
+    @abstractmethod
+    async def count(self) -> int: ...
+    
+    @abstractmethod
+    async def query(
+        self,
+        gte_date: datetime | None = None,
+        lte_date: datetime | None = None,
+        statuses: Iterable[JobStatus] | None = None,
+        after: tuple[datetime, str] | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[Job]:
+        """Return matching jobs ordered by (deadline, id), starting after the `after` key if given."""
+        
+    @abstractmethod
+    async def search(self, text: str, offset: int = 0, limit: int = 10) -> SearchPage[str]:
+        """IDs of the jobs whose names best match `text`, best first, with the total number of matches."""
+        
+    @abstractmethod
+    async def similar_ids(self, job_id: str, limit: int = 3) -> list[str]:
+        """Existing job IDs that look like a mistyped or truncated `job_id`, closest first."""
+        
+    @abstractmethod
+    async def status_counts(self) -> dict[JobStatus, int]:
+        """Number of jobs in each status, zeros included."""
+        
+    @abstractmethod
+    async def deadline_histogram(self, statuses: Iterable[JobStatus] | None = None) -> dict[date, int]:
+        """Number of jobs due on each day, oldest first. Aware deadlines count on their UTC day."""
+        
+        
+class ApprovalRepository(ABC):
+    @property
+    @abstractmethod
+    def version(self) -> int:
+        """A counter that goes up on every write, so callers can tell whether anything changed."""
+        
+    async def current_version(self) -> int:
+        """`version`, brought up to date with writes made outside this process where the backend allows."""
+        return self.version
+        
+    @abstractmethod
+    async def add(self, approval: Approval) -> Approval: ...
+    
+    @abstractmethod
+    async def get(self, approval_id: str) -> Approval | None: ...
+    
+    async def get_json(self, approval_id: str) -> str | None:
+        """The approval serialized as JSON, for callers that only pass it on."""
+        approval = await self.get(approval_id)
+        return None if approval is None else dump_record(approval)
+    
+    @abstractmethod
+    async def update(self, approval_id: str, data: dict[str, Any]) -> Approval | None: ...
+    
+    @abstractmethod
+    async def delete(self, approval_id: str) -> Approval | None: ...
+    
+    @abstractmethod
+    async def add_many(self, approvals: list[Approval]) -> list[Approval]: ...
+    
+    @abstractmethod
+    async def update_many(self, updates: dict[str, dict[str, Any]]) -> list[Approval]:
+        """Apply all updates atomically, raising RecordsNotFoundError without changes if any ID is missing."""
+        
+    @abstractmethod
+    async def delete_many(self, approval_ids: list[str]) -> list[Approval]:
+        """Delete all records atomically, raising RecordsNotFoundError without changes if any ID is missing."""
+    
+    @abstractmethod
+    async def count(self) -> int: ...
+    
+    @abstractmethod
+    async def for_job(self, job_id: str) -> list[Approval]: ...
+    
+    @abstractmethod
+    async def search(self, text: str, offset: int = 0, limit: int = 10) -> SearchPage[str]:
+        """IDs of the approvals whose person or request best match `text`, best first, with the total number of matches."""
+    
+    @abstractmethod
+    async def similar_ids(self, approval_id: str, limit: int = 3) -> list[str]:
+        """Existing approval IDs that look like a mistyped or truncated `approval_id`, closest first."""
+    
+    @abstractmethod
+    async def status_counts(self, person: str | None = None) -> dict[ApprovalStatus, int]:
+        """Number of approvals in each status, zeros included, optionally only those of one person."""
+    
+    @abstractmethod
+    async def pending_for_job(self, job_id: str) -> int:
+        """Number of pending approvals for the job."""
+    
+    @abstractmethod
+    async def pending_by_person(self) -> dict[str, dict[date, int]]:
+        """Pending approvals per person and the (UTC) day they were requested, oldest day first.
+        
+        Approvals without a creation time are left out.
+        """
@@ -0,0 +1,137 @@
+from collections.abc import Iterable
+from datetime import date, datetime
+from itertools import islice
+from typing import Any
+
+from .base import JobRepository, ApprovalRepository, RecordsNotFoundError
+from ..schemas import Job, JobStatus, Approval, ApprovalStatus
+from ..search import SearchPage
+from ..stores import JobStore, ApprovalStore, ColumnarJobStore, ColumnarApprovalStore
+
+
+class InMemoryJobRepository(JobRepository):
+    def __init__(self, store: JobStore | ColumnarJobStore | None = None):
+        self.store = store if store is not None else JobStore()
+        
+    @property
+    def version(self) -> int:
+        return self.store.version
+    
+    async def add(self, job: Job) -> Job:
+        return self.store.add(job)
+    
+    async def get(self, job_id: str) -> Job | None:
+        return self.store.get(job_id)
+    
+    async def get_json(self, job_id: str) -> str | None:
+        return self.store.dump(job_id)
+    
+    async def update(self, job_id: str, data: dict[str, Any]) -> Job | None:
+        return self.store.update(job_id, data)
+    
+    async def delete(self, job_id: str) -> Job | None:
+        return self.store.delete(job_id)
+    
+    async def add_many(self, jobs: list[Job]) -> list[Job]:
+        return self.store.extend(jobs)
+    
+    async def update_many(self, updates: dict[str, dict[str, Any]]) -> list[Job]:
+        self._require(updates)
+        return self.store.update_many(updates)
+    
+    async def delete_many(self, job_ids: list[str]) -> list[Job]:
+        self._require(job_ids)
+        return [self.store.delete(job_id) for job_id in job_ids]
+    
+    async def count(self) -> int:
+        return len(self.store)
+    
+    async def query(
+        self,
+        gte_date: datetime | None = None,
+        lte_date: datetime | None = None,
+        statuses: Iterable[JobStatus] | None = None,
+        after: tuple[datetime, str] | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[Job]:
+        matches = self.store.query(gte_date=gte_date, lte_date=lte_date, statuses=statuses, after=after)
+        return list(islice(matches, offset, None if limit is None else offset + limit))
+    
+    async def search(self, text: str, offset: int = 0, limit: int = 10) -> SearchPage[str]:
+        return self.store.search(text, offset, limit)
+    
+    async def similar_ids(self, record_id: str, limit: int = 3) -> list[str]:
+        return self.store.similar_ids(record_id, limit)
+    
+    async def status_counts(self) -> dict[JobStatus, int]:
+        return self.store.status_counts()
+    
+    async def deadline_histogram(self, statuses: Iterable[JobStatus] | None = None) -> dict[date, int]:
+        return self.store.deadline_histogram(statuses)
+    
+    def _require(self, ids: Iterable[str]) -> None:
+        missing = [record_id for record_id in ids if record_id not in self.store]
+        if missing:
+            raise RecordsNotFoundError(missing)
+    
+    
+class InMemoryApprovalRepository(ApprovalRepository):
+    def __init__(self, store: ApprovalStore | ColumnarApprovalStore | None = None):
+        self.store = store if store is not None else ApprovalStore()
+        
+    @property
+    def version(self) -> int:
+        return self.store.version
+    
+    async def add(self, approval: Approval) -> Approval:
+        return self.store.add(approval)
+    
+    async def get(self, approval_id: str) -> Approval | None:
+        return self.store.get(approval_id)
+    
+    async def get_json(self, approval_id: str) -> str | None:
+        return self.store.dump(approval_id)
+    
+    async def update(self, approval_id: str, data: dict[str, Any]) -> Approval | None:
+        return self.store.update(approval_id, data)
+    
+    async def delete(self, approval_id: str) -> Approval | None:
+        return self.store.delete(approval_id)
+    
+    async def add_many(self, approvals: list[Approval]) -> list[Approval]:
+        return self.store.extend(approvals)
+    
+    async def update_many(self, updates: dict[str, dict[str, Any]]) -> list[Approval]:
+        self._require(updates)
+        return self.store.update_many(updates)
+    
+    async def delete_many(self, approval_ids: list[str]) -> list[Approval]:
+        self._require(approval_ids)
+        return [self.store.delete(approval_id) for approval_id in approval_ids]
+    
+    async def count(self) -> int:
+        return len(self.store)
+    
+    async def for_job(self, job_id: str) -> list[Approval]:
+        return list(self.store.for_job(job_id))
+    
+    async def search(self, text: str, offset: int = 0, limit: int = 10) -> SearchPage[str]:
+        return self.store.search(text, offset, limit)
+    
+    async def similar_ids(self, record_id: str, limit: int = 3) -> list[str]:
+        return self.store.similar_ids(record_id, limit)
+    
+    async def status_counts(self, person: str | None = None) -> dict[ApprovalStatus, int]:
+        return self.store.status_counts() if person is None else self.store.person_counts(person)
+    
+    async def pending_for_job(self, job_id: str) -> int:
+        return self.store.pending_for_job(job_id)
+    
+    async def pending_by_person(self) -> dict[str, dict[date, int]]:
+        return self.store.pending_by_person()
+    
+    def _require(self, ids: Iterable[str]) -> None:
+        missing = [record_id for record_id in ids if record_id not in self.store]
+        if missing:
+            raise RecordsNotFoundError(missing)
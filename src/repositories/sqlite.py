@@ -0,0 +1,490 @@
+import asyncio
+from collections.abc import Callable, Iterable
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+import sqlite3
+import threading
+
+from .base import JobRepository, ApprovalRepository, RecordsNotFoundError
+from ..schemas import Job, JobStatus, Approval, ApprovalStatus
+from ..search import SearchPage, tokenize
+from ..stores import updated_copy
+from ..utils import SIMILAR_ID_NEIGHBOURS, close_ids, naive_utc
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    deadline TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_deadline_idx ON jobs (deadline, id);
+CREATE INDEX IF NOT EXISTS jobs_status_deadline_idx ON jobs (status, deadline, id);
+CREATE TABLE IF NOT EXISTS approvals (
+    id TEXT PRIMARY KEY,
+    person TEXT NOT NULL,
+    request TEXT NOT NULL,
+    status TEXT NOT NULL,
+    job_id TEXT,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS approvals_status_idx ON approvals (status);
+CREATE INDEX IF NOT EXISTS approvals_job_id_idx ON approvals (job_id);
+CREATE INDEX IF NOT EXISTS approvals_person_status_idx ON approvals (person, status);
+CREATE TABLE IF NOT EXISTS state (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO state (id, version) VALUES (0, 0);
+"""
+
+
+_TIMESTAMP_GLOB = "????-??-??T??:??:??.??????"
+
+
+class _Abandoned(Exception):
+    """Raised in a worker thread to roll back a transaction whose caller was cancelled."""
+
+
+class SQLiteDatabase:
+    """A pool of SQLite connections in WAL mode, shared by the SQLite repositories.
+    
+    Queries run in worker threads so the event loop is never blocked. Every statement
+    uses a fixed SQL string with bound parameters, so each connection's statement
+    cache keeps them prepared.
+    """
+    
+    def __init__(self, path: str, pool_size: int = 4, busy_timeout: float = 5.0):
+        self.path = path
+        # The database's write counter, as of the last commit or current_version() call here.
+        self.version = 0
+        self._version_lock = threading.Lock()
+        self._pool: asyncio.Queue[sqlite3.Connection] = asyncio.Queue()
+        self._connections: list[sqlite3.Connection] = []
+        for _ in range(pool_size):
+            conn = sqlite3.connect(
+                path,
+                timeout=busy_timeout,
+                check_same_thread=False,
+                isolation_level=None,
+                cached_statements=256,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._connections.append(conn)
+            self._pool.put_nowait(conn)
+        self._connections[0].executescript(SCHEMA)
+        columns = {row["name"] for row in self._connections[0].execute("PRAGMA table_info(approvals)")}
+        if "created_at" not in columns:
+            # Databases made before approvals had a creation time.
+            self._connections[0].execute("ALTER TABLE approvals ADD COLUMN created_at TEXT")
+        self._normalize_timestamps(self._connections[0])
+        self.version = self._connections[0].execute("SELECT version FROM state").fetchone()[0]
+        
+    async def run[R](self, func: Callable[[sqlite3.Connection], R], abandoned: threading.Event | None = None) -> R:
+        """Run `func` with a pooled connection in a worker thread.
+
+        A worker thread cannot be interrupted, so if the caller is cancelled the thread runs on;
+        `abandoned` is set to tell it, and the connection only goes back to the pool, rolled back
+        if it was left in a transaction, once the thread has finished with it.
+        """
+        conn = await self._pool.get()
+        work = asyncio.ensure_future(asyncio.to_thread(func, conn))
+        work.add_done_callback(lambda _: self._check_in(conn, work))
+        try:
+            return await asyncio.shield(work)
+        except asyncio.CancelledError:
+            if abandoned is not None:
+                abandoned.set()
+            await asyncio.wait([work])
+            raise
+        
+    def _check_in(self, conn: sqlite3.Connection, work: asyncio.Future[Any]) -> None:
+        if not work.cancelled():
+            # Mark the result as retrieved, in case the caller was cancelled and never awaits it.
+            work.exception()
+        if conn not in self._connections:
+            return
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        self._pool.put_nowait(conn)
+        
+    async def transaction[R](self, func: Callable[[sqlite3.Connection], R]) -> R:
+        """Run `func` in a write transaction, rolled back instead of committed if the caller is cancelled."""
+        abandoned = threading.Event()
+        
+        def run_in_transaction(conn: sqlite3.Connection) -> R:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(conn)
+                version = conn.execute("UPDATE state SET version = version + 1 RETURNING version").fetchone()[0]
+                if abandoned.is_set():
+                    raise _Abandoned
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            # Recorded here rather than by the caller, so a commit that races a cancellation still counts.
+            self._saw_version(version)
+            return result
+        return await self.run(run_in_transaction, abandoned)
+    
+    async def current_version(self) -> int:
+        """The write counter kept in the database, so commits from other processes count too."""
+        version = await self.run(lambda conn: conn.execute("SELECT version FROM state").fetchone()[0])
+        self._saw_version(version)
+        return self.version
+    
+    def _saw_version(self, version: int) -> None:
+        with self._version_lock:
+            self.version = max(self.version, version)
+    
+    @staticmethod
+    def _normalize_timestamps(conn: sqlite3.Connection) -> None:
+        """Rewrite timestamps stored with other offsets or widths, as databases made before UTC text were."""
+        for table, column in (("jobs", "deadline"), ("approvals", "created_at")):
+            rows = conn.execute(
+                f"SELECT id, {column} AS value FROM {table} WHERE {column} NOT GLOB ? AND {column} NOT GLOB ?",
+                (_TIMESTAMP_GLOB, _TIMESTAMP_GLOB + "+00:00"),
+            ).fetchall()
+            if rows:
+                conn.executemany(
+                    f"UPDATE {table} SET {column} = ? WHERE id = ?",
+                    [(_timestamp(datetime.fromisoformat(row["value"])), row["id"]) for row in rows],
+                )
+
+    def close(self) -> None:
+        for conn in self._connections:
+            conn.close()
+        self._connections.clear()
+        
+        
+def _timestamp(value: datetime) -> str:
+    """A datetime as fixed-width UTC text, so text order is time order whatever the original offset.
+
+    Aware values keep a +00:00 suffix and read back as UTC; naive ones are stored as they are.
+    """
+    text = naive_utc(value).isoformat(timespec="microseconds")
+    return text if value.tzinfo is None else text + "+00:00"
+
+
+def _job_from_row(row: sqlite3.Row | None) -> Job | None:
+    return None if row is None else Job.model_validate(dict(row))
+
+
+def _approval_from_row(row: sqlite3.Row | None) -> Approval | None:
+    return None if row is None else Approval.model_validate(dict(row))
+
+
+def _job_params(job: Job) -> tuple[Any, ...]:
+    return (job.id, job.name, _timestamp(job.deadline), job.status.value)
+
+
+def _approval_params(approval: Approval) -> tuple[Any, ...]:
+    return (
+        approval.id,
+        approval.person,
+        approval.request,
+        approval.status.value,
+        approval.job_id,
+        None if approval.created_at is None else _timestamp(approval.created_at),
+    )
+
+
+def _fetch_by_ids[R](
+    conn: sqlite3.Connection,
+    table: str,
+    ids: list[str],
+    from_row: Callable[[sqlite3.Row | None], R | None],
+) -> list[R]:
+    """Fetch rows in the order of `ids`, raising RecordsNotFoundError if any are missing."""
+    statement = f"SELECT * FROM {table} WHERE id = ?"
+    records = [from_row(conn.execute(statement, (record_id,)).fetchone()) for record_id in ids]
+    missing = [record_id for record_id, record in zip(ids, records) if record is None]
+    if missing:
+        raise RecordsNotFoundError(missing)
+    return records
+
+
+def _search(conn: sqlite3.Connection, table: str, text_sql: str, text: str, offset: int, limit: int) -> SearchPage[str]:
+    """Rank rows by how many query tokens appear in `text_sql`.
+
+    This is a LIKE scan without typo tolerance; the in-memory stores keep a proper index.
+    """
+    tokens = list(dict.fromkeys(tokenize(text)))
+    if not tokens:
+        return SearchPage(keys=[], total=0)
+    score = " + ".join(f"({text_sql} LIKE ?)" for _ in tokens)
+    patterns = [f"%{token}%" for token in tokens]
+    scored = f"SELECT id, {score} AS score FROM {table}"
+    total = conn.execute(f"SELECT COUNT(*) FROM ({scored}) WHERE score > 0", patterns).fetchone()[0]
+    rows = conn.execute(
+        f"SELECT id FROM ({scored}) WHERE score > 0 ORDER BY score DESC, id LIMIT ? OFFSET ?",
+        [*patterns, limit, offset],
+    )
+    return SearchPage(keys=[row["id"] for row in rows], total=total)
+
+
+def _status_counts[S: Enum](
+    conn: sqlite3.Connection,
+    table: str,
+    statuses: type[S],
+    where: str = "",
+    params: tuple[Any, ...] = (),
+) -> dict[S, int]:
+    """Rows per status, zeros included; the status indexes keep this to an index scan."""
+    counts = dict.fromkeys(statuses, 0)
+    for row in conn.execute(f"SELECT status, COUNT(*) AS records FROM {table}{where} GROUP BY status", params):
+        counts[statuses(row["status"])] = row["records"]
+    return counts
+
+
+def _similar_ids(conn: sqlite3.Connection, table: str, record_id: str, limit: int) -> list[str]:
+    """Near misses for `record_id` among its neighbours in the primary key index."""
+    rows = conn.execute(
+        f"SELECT id FROM (SELECT id FROM {table} WHERE id < ? ORDER BY id DESC LIMIT ?)"
+        f" UNION ALL SELECT id FROM (SELECT id FROM {table} WHERE id >= ? ORDER BY id LIMIT ?)",
+        (record_id, SIMILAR_ID_NEIGHBOURS, record_id, SIMILAR_ID_NEIGHBOURS),
+    )
+    return close_ids(record_id, [row["id"] for row in rows], limit)
+
+
+class SQLiteJobRepository(JobRepository):
+    def __init__(self, database: SQLiteDatabase):
+        self.database = database
+        
+    @property
+    def version(self) -> int:
+        return self.database.version
+    
+    async def current_version(self) -> int:
+        return await self.database.current_version()
+    
+    async def add(self, job: Job) -> Job:
+        await self.database.transaction(
+            lambda conn: conn.execute("INSERT INTO jobs (id, name, deadline, status) VALUES (?, ?, ?, ?)", _job_params(job))
+        )
+        return job
+    
+    async def get(self, job_id: str) -> Job | None:
+        return await self.database.run(
+            lambda conn: _job_from_row(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+        )
+    
+    async def update(self, job_id: str, data: dict[str, Any]) -> Job | None:
+        def update_job(conn: sqlite3.Connection) -> Job | None:
+            job = _job_from_row(conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+            if job is None:
+                return None
+            job = updated_copy(job, data)
+            conn.execute("UPDATE jobs SET name = ?, deadline = ?, status = ? WHERE id = ?", _job_params(job)[1:] + (job.id,))
+            return job
+        return await self.database.transaction(update_job)
+    
+    async def delete(self, job_id: str) -> Job | None:
+        return await self.database.transaction(
+            lambda conn: _job_from_row(conn.execute("DELETE FROM jobs WHERE id = ? RETURNING *", (job_id,)).fetchone())
+        )
+    
+    async def add_many(self, jobs: list[Job]) -> list[Job]:
+        await self.database.transaction(
+            lambda conn: conn.executemany(
+                "INSERT INTO jobs (id, name, deadline, status) VALUES (?, ?, ?, ?)",
+                [_job_params(job) for job in jobs],
+            )
+        )
+        return jobs
+    
+    async def update_many(self, updates: dict[str, dict[str, Any]]) -> list[Job]:
+        def update_jobs(conn: sqlite3.Connection) -> list[Job]:
+            jobs = _fetch_by_ids(conn, "jobs", list(updates), _job_from_row)
+            jobs = [updated_copy(job, updates[job.id]) for job in jobs]
+            conn.executemany(
+                "UPDATE jobs SET name = ?, deadline = ?, status = ? WHERE id = ?",
+                [_job_params(job)[1:] + (job.id,) for job in jobs],
+            )
+            return jobs
+        return await self.database.transaction(update_jobs)
+    
+    async def delete_many(self, job_ids: list[str]) -> list[Job]:
+        def delete_jobs(conn: sqlite3.Connection) -> list[Job]:
+            jobs = _fetch_by_ids(conn, "jobs", job_ids, _job_from_row)
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(job.id,) for job in jobs])
+            return jobs
+        return await self.database.transaction(delete_jobs)
+    
+    async def count(self) -> int:
+        return await self.database.run(lambda conn: conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0])
+    
+    async def query(
+        self,
+        gte_date: datetime | None = None,
+        lte_date: datetime | None = None,
+        statuses: Iterable[JobStatus] | None = None,
+        after: tuple[datetime, str] | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[Job]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        if gte_date is not None:
+            clauses.append("deadline >= ?")
+            params.append(_timestamp(gte_date))
+        if lte_date is not None:
+            clauses.append("deadline <= ?")
+            params.append(_timestamp(lte_date))
+        if after is not None:
+            clauses.append("(deadline, id) > (?, ?)")
+            params.extend((_timestamp(after[0]), after[1]))
+        if statuses:
+            statuses = list(statuses)
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(JobStatus(status).value for status in statuses)
+        sql = "SELECT * FROM jobs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY deadline, id LIMIT ? OFFSET ?"
+        params.extend((-1 if limit is None else limit, offset))
+        return await self.database.run(
+            lambda conn: [Job.model_validate(dict(row)) for row in conn.execute(sql, params)]
+        )
+    
+    async def search(self, text: str, offset: int = 0, limit: int = 10) -> SearchPage[str]:
+        return await self.database.run(lambda conn: _search(conn, "jobs", "name", text, offset, limit))
+    
+    async def similar_ids(self, job_id: str, limit: int = 3) -> list[str]:
+        return await self.database.run(lambda conn: _similar_ids(conn, "jobs", job_id, limit))
+    
+    async def status_counts(self) -> dict[JobStatus, int]:
+        return await self.database.run(lambda conn: _status_counts(conn, "jobs", JobStatus))
+    
+    async def deadline_histogram(self, statuses: Iterable[JobStatus] | None = None) -> dict[date, int]:
+        # SQLite's date() takes offsets into account, so aware deadlines land on their UTC day.
+        sql = "SELECT date(deadline) AS day, COUNT(*) AS jobs FROM jobs"
+        params: list[Any] = []
+        if statuses:
+            values = list(dict.fromkeys(JobStatus(status).value for status in statuses))
+            sql += f" WHERE status IN ({', '.join('?' * len(values))})"
+            params.extend(values)
+        sql += " GROUP BY day ORDER BY day"
+        return await self.database.run(
+            lambda conn: {date.fromisoformat(row["day"]): row["jobs"] for row in conn.execute(sql, params)}
+        )
+    
+    
+class SQLiteApprovalRepository(ApprovalRepository):
+    def __init__(self, database: SQLiteDatabase):
+        self.database = database
+        
+    @property
+    def version(self) -> int:
+        return self.database.version
+    
+    async def current_version(self) -> int:
+        return await self.database.current_version()
+    
+    async def add(self, approval: Approval) -> Approval:
+        await self.database.transaction(
+            lambda conn: conn.execute(
+                "INSERT INTO approvals (id, person, request, status, job_id, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                _approval_params(approval),
+            )
+        )
+        return approval
+    
+    async def get(self, approval_id: str) -> Approval | None:
+        return await self.database.run(
+            lambda conn: _approval_from_row(conn.execute("SELECT * FROM approvals WHERE id = ?", (approval_id,)).fetchone())
+        )
+    
+    async def update(self, approval_id: str, data: dict[str, Any]) -> Approval | None:
+        def update_approval(conn: sqlite3.Connection) -> Approval | None:
+            approval = _approval_from_row(conn.execute("SELECT * FROM approvals WHERE id = ?", (approval_id,)).fetchone())
+            if approval is None:
+                return None
+            approval = updated_copy(approval, data)
+            conn.execute(
+                "UPDATE approvals SET person = ?, request = ?, status = ?, job_id = ?, created_at = ? WHERE id = ?",
+                _approval_params(approval)[1:] + (approval.id,),
+            )
+            return approval
+        return await self.database.transaction(update_approval)
+    
+    async def delete(self, approval_id: str) -> Approval | None:
+        return await self.database.transaction(
+            lambda conn: _approval_from_row(conn.execute("DELETE FROM approvals WHERE id = ? RETURNING *", (approval_id,)).fetchone())
+        )
+    
+    async def add_many(self, approvals: list[Approval]) -> list[Approval]:
+        await self.database.transaction(
+            lambda conn: conn.executemany(
+                "INSERT INTO approvals (id, person, request, status, job_id, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [_approval_params(approval) for approval in approvals],
+            )
+        )
+        return approvals
+    
+    async def update_many(self, updates: dict[str, dict[str, Any]]) -> list[Approval]:
+        def update_approvals(conn: sqlite3.Connection) -> list[Approval]:
+            approvals = _fetch_by_ids(conn, "approvals", list(updates), _approval_from_row)
+            approvals = [updated_copy(approval, updates[approval.id]) for approval in approvals]
+            conn.executemany(
+                "UPDATE approvals SET person = ?, request = ?, status = ?, job_id = ?, created_at = ? WHERE id = ?",
+                [_approval_params(approval)[1:] + (approval.id,) for approval in approvals],
+            )
+            return approvals
+        return await self.database.transaction(update_approvals)
+    
+    async def delete_many(self, approval_ids: list[str]) -> list[Approval]:
+        def delete_approvals(conn: sqlite3.Connection) -> list[Approval]:
+            approvals = _fetch_by_ids(conn, "approvals", approval_ids, _approval_from_row)
+            conn.executemany("DELETE FROM approvals WHERE id = ?", [(approval.id,) for approval in approvals])
+            return approvals
+        return await self.database.transaction(delete_approvals)
+    
+    async def count(self) -> int:
+        return await self.database.run(lambda conn: conn.execute("SELECT COUNT(*) FROM approvals").fetchone()[0])
+    
+    async def for_job(self, job_id: str) -> list[Approval]:
+        return await self.database.run(
+            lambda conn: [Approval.model_validate(dict(row)) for row in conn.execute("SELECT * FROM approvals WHERE job_id = ?", (job_id,))]
+        )
+    
+    async def search(self, text: str, offset: int = 0, limit: int = 10) -> SearchPage[str]:
+        return await self.database.run(
+            lambda conn: _search(conn, "approvals", "person || ' ' || request", text, offset, limit)
+        )
+    
+    async def similar_ids(self, approval_id: str, limit: int = 3) -> list[str]:
+        return await self.database.run(lambda conn: _similar_ids(conn, "approvals", approval_id, limit))
+    
+    async def status_counts(self, person: str | None = None) -> dict[ApprovalStatus, int]:
+        if person is None:
+            return await self.database.run(lambda conn: _status_counts(conn, "approvals", ApprovalStatus))
+        return await self.database.run(
+            lambda conn: _status_counts(conn, "approvals", ApprovalStatus, " WHERE person = ?", (person,))
+        )
+    
+    async def pending_for_job(self, job_id: str) -> int:
+        return await self.database.run(
+            lambda conn: conn.execute(
+                "SELECT COUNT(*) FROM approvals WHERE job_id = ? AND status = ?", (job_id, ApprovalStatus.PENDING.value)
+            ).fetchone()[0]
+        )
+    
+    async def pending_by_person(self) -> dict[str, dict[date, int]]:
+        def pending(conn: sqlite3.Connection) -> dict[str, dict[date, int]]:
+            by_person: dict[str, dict[date, int]] = {}
+            rows = conn.execute(
+                "SELECT person, date(created_at) AS day, COUNT(*) AS approvals FROM approvals"
+                " WHERE status = ? AND created_at IS NOT NULL GROUP BY person, day ORDER BY person, day",
+                (ApprovalStatus.PENDING.value,),
+            )
+            for row in rows:
+                by_person.setdefault(row["person"], {})[date.fromisoformat(row["day"])] = row["approvals"]
+            return by_person
+        return await self.database.run(pending)
@@ -0,0 +1,144 @@
+from collections.abc import Iterable
+from datetime import date, datetime
+
+from .base import JobRepository, ApprovalRepository
+from .memory import InMemoryJobRepository, InMemoryApprovalRepository
+from ..schemas import Job, JobStatus, Approval, ApprovalStatus
+from ..search import SearchPage
+
+
+class ReadOnlyRepositoryError(PermissionError):
+    """Raised when a write is attempted through a read-only repository view."""
+
+    def __init__(self):
+        super().__init__("This repository is read-only")
+
+
+class _ReadOnly:
+    """Rejects every mutation, leaving reads to the concrete view."""
+
+    async def add(self, *args, **kwargs):
+        raise ReadOnlyRepositoryError()
+
+    async def update(self, *args, **kwargs):
+        raise ReadOnlyRepositoryError()
+
+    async def delete(self, *args, **kwargs):
+        raise ReadOnlyRepositoryError()
+
+    async def add_many(self, *args, **kwargs):
+        raise ReadOnlyRepositoryError()
+
+    async def update_many(self, *args, **kwargs):
+        raise ReadOnlyRepositoryError()
+
+    async def delete_many(self, *args, **kwargs):
+        raise ReadOnlyRepositoryError()
+
+
+class ReadOnlyJobRepository(_ReadOnly, JobRepository):
+    """Zero-copy view that reads through to the wrapped repository."""
+
+    def __init__(self, wrapped: JobRepository):
+        self.wrapped = wrapped
+
+    @property
+    def version(self) -> int:
+        return self.wrapped.version
+
+    async def current_version(self) -> int:
+        return await self.wrapped.current_version()
+
+    async def get(self, job_id: str) -> Job | None:
+        return await self.wrapped.get(job_id)
+
+    async def get_json(self, job_id: str) -> str | None:
+        return await self.wrapped.get_json(job_id)
+
+    async def count(self) -> int:
+        return await self.wrapped.count()
+
+    async def query(
+        self,
+        gte_date: datetime | None = None,
+        lte_date: datetime | None = None,
+        statuses: Iterable[JobStatus] | None = None,
+        after: tuple[datetime, str] | None = None,
+        offset: int = 0,
+        limit: int | None = None,
+    ) -> list[Job]:
+        return await self.wrapped.query(
+            gte_date=gte_date, lte_date=lte_date, statuses=statuses, after=after, offset=offset, limit=limit,
+        )
+
+    async def search(self, text: str, offset: int = 0, limit: int = 10) -> SearchPage[str]:
+        return await self.wrapped.search(text, offset, limit)
+
+    async def similar_ids(self, record_id: str, limit: int = 3) -> list[str]:
+        return await self.wrapped.similar_ids(record_id, limit)
+
+    async def status_counts(self) -> dict[JobStatus, int]:
+        return await self.wrapped.status_counts()
+
+    async def deadline_histogram(self, statuses: Iterable[JobStatus] | None = None) -> dict[date, int]:
+        return await self.wrapped.deadline_histogram(statuses)
+
+
+class ReadOnlyApprovalRepository(_ReadOnly, ApprovalRepository):
+    """Zero-copy view that reads through to the wrapped repository."""
+
+    def __init__(self, wrapped: ApprovalRepository):
+        self.wrapped = wrapped
+
+    @property
+    def version(self) -> int:
+        return self.wrapped.version
+
+    async def current_version(self) -> int:
+        return await self.wrapped.current_version()
+
+    async def get(self, approval_id: str) -> Approval | None:
+        return await self.wrapped.get(approval_id)
+
+    async def get_json(self, approval_id: str) -> str | None:
+        return await self.wrapped.get_json(approval_id)
+
+    async def count(self) -> int:
+        return await self.wrapped.count()
+
+    async def for_job(self, job_id: str) -> list[Approval]:
+        return await self.wrapped.for_job(job_id)
+
+    async def search(self, text: str, offset: int = 0, limit: int = 10) -> SearchPage[str]:
+        return await self.wrapped.search(text, offset, limit)
+
+    async def similar_ids(self, record_id: str, limit: int = 3) -> list[str]:
+        return await self.wrapped.similar_ids(record_id, limit)
+
+    async def status_counts(self, person: str | None = None) -> dict[ApprovalStatus, int]:
+        return await self.wrapped.status_counts(person)
+
+    async def pending_for_job(self, job_id: str) -> int:
+        return await self.wrapped.pending_for_job(job_id)
+
+    async def pending_by_person(self) -> dict[str, dict[date, int]]:
+        return await self.wrapped.pending_by_person()
+
+
+class CopyOnWriteJobRepository(InMemoryJobRepository):
+    """A private snapshot of the source's jobs, taken when the view is made.
+
+    Later writes to the source are not seen, and the view's writes stay private. Taking the
+    snapshot copies the store's indexes, which is O(N) but needs no re-indexing, since the
+    records themselves are shared.
+    """
+
+    def __init__(self, source: InMemoryJobRepository):
+        super().__init__(source.store.snapshot())
+
+
+class CopyOnWriteApprovalRepository(InMemoryApprovalRepository):
+    """A private snapshot of the source's approvals, taken when the view is made; see CopyOnWriteJobRepository."""
+
+    def __init__(self, source: InMemoryApprovalRepository):
+        super().__init__(source.store.snapshot())
@@ -0,0 +1,120 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+import time
+from typing import Any
+
+from pydantic_ai import Agent, AgentRunResult, ModelMessage
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+from pydantic_ai.usage import RunUsage
+
+
+def normalize_input(user_input: str) -> str:
+    return " ".join(user_input.lower().split()).rstrip("?!. ")
+
+
+class ResponseCache:
+    """LRU cache of final agent outputs, with entries expiring `ttl` seconds after they are stored.
+
+    Keys carry the repositories' write versions, so any change to the jobs or approvals makes
+    older entries unreachable; they then age out through LRU eviction or the TTL.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[Hashable, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> str | None:
+        entry = self._entries.get(key)
+        if entry is not None and self.clock() - entry[0] > self.ttl:
+            del self._entries[key]
+            self.evictions += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, output: str) -> None:
+        self._entries[key] = (self.clock(), output)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def report(self) -> str:
+        return (
+            f"Response cache: {self.hit_rate:.1%} hit rate ({self.hits} hits, {self.misses} misses), "
+            f"{len(self)} entries, {self.evictions} evicted"
+        )
+
+
+@dataclass
+class CachedRun:
+    """Stands in for an AgentRunResult when the output came from the cache."""
+
+    output: str
+    messages: list[ModelMessage]
+
+    def all_messages(self) -> list[ModelMessage]:
+        return self.messages
+
+    def new_messages(self) -> list[ModelMessage]:
+        """The prompt and the cached answer."""
+        return self.messages[-2:]
+
+    def usage(self) -> RunUsage:
+        return RunUsage()
+
+
+async def state_version(deps: Any) -> tuple[int, int]:
+    return await deps.jobs.current_version(), await deps.approvals.current_version()
+
+
+async def run_with_cache(
+    agent: Agent,
+    cache: ResponseCache | None,
+    user_input: str,
+    deps: Any,
+    message_history: list[ModelMessage],
+    scope: Hashable = None,
+) -> AgentRunResult | CachedRun:
+    """Answer from the cache when the same input was seen in the same scope and mode at the same state version.
+
+    `scope` keeps conversations apart, since a question can mean something else in another one;
+    SessionServer passes the session ID. Only runs that changed nothing are stored, so a cached
+    reply is never a stale write confirmation.
+    """
+    if cache is None:
+        return await agent.run(user_prompt=user_input, message_history=message_history, deps=deps)
+    version = await state_version(deps)
+    key = (scope, normalize_input(user_input), getattr(deps, "agent_mode", None), version)
+    output = cache.get(key)
+    if output is not None:
+        return CachedRun(
+            output=output,
+            messages=[
+                *message_history,
+                ModelRequest(parts=[UserPromptPart(content=user_input)]),
+                ModelResponse(parts=[TextPart(content=output)]),
+            ],
+        )
+    result = await agent.run(user_prompt=user_input, message_history=message_history, deps=deps)
+    if await state_version(deps) == version and isinstance(result.output, str):
+        cache.put(key, result.output)
+    return result
@@ -0,0 +1,109 @@
+"""Keep tool errors from turning into retry storms.
+
+A missing ID is answered with an ordinary tool result that carries near-miss suggestions, so the
+model can correct itself without a retry. Errors that do ask for a retry (a bad argument, a tool
+called in the wrong mode) draw on a per-run budget; once it is spent, the error is handed back as
+a final result and the model is told to stop and explain instead of trying again.
+"""
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_ai import RunContext, ModelRetry, ToolReturn
+from pydantic_ai.toolsets import WrapperToolset, ToolsetTool
+
+from .repositories import JobRepository, ApprovalRepository
+from .schemas import record_type
+from .serialization import dump_compact
+
+# Runs whose spending is remembered; older ones are forgotten first.
+_MAX_RUNS = 256
+
+
+@dataclass
+class RetryBudget:
+    """How many tool retries each agent run may use, across all of its tools, and how many it did.
+
+    Sub-agent runs have their own run IDs, so they get their own budget while sharing the totals.
+    """
+
+    limit: int = 3
+    granted: int = 0
+    refused: int = 0
+    avoided: int = 0
+    """Not-found results answered with near misses instead of a retry."""
+    exhausted_runs: int = 0
+    _spent: dict[str, int] = field(default_factory=dict, repr=False)
+
+    def allow(self, run_id: str) -> bool:
+        """Spend one retry for the run if it has any left."""
+        spent = self._spent.pop(run_id, 0)
+        self._spent[run_id] = spent
+        if len(self._spent) > _MAX_RUNS:
+            del self._spent[next(iter(self._spent))]
+        if spent >= self.limit:
+            self.refused += 1
+            return False
+        self._spent[run_id] = spent + 1
+        self.granted += 1
+        self.exhausted_runs += spent + 1 == self.limit
+        return True
+
+    def report(self) -> str:
+        return (
+            f"Tool retries: {self.granted} granted, {self.refused} refused, {self.avoided} avoided with suggestions; "
+            f"{self.exhausted_runs} runs used all {self.limit}"
+        )
+
+
+@dataclass
+class RetryBudgetToolset(WrapperToolset[Any]):
+    """Let ModelRetry errors through while the run's budget in `ctx.deps.retry_budget` lasts."""
+
+    async def call_tool(self, name: str, tool_args: dict[str, Any], ctx: RunContext[Any], tool: ToolsetTool[Any]) -> Any:
+        try:
+            return await super().call_tool(name, tool_args, ctx, tool)
+        except ModelRetry as e:
+            allowed = ctx.deps.retry_budget.allow(ctx.run_id)
+            if ctx.deps.instrumentation is not None:
+                ctx.deps.instrumentation.count("retry_budget", "granted" if allowed else "refused")
+            if allowed:
+                raise
+            return ToolReturn(
+                return_value=f"{e.message} No retries are left for this request: "
+                "do not call the tool again, tell the user what went wrong instead.",
+            )
+
+
+async def not_found(
+    ctx: RunContext[Any],
+    repository: JobRepository | ApprovalRepository,
+    expected: type[BaseModel],
+    record_ids: list[str],
+    prefix: str = "",
+) -> ToolReturn:
+    """The result for IDs that do not exist: what went wrong, and the existing IDs closest to each."""
+    kind = expected.__name__.lower()
+    hints: list[str] = []
+    suggestions: dict[str, list[str]] = {}
+    for record_id in record_ids:
+        actual = record_type(record_id)
+        if actual is not None and actual is not expected:
+            name = actual.__name__.lower()
+            hints.append(f"{record_id} is {'an' if name[0] in 'aeiou' else 'a'} {name} ID, not {'an' if kind[0] in 'aeiou' else 'a'} {kind} ID")
+        else:
+            suggestions[record_id] = await repository.similar_ids(record_id)
+    ctx.deps.retry_budget.avoided += 1
+    if len(record_ids) == 1:
+        message = f"{prefix}{kind.capitalize()} not found with ID: {record_ids[0]}."
+    else:
+        message = f"{prefix}{kind.capitalize()}s not found with IDs: {', '.join(record_ids)}."
+    message += "".join(f" {hint}." for hint in hints)
+    for record_id, close in suggestions.items():
+        if close:
+            message += f" Did you mean {' or '.join(close)}" + ("?" if len(record_ids) == 1 else f" for {record_id}?")
+    message += f" Use a suggested ID or search_{kind}s to find the right one; do not retry the same ID."
+    return ToolReturn(
+        return_value=message,
+        content=dump_compact({"error": "not_found", "kind": kind, "ids": record_ids, "suggestions": suggestions, "hints": hints}),
+    )
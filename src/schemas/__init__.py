@@ -1,3 +1,5 @@
+from pydantic import BaseModel
+
 from .jobs import (
     Job,
     JobCreate,
@@ -10,8 +12,20 @@ from .approvals import (
     ApprovalCreate,
     ApprovalUpdate,
     ApprovalDelete,
+    ApprovalStatus,
 )
 
+RECORD_TYPES: dict[str, type[BaseModel]] = {
+    "job": Job,
+    "approval": Approval,
+}
+
+
+def record_type(record_id: str) -> type[BaseModel] | None:
+    """The model an ID belongs to, dispatched on its prefix."""
+    return RECORD_TYPES.get(record_id.partition("_")[0])
+
+
 __all__ = [
     "Job",
     "JobCreate",
@@ -22,4 +36,7 @@ __all__ = [
     "ApprovalCreate",
     "ApprovalUpdate",
     "ApprovalDelete",
+    "ApprovalStatus",
+    "RECORD_TYPES",
+    "record_type",
 ]
\ No newline at end of file
@@ -1,6 +1,7 @@
+from datetime import datetime, timezone
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from src.utils import prefixed_uuid
 
@@ -17,6 +18,9 @@ class Approval(BaseModel):
     request: str = Field(..., description="Description of the request that needs approval")
     status: ApprovalStatus = Field(..., description="Current status of the approval request")
     job_id: str | None = Field(None, description="ID of the related job, if applicable")
+    created_at: datetime | None = Field(
+        default_factory=lambda: datetime.now(timezone.utc), description="When the approval was requested, if known",
+    )
     
     
 class ApprovalCreate(BaseModel):
@@ -32,6 +36,14 @@ class ApprovalUpdate(BaseModel):
     request: str | None = Field(None, description="Description of the request that needs approval")
     status: ApprovalStatus | None = Field(None, description="Current status of the approval request")
     
+    @field_validator("person", "request", "status")
+    @classmethod
+    def _not_null(cls, value):
+        # Omit a field to leave it unchanged; these fields cannot be cleared.
+        if value is None:
+            raise ValueError("cannot be null, omit it to keep the current value")
+        return value
+    
     
 class ApprovalDelete(BaseModel):
     id: str = Field(..., description="ID of the approval to delete")
\ No newline at end of file
@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 from ..utils import prefixed_uuid
 
@@ -32,6 +32,14 @@ class JobUpdate(BaseModel):
     deadline: datetime | None = Field(None, description="Deadline for the job")
     status: JobStatus | None = Field(None, description="Current status of the job")
     
+    @field_validator("name", "deadline", "status")
+    @classmethod
+    def _not_null(cls, value):
+        # Omit a field to leave it unchanged; these fields cannot be cleared.
+        if value is None:
+            raise ValueError("cannot be null, omit it to keep the current value")
+        return value
+    
     
 class JobDelete(BaseModel):
     id: str = Field(..., description="ID of the job to delete")
\ No newline at end of file
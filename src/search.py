@@ -0,0 +1,138 @@
+from collections import Counter
+from collections.abc import Hashable
+from dataclasses import dataclass
+import heapq
+from itertools import islice
+import math
+import re
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def trigrams(token: str) -> set[str]:
+    padded = f"^{token}$"
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+@dataclass
+class SearchPage[K]:
+    keys: list[K]
+    total: int
+
+
+class SearchIndex[K: Hashable]:
+    """Incremental inverted index from tokens to record keys, with fuzzy matching through trigrams.
+
+    Every alphabetic token in the vocabulary is also indexed by its trigrams, so a misspelt query
+    token finds the tokens it shares the most trigrams with. Numeric tokens only match exactly;
+    they are mostly unique and would flood the trigram buckets.
+
+    A record scores, per query token, the best similarity * IDF among the tokens it contains, and
+    those are summed over the query tokens. A query that resolves to a single token pages straight
+    off its posting list; otherwise the cost grows with the number of matching records.
+    """
+
+    def __init__(self, min_similarity: float = 0.5, max_variants: int = 8):
+        self.min_similarity = min_similarity
+        self.max_variants = max_variants
+        # Most tokens (numbers, rare words) occur once; those skip the per-token dict.
+        self._single: dict[str, K] = {}
+        self._postings: dict[str, dict[K, None]] = {}
+        self._trigrams: dict[str, dict[str, None]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def copy(self) -> "SearchIndex[K]":
+        clone = SearchIndex[K](self.min_similarity, self.max_variants)
+        clone._single = self._single.copy()
+        clone._postings = {token: keys.copy() for token, keys in self._postings.items()}
+        clone._trigrams = {gram: tokens.copy() for gram, tokens in self._trigrams.items()}
+        clone._size = self._size
+        return clone
+
+    def add(self, key: K, text: str) -> None:
+        """Index `key` under the tokens of `text`; `remove` must be given the same text."""
+        self._size += 1
+        for token in dict.fromkeys(tokenize(text)):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings[key] = None
+            elif token in self._single:
+                self._postings[token] = {self._single.pop(token): None, key: None}
+            else:
+                self._single[token] = key
+                if not token.isdigit():
+                    for gram in trigrams(token):
+                        self._trigrams.setdefault(gram, {})[token] = None
+
+    def remove(self, key: K, text: str) -> None:
+        self._size -= 1
+        for token in dict.fromkeys(tokenize(text)):
+            postings = self._postings.get(token)
+            if postings is not None:
+                del postings[key]
+                if len(postings) == 1:
+                    self._single[token] = next(iter(postings))
+                    del self._postings[token]
+                continue
+            del self._single[token]
+            if not token.isdigit():
+                for gram in trigrams(token):
+                    bucket = self._trigrams[gram]
+                    del bucket[token]
+                    if not bucket:
+                        del self._trigrams[gram]
+
+    def _keys(self, token: str) -> dict[K, None] | tuple[K]:
+        postings = self._postings.get(token)
+        return (self._single[token],) if postings is None else postings
+
+    def variants(self, token: str) -> list[tuple[str, float]]:
+        """Vocabulary tokens matching `token`, with a similarity from 1.0 (exact) down to `min_similarity`."""
+        if token.isdigit():
+            return [(token, 1.0)] if token in self._postings or token in self._single else []
+        grams = trigrams(token)
+        shared: Counter[str] = Counter()
+        for gram in grams:
+            shared.update(self._trigrams.get(gram, {}).keys())
+        # Dice coefficient over trigram sets; a token of length n has at most n padded trigrams.
+        scored = (
+            (other, 2 * count / (len(grams) + len(other)))
+            for other, count in shared.items()
+        )
+        matches = heapq.nlargest(
+            self.max_variants,
+            (item for item in scored if item[1] >= self.min_similarity),
+            key=lambda item: item[1],
+        )
+        return [(other, 1.0 if other == token else similarity) for other, similarity in matches]
+
+    def search(self, text: str, offset: int = 0, limit: int = 10) -> SearchPage[K]:
+        matches = [self.variants(token) for token in dict.fromkeys(tokenize(text))]
+        if len(matches) == 1 and len(matches[0]) == 1:
+            # Every match scores the same, so the page comes straight off the posting list.
+            postings = self._keys(matches[0][0][0])
+            return SearchPage(keys=list(islice(postings, offset, offset + limit)), total=len(postings))
+        documents = self._size
+        scores: dict[K, float] = {}
+        for variants in matches:
+            weighted = sorted(
+                (similarity * math.log(1 + documents / len(self._keys(variant))), variant)
+                for variant, similarity in variants
+            )
+            # Lowest weight first, so each key ends up with its best variant's weight.
+            best: dict[K, float] = {}
+            for weight, variant in weighted:
+                best.update(dict.fromkeys(self._keys(variant), weight))
+            # Bulk dict updates keep this C-speed; only keys matching several tokens are summed in Python.
+            summed = {key: scores[key] + best[key] for key in scores.keys() & best.keys()}
+            scores.update(best)
+            scores.update(summed)
+        ranked = heapq.nlargest(offset + limit, scores, key=scores.__getitem__)
+        return SearchPage(keys=ranked[offset:], total=len(scores))
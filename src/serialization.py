@@ -0,0 +1,58 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+
+# Rough size of a token in JSON payloads; good enough for budgeting without a tokenizer.
+BYTES_PER_TOKEN = 4
+
+
+@dataclass
+class SerializedRecords:
+    payload: str
+    returned: int
+    total: int
+    
+    @property
+    def truncated(self) -> bool:
+        return self.returned < self.total
+    
+    
+@cache
+def _list_adapter(record_type: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    return TypeAdapter(list[record_type])
+
+
+def dump_record(record: BaseModel) -> str:
+    return record.model_dump_json()
+
+
+def dump_compact(value: Any) -> str:
+    return to_json(value).decode()
+
+
+def dump_records(records: Sequence[BaseModel], max_tokens: int) -> SerializedRecords:
+    """Serialize records to a JSON array straight from pydantic, keeping the payload within a token budget."""
+    max_bytes = max_tokens * BYTES_PER_TOKEN
+    if not records:
+        return SerializedRecords(payload="[]", returned=0, total=0)
+    payload = _list_adapter(type(records[0])).dump_json(list(records))
+    if len(payload) <= max_bytes:
+        return SerializedRecords(payload=payload.decode(), returned=len(records), total=len(records))
+    parts: list[bytes] = []
+    size = 2
+    for record in records:
+        part = record.model_dump_json().encode()
+        size += len(part) + (1 if parts else 0)
+        # Always return at least one record so callers can page past it.
+        if size > max_bytes and parts:
+            break
+        parts.append(part)
+    return SerializedRecords(
+        payload=(b"[" + b",".join(parts) + b"]").decode(),
+        returned=len(parts),
+        total=len(records),
+    )
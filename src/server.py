@@ -0,0 +1,188 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import inspect
+import json
+import sys
+import time
+from typing import Any
+from uuid import uuid4
+
+from pydantic_ai import Agent, ModelMessage, AgentRunResult
+
+from .response_cache import run_with_cache
+
+
+class ServerBusyError(Exception):
+    pass
+
+
+@dataclass
+class Session:
+    deps: Any
+    history: list[ModelMessage] = field(default_factory=list)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_used: float = field(default_factory=time.monotonic)
+    
+    
+class SessionServer:
+    """Serve many concurrent conversations from one process.
+    
+    Turns within a session run one at a time, at most `max_concurrency` agent runs
+    are in flight across all sessions, and new turns are rejected with
+    ServerBusyError once `max_pending` turns are already queued or running.
+    
+    `sessions` is kept in least recently used order. Sessions idle for longer than
+    `session_ttl` seconds are dropped, as are the least recently used ones beyond
+    `max_sessions`; sessions with a turn in progress are never dropped.
+    """
+    
+    def __init__(
+        self,
+        agent: Agent,
+        deps_factory: Callable[[], Any],
+        before_turn: Callable[[Any, str], None] | None = None,
+        after_turn: Callable[[Any, AgentRunResult], Awaitable[None] | None] | None = None,
+        max_concurrency: int = 32,
+        max_pending: int = 256,
+        session_ttl: float | None = 1800.0,
+        max_sessions: int = 1024,
+    ):
+        self.agent = agent
+        self.deps_factory = deps_factory
+        self.before_turn = before_turn
+        self.after_turn = after_turn
+        self.max_pending = max_pending
+        self.session_ttl = session_ttl
+        self.max_sessions = max_sessions
+        self.sessions: dict[str, Session] = {}
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._pending = 0
+        
+    async def run_turn(self, session_id: str, user_input: str) -> str:
+        if self._pending >= self.max_pending:
+            raise ServerBusyError(f"Server is busy ({self._pending} turns pending), retry later")
+        self._pending += 1
+        try:
+            session = self._session(session_id)
+            async with session.lock, self._slots:
+                if self.before_turn is not None:
+                    self.before_turn(session.deps, user_input)
+                mode, started = getattr(session.deps, "agent_mode", None), time.perf_counter()
+                response = await run_with_cache(
+                    self.agent,
+                    getattr(session.deps, "response_cache", None),
+                    user_input,
+                    session.deps,
+                    session.history,
+                    scope=session_id,
+                )
+                messages = response.all_messages()
+                recorder = getattr(session.deps, "recorder", None)
+                if recorder is not None:
+                    recorder.record(
+                        user_input, response.new_messages(), time.perf_counter() - started, response.usage(), mode
+                    )
+                session.history = messages
+                if self.after_turn is not None:
+                    finished = self.after_turn(session.deps, response)
+                    if inspect.isawaitable(finished):
+                        await finished
+                return response.output
+        finally:
+            self._pending -= 1
+            
+    def close_session(self, session_id: str) -> bool:
+        """Forget a session and its history; a turn already running in it still finishes."""
+        return self.sessions.pop(session_id, None) is not None
+            
+    def _session(self, session_id: str) -> Session:
+        """The session, created if needed and moved to the most recently used end."""
+        session = self.sessions.pop(session_id, None)
+        self._evict()
+        if session is None:
+            session = Session(deps=self.deps_factory())
+        session.last_used = time.monotonic()
+        self.sessions[session_id] = session
+        return session
+    
+    def _evict(self) -> None:
+        """Drop sessions idle past their TTL, and the least recently used ones to make room for one more."""
+        expired = None if self.session_ttl is None else time.monotonic() - self.session_ttl
+        excess = len(self.sessions) - self.max_sessions + 1
+        for session_id, session in list(self.sessions.items()):
+            if excess <= 0 and (expired is None or session.last_used > expired):
+                break
+            if session.lock.locked():
+                continue
+            del self.sessions[session_id]
+            excess -= 1
+            
+    async def handle_line(self, line: bytes) -> dict[str, Any]:
+        try:
+            request = json.loads(line)
+            if request.get("close"):
+                session_id = request["session_id"]
+                return {"session_id": session_id, "closed": self.close_session(session_id)}
+            session_id = request.get("session_id") or str(uuid4())
+            user_input = request["input"]
+        except (ValueError, KeyError, AttributeError) as e:
+            return {"error": "bad_request", "detail": str(e)}
+        try:
+            output = await self.run_turn(session_id, user_input)
+        except ServerBusyError as e:
+            return {"session_id": session_id, "error": "busy", "detail": str(e)}
+        except Exception as e:
+            return {"session_id": session_id, "error": type(e).__name__, "detail": str(e)}
+        return {"session_id": session_id, "output": output}
+    
+    async def serve_stream(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter | Any) -> None:
+        """Handle JSON-lines requests from one stream, running each request concurrently."""
+        write_lock = asyncio.Lock()
+        
+        async def respond(line: bytes) -> None:
+            response = await self.handle_line(line)
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+                
+        async with asyncio.TaskGroup() as tasks:
+            while line := await reader.readline():
+                if line.strip():
+                    tasks.create_task(respond(line))
+                    
+    async def serve_tcp(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            try:
+                await self.serve_stream(reader, writer)
+            finally:
+                writer.close()
+                
+        server = await asyncio.start_server(handle_connection, host, port)
+        async with server:
+            await server.serve_forever()
+            
+    async def serve_stdio(self) -> None:
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, sys.stdout)
+        writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+        await self.serve_stream(reader, writer)
+        
+        
+def add_server_arguments(parser: Any) -> None:
+    parser.add_argument("--serve", choices=["tcp", "stdio"], help="Serve JSON-lines sessions instead of the interactive loop")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-concurrency", type=int, default=32)
+    parser.add_argument("--max-pending", type=int, default=256)
+    parser.add_argument("--session-ttl", type=float, default=1800.0, help="Drop sessions idle for this many seconds")
+    parser.add_argument("--max-sessions", type=int, default=1024, help="Drop the least recently used sessions beyond this many")
+    
+    
+async def serve(server: SessionServer, args: Any) -> None:
+    if args.serve == "stdio":
+        await server.serve_stdio()
+    else:
+        await server.serve_tcp(args.host, args.port)
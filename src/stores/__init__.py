@@ -0,0 +1,14 @@
+from .base import updated_copy
+from .jobs import JobStore, encode_cursor, decode_cursor
+from .approvals import ApprovalStore
+from .columnar import ColumnarJobStore, ColumnarApprovalStore
+
+__all__ = [
+    "JobStore",
+    "encode_cursor",
+    "decode_cursor",
+    "ApprovalStore",
+    "ColumnarJobStore",
+    "ColumnarApprovalStore",
+    "updated_copy",
+]
@@ -0,0 +1,38 @@
+"""Counters the stores keep up to date as records change, so summaries never have to scan records."""
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date, datetime
+from enum import Enum
+
+from ..utils import naive_utc
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+DAY_MICROS = 86_400_000_000
+
+
+def epoch_day(value: datetime) -> int:
+    """Days since 1970-01-01. Aware datetimes count on their UTC day, naive ones on their own day."""
+    return (naive_utc(value) - _EPOCH).days
+
+
+def bump[K](counts: dict[K, int], key: K, delta: int) -> None:
+    """Add `delta` to a count, dropping the key once it reaches zero."""
+    count = counts.get(key, 0) + delta
+    if count:
+        counts[key] = count
+    else:
+        del counts[key]
+
+
+def dated(counts: dict[int, int]) -> dict[date, int]:
+    """Epoch-day counts as dates, oldest first."""
+    return {date.fromordinal(_EPOCH_ORDINAL + day): count for day, count in sorted(counts.items())}
+
+
+def merge_days(by_status: dict[Enum, dict[int, int]], statuses: Iterable[Enum]) -> dict[date, int]:
+    """Sum the per-day counts of the given statuses."""
+    merged: Counter[int] = Counter()
+    for status in dict.fromkeys(statuses):
+        merged.update(by_status[status])
+    return dated(merged)
@@ -0,0 +1,73 @@
+from collections.abc import Iterator
+from datetime import date
+
+from .aggregates import bump, dated, epoch_day
+from .base import IndexedStore
+from ..schemas import Approval, ApprovalStatus
+
+
+class ApprovalStore(IndexedStore[Approval]):
+    status_type = ApprovalStatus
+    
+    def __init__(self, *args, **kwargs):
+        self._by_job_id: dict[str, dict[str, None]] = {}
+        # Pending approvals with a known creation time, per person and creation day.
+        self._pending_days: dict[str, dict[int, int]] = {}
+        self._by_person: dict[str, dict[ApprovalStatus, int]] = {}
+        self._pending_by_job: dict[str, int] = {}
+        super().__init__(*args, **kwargs)
+        
+    def for_job(self, job_id: str) -> Iterator[Approval]:
+        for approval_id in self._by_job_id.get(job_id, {}):
+            yield self._by_id[approval_id]
+            
+    def person_counts(self, person: str) -> dict[ApprovalStatus, int]:
+        """Number of the person's approvals in each status, zeros included."""
+        counts = self._by_person.get(person, {})
+        return {status: counts.get(status, 0) for status in self.status_type}
+    
+    def pending_for_job(self, job_id: str) -> int:
+        return self._pending_by_job.get(job_id, 0)
+    
+    def pending_by_person(self) -> dict[str, dict[date, int]]:
+        """Pending approvals per person and the day they were requested, oldest day first."""
+        return {person: dated(days) for person, days in self._pending_days.items()}
+            
+    def _copy_indexes(self) -> None:
+        super()._copy_indexes()
+        self._by_job_id = {job_id: ids.copy() for job_id, ids in self._by_job_id.items()}
+        self._pending_days = {person: days.copy() for person, days in self._pending_days.items()}
+        self._by_person = {person: counts.copy() for person, counts in self._by_person.items()}
+        self._pending_by_job = self._pending_by_job.copy()
+            
+    def _search_text(self, record: Approval) -> str:
+        return f"{record.person} {record.request}"
+            
+    def _index(self, record: Approval) -> None:
+        super()._index(record)
+        bump(self._by_person.setdefault(record.person, {}), record.status, 1)
+        if record.job_id is not None:
+            self._by_job_id.setdefault(record.job_id, {})[record.id] = None
+            if record.status == ApprovalStatus.PENDING:
+                bump(self._pending_by_job, record.job_id, 1)
+        if record.status == ApprovalStatus.PENDING and record.created_at is not None:
+            bump(self._pending_days.setdefault(record.person, {}), epoch_day(record.created_at), 1)
+            
+    def _unindex(self, record: Approval) -> None:
+        super()._unindex(record)
+        counts = self._by_person[record.person]
+        bump(counts, record.status, -1)
+        if not counts:
+            del self._by_person[record.person]
+        if record.job_id is not None:
+            bucket = self._by_job_id[record.job_id]
+            del bucket[record.id]
+            if not bucket:
+                del self._by_job_id[record.job_id]
+            if record.status == ApprovalStatus.PENDING:
+                bump(self._pending_by_job, record.job_id, -1)
+        if record.status == ApprovalStatus.PENDING and record.created_at is not None:
+            days = self._pending_days[record.person]
+            bump(days, epoch_day(record.created_at), -1)
+            if not days:
+                del self._pending_days[record.person]
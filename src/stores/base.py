@@ -0,0 +1,162 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left, insort
+from collections.abc import Iterable, Iterator
+from copy import copy
+from enum import Enum
+from typing import Any, Self
+
+from pydantic import BaseModel
+
+from ..search import SearchIndex, SearchPage
+from ..utils import SIMILAR_ID_NEIGHBOURS, close_ids
+
+
+def updated_copy[T: BaseModel](record: T, data: dict[str, Any]) -> T:
+    """A validated copy of `record` with `data` applied, leaving `record` untouched if `data` is invalid."""
+    return record.model_validate(record.model_dump() | {key: value for key, value in data.items() if key != "id"})
+
+
+class IndexedStore[T: BaseModel](ABC):
+    """In-memory record store with an ID hash index, a status index and a text search index.
+    
+    Index buckets are dicts used as ordered sets, so removals are O(1) and
+    iteration keeps insertion order. `version` goes up on every change. Updates
+    replace a record rather than change it, so records handed out never change
+    under the caller and snapshots can share them.
+    """
+    
+    status_type: type[Enum]
+    
+    def __init__(self, records: Iterable[T] = ()):
+        self._by_id: dict[str, T] = {}
+        self._sorted_ids: list[str] = []
+        self._json: dict[str, str] = {}
+        self.version = 0
+        self._by_status: dict[Any, dict[str, None]] = {status: {} for status in self.status_type}
+        self._search: SearchIndex[str] = SearchIndex()
+        self.extend(records)
+            
+    def __len__(self) -> int:
+        return len(self._by_id)
+    
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._by_id.values())
+    
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self._by_id
+    
+    def get(self, record_id: str) -> T | None:
+        return self._by_id.get(record_id)
+    
+    def snapshot(self) -> Self:
+        """An independent copy that shares the records, at the cost of copying the indexes, not rebuilding them."""
+        clone = copy(self)
+        clone._copy_indexes()
+        return clone
+    
+    def add(self, record: T) -> T:
+        self._insert(record)
+        insort(self._sorted_ids, record.id)
+        return record
+    
+    def extend(self, records: Iterable[T]) -> list[T]:
+        # Sort the ID list once at the end rather than paying an insort per record.
+        added: list[T] = []
+        try:
+            for record in records:
+                added.append(self._insert(record))
+        finally:
+            self._sorted_ids.extend(record.id for record in added)
+            self._sorted_ids.sort()
+        return added
+    
+    def _insert(self, record: T) -> T:
+        if record.id in self._by_id:
+            raise ValueError("Duplicate ID: " + record.id)
+        self._by_id[record.id] = record
+        self._index(record)
+        self.version += 1
+        return record
+    
+    def update(self, record_id: str, data: dict[str, Any]) -> T | None:
+        record = self._by_id.get(record_id)
+        if record is None:
+            return None
+        return self._apply(record, updated_copy(record, data))
+    
+    def update_many(self, updates: dict[str, dict[str, Any]]) -> list[T]:
+        """Apply updates to existing records, all or none: every copy is validated before any is applied."""
+        changes = [(self._by_id[record_id], data) for record_id, data in updates.items()]
+        changes = [(record, updated_copy(record, data)) for record, data in changes]
+        return [self._apply(record, updated) for record, updated in changes]
+    
+    def _apply(self, record: T, updated: T) -> T:
+        """Replace `record` with `updated`, putting `record` back if indexing fails."""
+        self._json.pop(record.id, None)
+        self._unindex(record)
+        try:
+            self._by_id[record.id] = updated
+            self._index(updated)
+        except BaseException:
+            self._by_id[record.id] = record
+            self._index(record)
+            raise
+        self.version += 1
+        return updated
+    
+    def delete(self, record_id: str) -> T | None:
+        record = self._by_id.pop(record_id, None)
+        if record is not None:
+            del self._sorted_ids[bisect_left(self._sorted_ids, record_id)]
+            self._json.pop(record_id, None)
+            self._unindex(record)
+            self.version += 1
+        return record
+    
+    def dump(self, record_id: str) -> str | None:
+        """The record as JSON, serialized once and reused until the record changes."""
+        payload = self._json.get(record_id)
+        if payload is None:
+            record = self._by_id.get(record_id)
+            if record is None:
+                return None
+            payload = self._json[record_id] = record.model_dump_json()
+        return payload
+    
+    def by_status(self, statuses: Iterable[Enum]) -> Iterator[T]:
+        for status in statuses:
+            for record_id in self._by_status[status]:
+                yield self._by_id[record_id]
+                
+    def status_counts(self) -> dict[Any, int]:
+        """Number of records in each status, zeros included."""
+        return {status: len(ids) for status, ids in self._by_status.items()}
+                
+    def similar_ids(self, record_id: str, limit: int = 3) -> list[str]:
+        """Existing IDs that look like a mistyped `record_id`, from its neighbours in ID order."""
+        position = bisect_left(self._sorted_ids, record_id)
+        neighbours = self._sorted_ids[max(0, position - SIMILAR_ID_NEIGHBOURS):position + SIMILAR_ID_NEIGHBOURS]
+        return close_ids(record_id, neighbours, limit)
+                
+    def search(self, text: str, offset: int = 0, limit: int = 10) -> SearchPage[str]:
+        """IDs of the records best matching `text`, allowing for typos, best first."""
+        return self._search.search(text, offset, limit)
+                
+    def _copy_indexes(self) -> None:
+        """Give a shallow copy its own index containers; subclasses extend it with theirs."""
+        self._by_id = self._by_id.copy()
+        self._sorted_ids = self._sorted_ids.copy()
+        self._json = self._json.copy()
+        self._by_status = {status: ids.copy() for status, ids in self._by_status.items()}
+        self._search = self._search.copy()
+                
+    @abstractmethod
+    def _search_text(self, record: T) -> str: ...
+                
+    def _index(self, record: T) -> None:
+        self._by_status[record.status][record.id] = None
+        self._search.add(record.id, self._search_text(record))
+        
+    def _unindex(self, record: T) -> None:
+        del self._by_status[record.status][record.id]
+        self._search.remove(record.id, self._search_text(record))
@@ -0,0 +1,569 @@
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator
+from copy import copy
+from datetime import date, datetime, timedelta, timezone
+from enum import Enum
+from itertools import compress
+from string import hexdigits
+from typing import Any, Self
+
+from .aggregates import DAY_MICROS, bump, dated, merge_days
+from .base import updated_copy
+from ..schemas import Job, JobStatus, Approval, ApprovalStatus
+from ..search import SearchIndex, SearchPage
+from ..utils import SIMILAR_ID_NEIGHBOURS, close_ids, naive_utc, parse_id, render_id
+
+FREE = 255
+"""Status code of a deleted row, kept for reuse by the next insert."""
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_LOW_BITS = (1 << 64) - 1
+_CHUNK = 4096
+
+
+def _to_micros(value: datetime) -> tuple[int, int]:
+    """Microseconds since the epoch, and 1 if the datetime was timezone-aware (it is then kept as UTC)."""
+    return (naive_utc(value) - _EPOCH) // _MICROSECOND, int(value.tzinfo is not None)
+
+
+def _from_micros(micros: int, aware: int) -> datetime:
+    value = _EPOCH + timedelta(0, 0, micros)
+    return value.replace(tzinfo=timezone.utc) if aware else value
+
+
+class _ColumnarStore[T](ABC):
+    """Record store that keeps each field in a packed column instead of one pydantic model per record.
+
+    IDs must look like `<prefix>_<uuid>` and are held as two uint64 columns, statuses as uint8
+    codes, and repeated strings are interned and reference-counted, so a string no row uses any
+    more is dropped and its code reused. Records are materialized as models only when read, so
+    `get` and iteration return fresh copies; change them through `update`. Deleted rows are
+    marked FREE and reused by later inserts.
+    """
+
+    prefix: str
+    status_type: type[Enum]
+
+    def __init__(self, records: Iterable[T] = ()):
+        self._statuses = list(self.status_type)
+        self._codes = {status: code for code, status in enumerate(self._statuses)}
+        self._rows: dict[int, int] = {}
+        self._sorted_keys: list[int] = []
+        self._id_hi = array("Q")
+        self._id_lo = array("Q")
+        self._status = bytearray()
+        self._status_counts = [0] * len(self._statuses)
+        self._free: list[int] = []
+        self._strings: list[str] = []
+        self._string_codes: dict[str, int] = {}
+        self._string_refs = array("I")
+        self._free_strings: list[int] = []
+        self._json: dict[int, str] = {}
+        self._search: SearchIndex[int] = SearchIndex()
+        self.version = 0
+        self.extend(records)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[T]:
+        for row in list(self._rows.values()):
+            yield self._materialize(row)
+
+    def __contains__(self, record_id: object) -> bool:
+        return isinstance(record_id, str) and self._row(record_id) is not None
+
+    def get(self, record_id: str) -> T | None:
+        row = self._row(record_id)
+        return None if row is None else self._materialize(row)
+
+    def snapshot(self) -> Self:
+        """An independent copy, made by copying the columns and indexes rather than rebuilding them."""
+        clone = copy(self)
+        clone._copy_indexes()
+        return clone
+
+    def add(self, record: T) -> T:
+        insort(self._sorted_keys, self._insert(record))
+        return record
+
+    def extend(self, records: Iterable[T]) -> list[T]:
+        # Sort the key list once at the end rather than paying an insort per record.
+        added: list[T] = []
+        keys: list[int] = []
+        try:
+            for record in records:
+                keys.append(self._insert(record))
+                added.append(record)
+        finally:
+            self._sorted_keys.extend(keys)
+            self._sorted_keys.sort()
+        return added
+
+    def _insert(self, record: T) -> int:
+        key = parse_id(self.prefix, record.id)
+        if key is None:
+            raise ValueError(f"Columnar stores need IDs of the form {self.prefix}_<uuid>: {record.id}")
+        if key in self._rows:
+            raise ValueError("Duplicate ID: " + record.id)
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = len(self._status)
+            self._id_hi.append(0)
+            self._id_lo.append(0)
+            self._status.append(FREE)
+            self._grow()
+        self._rows[key] = row
+        self._id_hi[row] = key >> 64
+        self._id_lo[row] = key & _LOW_BITS
+        self._write(row, record)
+        self._index(row)
+        self.version += 1
+        return key
+
+    def update(self, record_id: str, data: dict[str, Any]) -> T | None:
+        row = self._row(record_id)
+        if row is None:
+            return None
+        return self._apply(row, updated_copy(self._materialize(row), data))
+
+    def update_many(self, updates: dict[str, dict[str, Any]]) -> list[T]:
+        """Apply updates to existing records, all or none: every copy is validated before any is applied."""
+        rows = [self._row(record_id) for record_id in updates]
+        changes = [(row, updated_copy(self._materialize(row), data)) for row, data in zip(rows, updates.values())]
+        return [self._apply(row, record) for row, record in changes]
+
+    def _apply(self, row: int, record: T) -> T:
+        """Write `record` over the row, writing the old values back if indexing fails."""
+        previous = self._materialize(row)
+        self._json.pop(row, None)
+        self._unindex(row)
+        try:
+            self._write(row, record)
+            self._index(row)
+        except BaseException:
+            self._write(row, previous)
+            self._index(row)
+            raise
+        self.version += 1
+        return record
+
+    def delete(self, record_id: str) -> T | None:
+        row = self._row(record_id)
+        if row is None:
+            return None
+        record = self._materialize(row)
+        self._json.pop(row, None)
+        self._unindex(row)
+        key = self._key(row)
+        del self._rows[key]
+        del self._sorted_keys[bisect_left(self._sorted_keys, key)]
+        self._status[row] = FREE
+        self._release(row)
+        self._free.append(row)
+        self.version += 1
+        return record
+
+    def dump(self, record_id: str) -> str | None:
+        """The record as JSON, serialized once and reused until the record changes."""
+        row = self._row(record_id)
+        if row is None:
+            return None
+        payload = self._json.get(row)
+        if payload is None:
+            payload = self._json[row] = self._materialize(row).model_dump_json()
+        return payload
+
+    def by_status(self, statuses: Iterable[Enum]) -> Iterator[T]:
+        table = self._status_table(statuses)
+        for start in range(0, len(self._status), _CHUNK):
+            mask = self._status[start:start + _CHUNK].translate(table)
+            for row in compress(range(start, start + len(mask)), mask):
+                yield self._materialize(row)
+
+    def status_counts(self) -> dict[Enum, int]:
+        """Number of records in each status, zeros included."""
+        return dict(zip(self._statuses, self._status_counts))
+
+    def search(self, text: str, offset: int = 0, limit: int = 10) -> SearchPage[str]:
+        """IDs of the records best matching `text`, allowing for typos, best first."""
+        page = self._search.search(text, offset, limit)
+        return SearchPage(keys=[render_id(self.prefix, self._key(row)) for row in page.keys], total=page.total)
+
+    def similar_ids(self, record_id: str, limit: int = 3) -> list[str]:
+        """Existing IDs that look like a mistyped `record_id`, from its neighbours in ID order."""
+        digits = "".join(c for c in record_id.lower().rpartition("_")[2] if c in hexdigits)[:32]
+        position = bisect_left(self._sorted_keys, int(digits.ljust(32, "0"), 16))
+        neighbours = self._sorted_keys[max(0, position - SIMILAR_ID_NEIGHBOURS):position + SIMILAR_ID_NEIGHBOURS]
+        return close_ids(record_id, [render_id(self.prefix, key) for key in neighbours], limit)
+
+    def _row(self, record_id: str) -> int | None:
+        key = parse_id(self.prefix, record_id)
+        return None if key is None else self._rows.get(key)
+
+    def _key(self, row: int) -> int:
+        return (self._id_hi[row] << 64) | self._id_lo[row]
+
+    def _status_table(self, statuses: Iterable[Enum]) -> bytes:
+        """A bytes.translate table mapping wanted status codes to 1 and everything else, FREE included, to 0."""
+        table = bytearray(256)
+        for status in statuses:
+            table[self._codes[status]] = 1
+        return bytes(table)
+
+    def _intern(self, value: str) -> int:
+        """Code of `value` in the string table, counting one more reference to it."""
+        code = self._string_codes.get(value)
+        if code is None:
+            if self._free_strings:
+                code = self._free_strings.pop()
+                self._strings[code] = value
+            else:
+                code = len(self._strings)
+                self._strings.append(value)
+                self._string_refs.append(0)
+            self._string_codes[value] = code
+        self._string_refs[code] += 1
+        return code
+
+    def _unintern(self, code: int) -> None:
+        """Drop a reference to an interned string, freeing its code once nothing refers to it."""
+        self._string_refs[code] -= 1
+        if not self._string_refs[code]:
+            del self._string_codes[self._strings[code]]
+            self._strings[code] = ""
+            self._free_strings.append(code)
+
+    def _set_string(self, column: array, row: int, value: str) -> None:
+        """Point the row's entry in a string column at `value`, releasing what a live row held before."""
+        code = self._intern(value)
+        if self._status[row] != FREE:
+            self._unintern(column[row])
+        column[row] = code
+
+    def _copy_indexes(self) -> None:
+        """Give a shallow copy its own columns and indexes; subclasses extend it with theirs."""
+        self._rows = self._rows.copy()
+        self._sorted_keys = self._sorted_keys.copy()
+        self._id_hi, self._id_lo = self._id_hi[:], self._id_lo[:]
+        self._status = self._status[:]
+        self._status_counts = self._status_counts.copy()
+        self._free = self._free.copy()
+        self._strings = self._strings.copy()
+        self._string_codes = self._string_codes.copy()
+        self._string_refs, self._free_strings = self._string_refs[:], self._free_strings.copy()
+        self._json = self._json.copy()
+        self._search = self._search.copy()
+
+    def _grow(self) -> None:
+        """Append a placeholder to every subclass column."""
+
+    @abstractmethod
+    def _write(self, row: int, record: T) -> None: ...
+
+    @abstractmethod
+    def _materialize(self, row: int) -> T: ...
+
+    def _release(self, row: int) -> None:
+        """Drop references a deleted row still holds, interned strings included."""
+
+    @abstractmethod
+    def _search_text(self, row: int) -> str: ...
+
+    def _index(self, row: int) -> None:
+        self._status_counts[self._status[row]] += 1
+        self._search.add(row, self._search_text(row))
+
+    def _unindex(self, row: int) -> None:
+        self._status_counts[self._status[row]] -= 1
+        self._search.remove(row, self._search_text(row))
+
+
+class ColumnarJobStore(_ColumnarStore[Job]):
+    """Columnar counterpart of JobStore, with the deadline index held as parallel packed arrays."""
+
+    prefix = "job"
+    status_type = JobStatus
+
+    def __init__(self, *args, **kwargs):
+        self._name = array("I")
+        self._deadline = array("q")
+        self._aware = bytearray()
+        # (deadline, id)-ordered index: deadlines, rows and status codes at the same positions.
+        self._order_deadline = array("q")
+        self._order_row = array("I")
+        self._order_status = bytearray()
+        self._deadline_days: dict[JobStatus, dict[int, int]] = {status: {} for status in JobStatus}
+        self._bulk_loading = False
+        super().__init__(*args, **kwargs)
+
+    def extend(self, records: Iterable[Job]) -> list[Job]:
+        # Skip per-record index inserts and build the ordered index once at the end.
+        self._bulk_loading = True
+        try:
+            return super().extend(records)
+        finally:
+            self._bulk_loading = False
+            self._rebuild_order()
+
+    def query(
+        self,
+        gte_date: datetime | None = None,
+        lte_date: datetime | None = None,
+        statuses: Iterable[JobStatus] | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Iterator[Job]:
+        """Yield jobs in deadline order, bisecting the date range and masking statuses a chunk at a time."""
+        start, stop = 0, len(self._order_row)
+        if gte_date is not None:
+            start = bisect_left(self._order_deadline, _to_micros(gte_date)[0])
+        if lte_date is not None:
+            stop = bisect_right(self._order_deadline, _to_micros(lte_date)[0])
+        if after is not None:
+            start = max(start, self._position_after(*after))
+        table = self._status_table(statuses) if statuses else None
+        for chunk_start in range(start, stop, _CHUNK):
+            chunk_stop = min(chunk_start + _CHUNK, stop)
+            rows = self._order_row[chunk_start:chunk_stop]
+            if table is not None:
+                rows = compress(rows, self._order_status[chunk_start:chunk_stop].translate(table))
+            for row in rows:
+                yield self._materialize(row)
+
+    def deadline_histogram(self, statuses: Iterable[JobStatus] | None = None) -> dict[date, int]:
+        """Jobs due on each day, oldest first, from per-status day counts rather than a scan."""
+        return merge_days(self._deadline_days, statuses or self.status_type)
+
+    def _copy_indexes(self) -> None:
+        super()._copy_indexes()
+        self._name, self._deadline, self._aware = self._name[:], self._deadline[:], self._aware[:]
+        self._order_deadline, self._order_row = self._order_deadline[:], self._order_row[:]
+        self._order_status = self._order_status[:]
+        self._deadline_days = {status: days.copy() for status, days in self._deadline_days.items()}
+
+    def _grow(self) -> None:
+        self._name.append(0)
+        self._deadline.append(0)
+        self._aware.append(0)
+
+    def _write(self, row: int, record: Job) -> None:
+        # The status is written last: _set_string reads it to tell a rewrite from a fresh row.
+        self._set_string(self._name, row, record.name)
+        self._deadline[row], self._aware[row] = _to_micros(record.deadline)
+        self._status[row] = self._codes[record.status]
+
+    def _materialize(self, row: int) -> Job:
+        return Job.model_validate({
+            "id": render_id(self.prefix, self._key(row)),
+            "name": self._strings[self._name[row]],
+            "deadline": _from_micros(self._deadline[row], self._aware[row]),
+            "status": self._statuses[self._status[row]],
+        })
+
+    def _position(self, deadline: int, key: int) -> int:
+        """Index in the ordered arrays where (deadline, key) sits or would be inserted."""
+        start = bisect_left(self._order_deadline, deadline)
+        stop = bisect_right(self._order_deadline, deadline, start)
+        # Rows sharing a deadline are in key order, so bisect their keys too rather than scanning them.
+        return start + bisect_left(range(start, stop), key, key=lambda position: self._key(self._order_row[position]))
+
+    def _position_after(self, deadline: datetime, job_id: str) -> int:
+        micros = _to_micros(deadline)[0]
+        key = parse_id(self.prefix, job_id)
+        if key is None:
+            return bisect_right(self._order_deadline, micros)
+        position = self._position(micros, key)
+        if position < len(self._order_row) and self._key(self._order_row[position]) == key:
+            position += 1
+        return position
+
+    def _release(self, row: int) -> None:
+        self._unintern(self._name[row])
+
+    def _search_text(self, row: int) -> str:
+        return self._strings[self._name[row]]
+
+    def _index(self, row: int) -> None:
+        super()._index(row)
+        bump(self._deadline_days[self._statuses[self._status[row]]], self._deadline[row] // DAY_MICROS, 1)
+        if self._bulk_loading:
+            return
+        position = self._position(self._deadline[row], self._key(row))
+        self._order_deadline.insert(position, self._deadline[row])
+        self._order_row.insert(position, row)
+        self._order_status.insert(position, self._status[row])
+
+    def _unindex(self, row: int) -> None:
+        super()._unindex(row)
+        bump(self._deadline_days[self._statuses[self._status[row]]], self._deadline[row] // DAY_MICROS, -1)
+        position = self._position(self._deadline[row], self._key(row))
+        del self._order_deadline[position]
+        del self._order_row[position]
+        del self._order_status[position]
+
+    def _rebuild_order(self) -> None:
+        rows = sorted(self._rows.values(), key=lambda row: (self._deadline[row], self._key(row)))
+        self._order_deadline = array("q", (self._deadline[row] for row in rows))
+        self._order_row = array("I", rows)
+        self._order_status = bytearray(self._status[row] for row in rows)
+
+
+class ColumnarApprovalStore(_ColumnarStore[Approval]):
+    """Columnar counterpart of ApprovalStore. Job IDs that are not `job_<uuid>` are kept as text."""
+
+    prefix = "approval"
+    status_type = ApprovalStatus
+
+    def __init__(self, *args, **kwargs):
+        self._person = array("I")
+        self._request: list[str] = []
+        self._job_hi = array("Q")
+        self._job_lo = array("Q")
+        # 0: no job, 1: job ID in the job columns, 2: job ID in _job_text.
+        self._job_kind = bytearray()
+        self._job_text: dict[int, str] = {}
+        self._created = array("q")
+        # 0: naive, 1: aware (held as UTC), 2: no creation time.
+        self._created_kind = bytearray()
+        self._by_job_id: dict[int | str, dict[int, None]] = {}
+        self._pending_days: dict[str, dict[int, int]] = {}
+        self._by_person: dict[str, dict[ApprovalStatus, int]] = {}
+        self._pending_by_job: dict[int | str, int] = {}
+        super().__init__(*args, **kwargs)
+
+    def for_job(self, job_id: str) -> Iterator[Approval]:
+        key = parse_id("job", job_id)
+        for row in list(self._by_job_id.get(job_id if key is None else key, {})):
+            yield self._materialize(row)
+
+    def person_counts(self, person: str) -> dict[ApprovalStatus, int]:
+        """Number of the person's approvals in each status, zeros included."""
+        counts = self._by_person.get(person, {})
+        return {status: counts.get(status, 0) for status in self._statuses}
+
+    def pending_for_job(self, job_id: str) -> int:
+        key = parse_id("job", job_id)
+        return self._pending_by_job.get(job_id if key is None else key, 0)
+
+    def pending_by_person(self) -> dict[str, dict[date, int]]:
+        """Pending approvals per person and the day they were requested, oldest day first."""
+        return {person: dated(days) for person, days in self._pending_days.items()}
+
+    def _copy_indexes(self) -> None:
+        super()._copy_indexes()
+        self._person, self._request = self._person[:], self._request.copy()
+        self._job_hi, self._job_lo, self._job_kind = self._job_hi[:], self._job_lo[:], self._job_kind[:]
+        self._job_text = self._job_text.copy()
+        self._created, self._created_kind = self._created[:], self._created_kind[:]
+        self._by_job_id = {job_id: rows.copy() for job_id, rows in self._by_job_id.items()}
+        self._pending_days = {person: days.copy() for person, days in self._pending_days.items()}
+        self._by_person = {person: counts.copy() for person, counts in self._by_person.items()}
+        self._pending_by_job = self._pending_by_job.copy()
+
+    def _grow(self) -> None:
+        self._person.append(0)
+        self._request.append("")
+        self._job_hi.append(0)
+        self._job_lo.append(0)
+        self._job_kind.append(0)
+        self._created.append(0)
+        self._created_kind.append(2)
+
+    def _write(self, row: int, record: Approval) -> None:
+        self._set_string(self._person, row, record.person)
+        self._request[row] = record.request
+        self._status[row] = self._codes[record.status]
+        if record.created_at is None:
+            self._created_kind[row] = 2
+        else:
+            self._created[row], self._created_kind[row] = _to_micros(record.created_at)
+        self._job_text.pop(row, None)
+        if record.job_id is None:
+            self._job_kind[row] = 0
+            return
+        key = parse_id("job", record.job_id)
+        if key is None:
+            self._job_kind[row] = 2
+            self._job_text[row] = record.job_id
+        else:
+            self._job_kind[row] = 1
+            self._job_hi[row] = key >> 64
+            self._job_lo[row] = key & _LOW_BITS
+
+    def _job_key(self, row: int) -> int | str | None:
+        match self._job_kind[row]:
+            case 1:
+                return (self._job_hi[row] << 64) | self._job_lo[row]
+            case 2:
+                return self._job_text[row]
+            case _:
+                return None
+
+    def _materialize(self, row: int) -> Approval:
+        job_key = self._job_key(row)
+        return Approval.model_validate({
+            "id": render_id(self.prefix, self._key(row)),
+            "person": self._strings[self._person[row]],
+            "request": self._request[row],
+            "status": self._statuses[self._status[row]],
+            "job_id": render_id("job", job_key) if isinstance(job_key, int) else job_key,
+            "created_at": (
+                None if self._created_kind[row] == 2 else _from_micros(self._created[row], self._created_kind[row])
+            ),
+        })
+
+    def _release(self, row: int) -> None:
+        self._unintern(self._person[row])
+        self._request[row] = ""
+        self._job_text.pop(row, None)
+        self._job_kind[row] = 0
+        self._created_kind[row] = 2
+
+    def _search_text(self, row: int) -> str:
+        return f"{self._strings[self._person[row]]} {self._request[row]}"
+
+    def _pending_day(self, row: int) -> int | None:
+        """Creation day of a pending approval, or None if it is not pending or has no creation time."""
+        if self._statuses[self._status[row]] != ApprovalStatus.PENDING or self._created_kind[row] == 2:
+            return None
+        return self._created[row] // DAY_MICROS
+
+    def _index(self, row: int) -> None:
+        super()._index(row)
+        status = self._statuses[self._status[row]]
+        bump(self._by_person.setdefault(self._strings[self._person[row]], {}), status, 1)
+        job_key = self._job_key(row)
+        if job_key is not None:
+            self._by_job_id.setdefault(job_key, {})[row] = None
+            if status == ApprovalStatus.PENDING:
+                bump(self._pending_by_job, job_key, 1)
+        day = self._pending_day(row)
+        if day is not None:
+            bump(self._pending_days.setdefault(self._strings[self._person[row]], {}), day, 1)
+
+    def _unindex(self, row: int) -> None:
+        super()._unindex(row)
+        status = self._statuses[self._status[row]]
+        counts = self._by_person[self._strings[self._person[row]]]
+        bump(counts, status, -1)
+        if not counts:
+            del self._by_person[self._strings[self._person[row]]]
+        job_key = self._job_key(row)
+        if job_key is not None:
+            bucket = self._by_job_id[job_key]
+            del bucket[row]
+            if not bucket:
+                del self._by_job_id[job_key]
+            if status == ApprovalStatus.PENDING:
+                bump(self._pending_by_job, job_key, -1)
+        day = self._pending_day(row)
+        if day is not None:
+            person = self._strings[self._person[row]]
+            days = self._pending_days[person]
+            bump(days, day, -1)
+            if not days:
+                del self._pending_days[person]
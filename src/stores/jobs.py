@@ -0,0 +1,87 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime
+
+from .aggregates import bump, epoch_day, merge_days
+from .base import IndexedStore
+from ..schemas import Job, JobStatus
+from ..utils import naive_utc
+
+
+def encode_cursor(job: Job) -> str:
+    return urlsafe_b64encode(f"{job.deadline.isoformat()}|{job.id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    deadline, _, job_id = urlsafe_b64decode(cursor.encode()).decode().partition("|")
+    return datetime.fromisoformat(deadline), job_id
+
+
+class JobStore(IndexedStore[Job]):
+    status_type = JobStatus
+    
+    def __init__(self, *args, **kwargs):
+        # Deadlines are indexed as naive UTC, so naive and aware ones compare without a TypeError.
+        self._by_deadline: list[tuple[datetime, str]] = []
+        self._deadline_days: dict[JobStatus, dict[int, int]] = {status: {} for status in JobStatus}
+        self._bulk_loading = False
+        super().__init__(*args, **kwargs)
+        
+    def extend(self, records: Iterable[Job]) -> list[Job]:
+        # Append and sort once instead of paying an O(n) insort per record.
+        self._bulk_loading = True
+        try:
+            return super().extend(records)
+        finally:
+            self._bulk_loading = False
+            self._by_deadline.sort()
+        
+    def query(
+        self,
+        gte_date: datetime | None = None,
+        lte_date: datetime | None = None,
+        statuses: Iterable[JobStatus] | None = None,
+        after: tuple[datetime, str] | None = None,
+    ) -> Iterator[Job]:
+        """Yield jobs in deadline order, starting from the deadline index rather than a full scan."""
+        start = 0
+        if gte_date is not None:
+            start = bisect_left(self._by_deadline, (naive_utc(gte_date),))
+        if after is not None:
+            start = max(start, bisect_right(self._by_deadline, (naive_utc(after[0]), after[1])))
+        if lte_date is not None:
+            lte_date = naive_utc(lte_date)
+        wanted = set(statuses) if statuses else None
+        for index in range(start, len(self._by_deadline)):
+            deadline, job_id = self._by_deadline[index]
+            if lte_date is not None and deadline > lte_date:
+                break
+            job = self._by_id[job_id]
+            if wanted is None or job.status in wanted:
+                yield job
+                
+    def deadline_histogram(self, statuses: Iterable[JobStatus] | None = None) -> dict[date, int]:
+        """Jobs due on each day, oldest first, from per-status day counts rather than a scan."""
+        return merge_days(self._deadline_days, statuses or self.status_type)
+                
+    def _copy_indexes(self) -> None:
+        super()._copy_indexes()
+        self._by_deadline = self._by_deadline.copy()
+        self._deadline_days = {status: days.copy() for status, days in self._deadline_days.items()}
+                
+    def _search_text(self, record: Job) -> str:
+        return record.name
+                
+    def _index(self, record: Job) -> None:
+        super()._index(record)
+        bump(self._deadline_days[record.status], epoch_day(record.deadline), 1)
+        if self._bulk_loading:
+            self._by_deadline.append((naive_utc(record.deadline), record.id))
+        else:
+            insort(self._by_deadline, (naive_utc(record.deadline), record.id))
+        
+    def _unindex(self, record: Job) -> None:
+        super()._unindex(record)
+        bump(self._deadline_days[record.status], epoch_day(record.deadline), -1)
+        del self._by_deadline[bisect_left(self._by_deadline, (naive_utc(record.deadline), record.id))]
@@ -0,0 +1,90 @@
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic_ai import Agent, ModelMessage, AgentRunResultEvent
+from pydantic_ai.usage import RunUsage
+from pydantic_ai.messages import (
+    FunctionToolCallEvent,
+    FunctionToolResultEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+    ToolReturnPart,
+)
+
+
+@dataclass
+class TextDelta:
+    text: str
+    
+    
+@dataclass
+class ToolCallStarted:
+    tool_name: str
+    args: dict[str, Any]
+    
+    
+@dataclass
+class ToolCallFinished:
+    tool_name: str
+    result: str
+    
+    
+@dataclass
+class TurnFinished:
+    output: Any
+    messages: list[ModelMessage]
+    new_messages: list[ModelMessage]
+    usage: RunUsage
+    
+    
+StreamEvent = TextDelta | ToolCallStarted | ToolCallFinished | TurnFinished
+
+
+async def stream_turn(
+    agent: Agent,
+    user_input: str,
+    deps: Any,
+    message_history: Sequence[ModelMessage],
+) -> AsyncIterator[StreamEvent]:
+    """Run one turn and yield text deltas and tool calls as they happen, ending with TurnFinished."""
+    async for event in agent.run_stream_events(
+        user_prompt=user_input,
+        message_history=message_history,
+        deps=deps,
+    ):
+        match event:
+            case PartStartEvent(part=TextPart(content=text)) if text:
+                yield TextDelta(text)
+            case PartDeltaEvent(delta=TextPartDelta(content_delta=text)) if text:
+                yield TextDelta(text)
+            case FunctionToolCallEvent(part=part):
+                yield ToolCallStarted(part.tool_name, part.args_as_dict())
+            case FunctionToolResultEvent(result=ToolReturnPart() as result):
+                yield ToolCallFinished(result.tool_name, result.model_response_str())
+            case FunctionToolResultEvent(result=result):
+                yield ToolCallFinished(result.tool_name, result.model_response())
+            case AgentRunResultEvent(result=result):
+                yield TurnFinished(result.output, result.all_messages(), result.new_messages(), result.usage())
+                
+                
+async def print_stream(events: AsyncIterator[StreamEvent]) -> TurnFinished:
+    """Print a streamed turn to the terminal and return the final event with the updated message history."""
+    finished: TurnFinished | None = None
+    at_line_start = True
+    print("Agent: ", end="", flush=True)
+    async for event in events:
+        match event:
+            case TextDelta(text=text):
+                print(text, end="", flush=True)
+                at_line_start = text.endswith("\n")
+            case ToolCallStarted(tool_name=tool_name, args=args):
+                print(("" if at_line_start else "\n") + f"[calling {tool_name}({args})]", flush=True)
+                at_line_start = True
+            case TurnFinished():
+                finished = event
+    print()
+    assert finished is not None, "Stream ended without a result"
+    return finished
@@ -1,11 +1,17 @@
 from typing import Any
 
-from pydantic_ai import Agent, RunContext, ModelMessage, FunctionToolset
+from pydantic_ai import Agent, RunContext, ToolDefinition
+from pydantic_ai.models import Model
+from pydantic_ai.toolsets import AbstractToolset
 from subagents_pydantic_ai import create_subagent_toolset, SubAgentConfig
 
 from .deps import Deps
-from .tools import create_approvals_toolset, create_jobs_toolset
-from ..utils import model_factory
+from .fan_out import create_fan_out_toolset
+from .tools import create_approvals_toolset, create_estimations_toolset, create_jobs_toolset, create_stats_toolset, READ_TOOLS
+from ..history import create_history_processor
+from ..instrumentation import Instrumentation, InstrumentedModel, InstrumentedToolset
+from ..registry import get_model, shared_toolset
+from ..retry_budget import RetryBudgetToolset
     
     
 def get_system_prompt() -> str:
@@ -19,61 +25,103 @@ def get_system_prompt() -> str:
         "To help you with this task, you can call on sub-agents that specialise in different areas: "
         "\n- jobs_agent: Handles operations related to creating, updating, deleting, and retrieving jobs."
         "\n- approvals_agent: Handles operations related to approvals."
+        "\n- estimations_agent: Estimates workload per period, overdue and at-risk deadlines, and how long approvals have waited."
+        "\nAnswer questions about how many jobs or approvals there are in a status with get_stats rather than a sub-agent."
+        "\nWhen a request needs several independent pieces of work, such as jobs and approvals that do not depend on each other, "
+        "use fan_out to run them in parallel rather than calling task once per piece."
     )
 
 
-def context_processor(
-    ctx: RunContext[Deps],
-    messages: list[ModelMessage],
-) -> list[ModelMessage]:
-    if len(messages) >= ctx.deps.max_messages:
-        messages = messages[-ctx.deps.reduce_messages_to:]
-    return messages
+def hide_writes_when_read_only(ctx: RunContext[Deps], tool_def: ToolDefinition) -> bool:
+    return not ctx.deps.read_only or tool_def.name in READ_TOOLS
 
 
-def prepare_sub_agents() -> FunctionToolset[Any]:
-    subagents: list[SubAgentConfig] = [
+def get_sub_agent_configs(model: Model, instrumentation: Instrumentation | None = None) -> list[SubAgentConfig]:
+    def wrapped(toolset: AbstractToolset[Any]) -> AbstractToolset[Any]:
+        toolset = RetryBudgetToolset(toolset)
+        return toolset if instrumentation is None else InstrumentedToolset(toolset, instrumentation)
+    
+    return [
         SubAgentConfig(
             name="jobs_agent",
-            model="openai:gpt-5.2",
+            # A shared model instance rather than a model string, so sub-agents reuse the process-wide client.
+            model=model,
             description="Handles operations related to creating, updating, deleting, and retrieving jobs.",
             instructions="You specialise in managing job-related tasks, including creating, updating, deleting, and retrieving jobs.",
             can_ask_questions=True,
             preferred_mode="async",
             typical_complexity="simple",
-            toolsets=[create_jobs_toolset()],
+            toolsets=[
+                wrapped(shared_toolset(create_jobs_toolset).filtered(hide_writes_when_read_only)),
+                wrapped(shared_toolset(create_stats_toolset)),
+            ],
             typically_needs_context=True,
             # context_files=["/agents/coder/AGENTS.md", "/CODING_RULES.md"]
         ),
         SubAgentConfig(
             name="approvals_agent",
-            model="openai:gpt-5.2",
+            model=model,
             description="Handles operations related to approvals.",
             instructions="You specialise in managing approval-related tasks, including creating, updating, deleting, and retrieving approvals.",
             can_ask_questions=True,
             preferred_mode="async",
             typical_complexity="simple",
-            toolsets=[create_approvals_toolset()],
+            toolsets=[
+                wrapped(shared_toolset(create_approvals_toolset).filtered(hide_writes_when_read_only)),
+                wrapped(shared_toolset(create_stats_toolset)),
+            ],
             typically_needs_context=True,
             # context_files=["/agents/coder/AGENTS.md", "/CODING_RULES.md"]
         ),
+        SubAgentConfig(
+            name="estimations_agent",
+            model=model,
+            description="Estimates workload per period, overdue and at-risk deadlines, and how long approvals have waited.",
+            instructions=(
+                "You specialise in estimates over the jobs and approvals: workload histograms, overdue jobs and deadlines "
+                "at risk for a given capacity, and approval wait times. Ask for the capacity in jobs per day if it is needed and not given."
+            ),
+            can_ask_questions=True,
+            preferred_mode="async",
+            typical_complexity="simple",
+            toolsets=[
+                wrapped(shared_toolset(create_estimations_toolset).filtered(hide_writes_when_read_only)),
+                wrapped(shared_toolset(create_stats_toolset)),
+            ],
+            typically_needs_context=True,
+        ),
     ]
-    subagents_toolset = create_subagent_toolset(subagents=subagents, id="core_agent_subagents")
-    return subagents_toolset
 
 
-def create_core_agent() -> Agent[Deps]:
+def prepare_sub_agents(model: Model | None = None, instrumentation: Instrumentation | None = None) -> list[AbstractToolset[Any]]:
+    model = model or get_model()
+    subagents = get_sub_agent_configs(model, instrumentation)
+    subagents_toolset = create_subagent_toolset(subagents=subagents, default_model=model, id="core_agent_subagents")
+    fan_out_toolset = create_fan_out_toolset(subagents=subagents, default_model=model, instrumentation=instrumentation)
+    toolsets: list[AbstractToolset[Any]] = [
+        RetryBudgetToolset(subagents_toolset),
+        RetryBudgetToolset(fan_out_toolset),
+        RetryBudgetToolset(shared_toolset(create_stats_toolset)),
+    ]
+    if instrumentation is None:
+        return toolsets
+    return [InstrumentedToolset(toolset, instrumentation) for toolset in toolsets]
+
+
+def create_core_agent(model: Model | None = None, instrumentation: Instrumentation | None = None) -> Agent[Deps]:
+    """Create the core agent; with `instrumentation`, model requests, tool calls and sub-agent runs are timed."""
+    model = model or get_model()
+    if instrumentation is not None:
+        model = InstrumentedModel(model, instrumentation)
     agent = Agent(
-        model=model_factory(),
+        model=model,
         instructions=get_system_prompt(),
         deps_type=Deps,
         name="Core Agent",
         history_processors=[
-            context_processor
+            create_history_processor(),
         ],
         retries=5,
-        toolsets=[
-            prepare_sub_agents()
-        ],
+        toolsets=prepare_sub_agents(model, instrumentation),
     )
     return agent
\ No newline at end of file
@@ -1,18 +1,66 @@
 from typing import Any
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
-from ..schemas import Job, Approval
+from .enums import SubAgentIsolation
+from ..instrumentation import Instrumentation
+from ..prompt_cache import PromptCacheStats
+from ..read_memo import RunMemo
+from ..recording import ConversationRecorder
+from ..response_cache import ResponseCache
+from ..retry_budget import RetryBudget
+from ..repositories import (
+    JobRepository,
+    ApprovalRepository,
+    InMemoryJobRepository,
+    InMemoryApprovalRepository,
+    ReadOnlyJobRepository,
+    ReadOnlyApprovalRepository,
+    CopyOnWriteJobRepository,
+    CopyOnWriteApprovalRepository,
+)
 
 
 @dataclass
 class Deps:
-    jobs: list[Job] = field(default_factory=list)
-    approvals: list[Approval] = field(default_factory=list)
-    max_messages: int = 15
-    reduce_messages_to: int = 10
-    
+    jobs: JobRepository = field(default_factory=InMemoryJobRepository)
+    approvals: ApprovalRepository = field(default_factory=InMemoryApprovalRepository)
+    history_token_budget: int = 8000
+    summary_token_budget: int = 1000
+    max_result_tokens: int = 4000
+    prompt_cache: PromptCacheStats = field(default_factory=PromptCacheStats)
+    response_cache: ResponseCache | None = None
+    instrumentation: Instrumentation | None = None
+    recorder: ConversationRecorder | None = None
+    retry_budget: RetryBudget = field(default_factory=RetryBudget)
+    job_reads: RunMemo = field(default_factory=RunMemo)
+    approval_reads: RunMemo = field(default_factory=RunMemo)
+    # How sub-agents see the parent's repositories: shared (zero-copy), read-only views, or private snapshots.
+    subagent_isolation: SubAgentIsolation = SubAgentIsolation.SHARED
+    read_only: bool = False
+
     subagents: dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self):
+        if self.subagent_isolation == SubAgentIsolation.SNAPSHOT and not (
+            isinstance(self.jobs, InMemoryJobRepository) and isinstance(self.approvals, InMemoryApprovalRepository)
+        ):
+            raise ValueError("Snapshot isolation requires in-memory repositories")
+
     def clone_for_subagent(self, max_depth: int = 0) -> "Deps":
-        return Deps(subagents={} if max_depth <= 0 else self.subagents.copy())
\ No newline at end of file
+        """Give a sub-agent the parent's repositories and settings, isolated per `subagent_isolation`."""
+        jobs, approvals = self.jobs, self.approvals
+        match self.subagent_isolation:
+            case SubAgentIsolation.READ_ONLY:
+                jobs, approvals = ReadOnlyJobRepository(jobs), ReadOnlyApprovalRepository(approvals)
+            case SubAgentIsolation.SNAPSHOT:
+                jobs, approvals = CopyOnWriteJobRepository(jobs), CopyOnWriteApprovalRepository(approvals)
+        return replace(
+            self,
+            jobs=jobs,
+            approvals=approvals,
+            read_only=self.read_only or self.subagent_isolation == SubAgentIsolation.READ_ONLY,
+            job_reads=RunMemo(),
+            approval_reads=RunMemo(),
+            subagents={} if max_depth <= 0 else self.subagents.copy(),
+        )
\ No newline at end of file
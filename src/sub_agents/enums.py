@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class SubAgentIsolation(str, Enum):
+    SHARED = "shared"
+    READ_ONLY = "read_only"
+    SNAPSHOT = "snapshot"
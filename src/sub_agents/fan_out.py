@@ -0,0 +1,151 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from contextlib import nullcontext
+from dataclasses import dataclass
+import time
+from typing import Literal
+
+from pydantic import BaseModel, Field
+from pydantic_ai import Agent, FunctionToolset, ModelRetry, RunContext, Tool, ToolReturn
+from pydantic_ai.models import Model
+from subagents_pydantic_ai import SubAgentConfig
+
+from .deps import Deps
+from ..instrumentation import Instrumentation
+from ..serialization import dump_compact
+
+BranchStatus = Literal["completed", "failed", "timed_out", "cancelled"]
+
+
+@dataclass
+class BranchOutcome:
+    status: BranchStatus = "cancelled"
+    output: str | None = None
+    error: str | None = None
+    duration_ms: float = 0.0
+
+
+class _BranchFailed(Exception):
+    """Raised inside the task group to cancel the remaining branches."""
+
+
+async def run_branches(
+    branches: Sequence[Callable[[], Awaitable[str]]],
+    max_concurrency: int = 4,
+    timeout: float = 120.0,
+    fail_fast: bool = True,
+) -> list[BranchOutcome]:
+    """Run branches concurrently, at most `max_concurrency` at a time, each under its own timeout.
+
+    With `fail_fast`, the first failure or timeout cancels every branch still running or waiting,
+    and those are reported as cancelled. Outcomes are returned in the order of `branches`.
+    """
+    outcomes = [BranchOutcome() for _ in branches]
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(index: int, branch: Callable[[], Awaitable[str]]) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                async with asyncio.timeout(timeout):
+                    outcome = BranchOutcome("completed", output=await branch())
+            except TimeoutError:
+                outcome = BranchOutcome("timed_out", error=f"Timed out after {timeout:g}s")
+            except Exception as exc:
+                outcome = BranchOutcome("failed", error=f"{type(exc).__name__}: {exc}")
+            outcome.duration_ms = (time.perf_counter() - start) * 1000
+            outcomes[index] = outcome
+            if fail_fast and outcome.status != "completed":
+                raise _BranchFailed()
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            for index, branch in enumerate(branches):
+                group.create_task(run(index, branch))
+    except* _BranchFailed:
+        pass
+    return outcomes
+
+
+class FanOutTask(BaseModel):
+    subagent_type: str = Field(description="Name of the sub-agent to run the task")
+    description: str = Field(description="Self-contained description of the task")
+
+
+class FanOutResult(BaseModel):
+    subagent_type: str
+    description: str
+    status: BranchStatus
+    output: str | None = None
+    error: str | None = None
+    duration_ms: float
+
+
+def create_fan_out_toolset(
+    subagents: list[SubAgentConfig],
+    default_model: Model,
+    max_concurrency: int = 4,
+    task_timeout: float = 120.0,
+    instrumentation: Instrumentation | None = None,
+) -> FunctionToolset[Deps]:
+    """Create a `fan_out` tool that runs independent sub-agent tasks in parallel and joins their results."""
+    agents = {
+        config["name"]: Agent(
+            config.get("model", default_model),
+            system_prompt=config["instructions"],
+            toolsets=config.get("toolsets", []),
+            deps_type=Deps,
+            name=config["name"],
+        )
+        for config in subagents
+    }
+
+    async def fan_out(ctx: RunContext[Deps], tasks: list[FanOutTask]) -> ToolReturn:
+        """Run several independent sub-agent tasks at the same time and return all of their results together.
+        Prefer this over several separate task calls whenever no task needs another task's result."""
+        unknown = sorted({task.subagent_type for task in tasks} - agents.keys())
+        if unknown:
+            raise ModelRetry("Unknown sub-agents: " + ", ".join(unknown) + ". Available: " + ", ".join(agents))
+
+        def branch(task: FanOutTask) -> Callable[[], Awaitable[str]]:
+            async def run() -> str:
+                with instrumentation.span("subagent", task.subagent_type) if instrumentation else nullcontext():
+                    result = await agents[task.subagent_type].run(
+                        task.description,
+                        deps=ctx.deps.clone_for_subagent(),
+                        usage=ctx.usage,
+                    )
+                return result.output
+            return run
+
+        outcomes = await run_branches(
+            [branch(task) for task in tasks],
+            max_concurrency=max_concurrency,
+            timeout=task_timeout,
+        )
+        results = [
+            FanOutResult(
+                subagent_type=task.subagent_type,
+                description=task.description,
+                status=outcome.status,
+                output=outcome.output,
+                error=outcome.error,
+                duration_ms=round(outcome.duration_ms, 1),
+            )
+            for task, outcome in zip(tasks, outcomes)
+        ]
+        completed = sum(result.status == "completed" for result in results)
+        summary = f"Completed {completed} of {len(results)} tasks"
+        if completed < len(results):
+            summary += "; a failed task cancelled the others still running"
+        return ToolReturn(
+            return_value=summary,
+            content=dump_compact(results),
+        )
+
+    return FunctionToolset(
+        tools=[
+            Tool(function=fan_out, name="fan_out", description="Run several independent sub-agent tasks in parallel and return all of their results"),
+        ],
+        id="core_agent_fan_out",
+    )
@@ -1,32 +1,115 @@
+import argparse
 import asyncio
+import time
 
-from pydantic_ai import Agent, ModelMessage
+from pydantic_ai import Agent, AgentRunResult, ModelMessage
 
 from .core import create_core_agent
 from .deps import Deps
+from .enums import SubAgentIsolation
+from ..instrumentation import Instrumentation
+from ..recording import ConversationRecorder
+from ..repositories import create_repositories
+from ..response_cache import ResponseCache, run_with_cache
+from ..server import SessionServer, add_server_arguments, serve
+from ..streaming import stream_turn, print_stream
 
 
-async def conversation_loop(agent: Agent, deps: Deps, chat_history: list[ModelMessage]):
+async def record_usage(deps: Deps, result: AgentRunResult) -> None:
+    deps.prompt_cache.record(result.usage())
+    if deps.instrumentation is not None:
+        await deps.instrumentation.end_turn(result.usage(), deps.jobs, deps.approvals)
+    
+    
+async def conversation_loop(agent: Agent, deps: Deps, chat_history: list[ModelMessage], stream: bool = False):
     while True:
-        user_input = input("User: ")
+        user_input = await asyncio.to_thread(input, "User: ")
         if user_input.lower() in ["exit", "quit"]:
+            print(deps.prompt_cache.report())
+            if deps.response_cache is not None:
+                print(deps.response_cache.report())
+            if deps.instrumentation is not None:
+                print(deps.instrumentation.report())
+            print(deps.retry_budget.report())
             print("Exiting conversation.")
             break
-        response = await agent.run(
-            user_prompt=user_input,
-            message_history=chat_history,
-            deps=deps,
-        )
+        started = time.perf_counter()
+        if stream:
+            finished = await print_stream(stream_turn(agent, user_input, deps, chat_history))
+            if deps.recorder is not None:
+                deps.recorder.record(
+                    user_input, finished.new_messages, time.perf_counter() - started, finished.usage
+                )
+            chat_history = finished.messages
+            deps.prompt_cache.record(finished.usage)
+            if deps.instrumentation is not None:
+                await deps.instrumentation.end_turn(finished.usage, deps.jobs, deps.approvals)
+            continue
+        response = await run_with_cache(agent, deps.response_cache, user_input, deps, chat_history)
+        if deps.recorder is not None:
+            deps.recorder.record(
+                user_input, response.new_messages(), time.perf_counter() - started, response.usage()
+            )
         chat_history = response.all_messages()
+        await record_usage(deps, response)
         last_message = chat_history[-1]
         print("Agent:", "\n".join([p.content for p in last_message.parts]))
 
 
 def main():
-    agent = create_core_agent()
-    deps = Deps()
+    parser = argparse.ArgumentParser(description="Sub-agents assistant")
+    parser.add_argument("--stream", action="store_true", help="Stream responses and tool calls as they happen")
+    parser.add_argument(
+        "--subagent-isolation",
+        choices=[isolation.value for isolation in SubAgentIsolation],
+        default=SubAgentIsolation.SHARED.value,
+        help="How sub-agents see the shared jobs and approvals (snapshot needs the in-memory store)",
+    )
+    parser.add_argument(
+        "--response-cache-ttl",
+        type=float,
+        default=0.0,
+        help="Reuse answers to repeated read-only questions for this many seconds (0 disables; streaming turns bypass it)",
+    )
+    parser.add_argument(
+        "--metrics-dir",
+        help="Time model requests, tool calls and sub-agent runs, and export spans.jsonl and metrics.prom here after every turn",
+    )
+    parser.add_argument("--record", help="Append every turn's messages, tool calls, results and timings to this JSON-lines file")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+    recorder = ConversationRecorder(args.record) if args.record else None
+    instrumentation = Instrumentation(args.metrics_dir) if args.metrics_dir else None
+    agent = create_core_agent(instrumentation=instrumentation)
+    jobs, approvals = create_repositories()
+    response_cache = ResponseCache(ttl=args.response_cache_ttl) if args.response_cache_ttl > 0 else None
+    isolation = SubAgentIsolation(args.subagent_isolation)
+    
+    def new_deps() -> Deps:
+        return Deps(
+            jobs=jobs,
+            approvals=approvals,
+            response_cache=response_cache,
+            instrumentation=instrumentation,
+            recorder=recorder,
+            subagent_isolation=isolation,
+        )
+    
+    if args.serve:
+        server = SessionServer(
+            agent,
+            deps_factory=new_deps,
+            after_turn=record_usage,
+            max_concurrency=args.max_concurrency,
+            max_pending=args.max_pending,
+            session_ttl=args.session_ttl,
+            max_sessions=args.max_sessions,
+        )
+        asyncio.run(serve(server, args))
+        return
+    deps = new_deps()
     chat_history: list[ModelMessage] = []
-    asyncio.run(conversation_loop(agent, deps, chat_history))
+    asyncio.run(conversation_loop(agent, deps, chat_history, stream=args.stream))
     
 
 
@@ -1,4 +1,12 @@
 from .approvals import create_approvals_toolset
+from .estimations import create_estimations_toolset
 from .jobs import create_jobs_toolset
+from .stats import create_stats_toolset
 
-__all__ = ["create_approvals_toolset", "create_jobs_toolset"]
\ No newline at end of file
+# Tools that never mutate state, the only ones offered to read-only sub-agents.
+READ_TOOLS = frozenset({
+    "get_job", "get_jobs", "search_jobs", "get_approval", "search_approvals",
+    "get_workload", "get_overdue_projection", "get_approval_waits", "get_stats",
+})
+
+__all__ = ["create_approvals_toolset", "create_estimations_toolset", "create_jobs_toolset", "create_stats_toolset", "READ_TOOLS"]
@@ -0,0 +1,77 @@
+from datetime import date
+from typing import Annotated
+
+from pydantic import BaseModel, Field
+from pydantic_ai import ToolReturn, RunContext, FunctionToolset, Tool
+
+from ..deps import Deps
+from ...estimations import workload, project_overdue, approval_waits, utc_today
+from ...serialization import dump_compact
+from ...schemas import JobStatus
+
+OPEN_STATUSES = (JobStatus.PENDING, JobStatus.IN_PROGRESS)
+
+
+class WorkloadQuery(BaseModel):
+    start: date | None = Field(default=None, description="First day of the histogram, defaults to today (UTC)")
+    bucket_days: int = Field(default=7, ge=1, le=366, description="Days per bucket, e.g. 1 for daily or 7 for weekly")
+    buckets: int = Field(default=8, ge=1, le=60, description="Number of buckets")
+    status: list[JobStatus] | None = Field(default=None, description="Statuses to count, defaults to open jobs (pending and in progress)")
+
+
+async def get_workload(ctx: RunContext[Deps], query: WorkloadQuery) -> ToolReturn:
+    """Count the jobs due in each period from a start day, as a deadline histogram."""
+    days = await ctx.deps.jobs.deadline_histogram(query.status or OPEN_STATUSES)
+    start = query.start or utc_today()
+    histogram = workload(days, start, query.bucket_days, query.buckets)
+    due = sum(count for _, count in histogram.buckets)
+    return ToolReturn(
+        return_value=(
+            f"{due} jobs due in {query.buckets} buckets of {query.bucket_days} days from {start.isoformat()}, "
+            f"{histogram.before} due earlier and {histogram.after} later"
+        ),
+        content=dump_compact(histogram),
+    )
+
+
+class OverdueQuery(BaseModel):
+    capacity_per_day: float | None = Field(
+        default=None, gt=0, description="Jobs that can be finished per day; without it only overdue jobs are counted",
+    )
+    today: date | None = Field(default=None, description="Day to project from, defaults to today (UTC)")
+
+
+async def get_overdue_projection(ctx: RunContext[Deps], query: OverdueQuery) -> ToolReturn:
+    """Count open jobs that are overdue and, given a capacity, project which deadlines are at risk."""
+    days = await ctx.deps.jobs.deadline_histogram(OPEN_STATUSES)
+    projection = project_overdue(days, query.today or utc_today(), query.capacity_per_day)
+    summary = f"{projection.overdue} open jobs are overdue and {projection.due_today} are due today"
+    if query.capacity_per_day:
+        summary += f"; at {query.capacity_per_day:g} jobs a day, {projection.at_risk} more would miss their deadline"
+    return ToolReturn(
+        return_value=summary,
+        content=dump_compact(projection),
+    )
+
+
+async def get_approval_waits(ctx: RunContext[Deps], top: Annotated[int, Field(ge=1, le=50)] = 5) -> ToolReturn:
+    """Summarize how long pending approvals have been waiting, overall and for the approvers with the most.
+
+    Args:
+        top: Number of approvers to break out, those with the most pending approvals first.
+    """
+    waits = approval_waits(await ctx.deps.approvals.pending_by_person(), utc_today(), top)
+    return ToolReturn(
+        return_value=f"{waits.pending} approvals pending, waiting {waits.mean_days:g} days on average and {waits.oldest_days} at most",
+        content=dump_compact(waits),
+    )
+
+
+def create_estimations_toolset(**tools_kwargs) -> FunctionToolset[Deps]:
+    return FunctionToolset(
+        tools=[
+            Tool(function=get_workload, name="get_workload", description="Histogram of jobs due per day or week", **tools_kwargs),
+            Tool(function=get_overdue_projection, name="get_overdue_projection", description="Count overdue jobs and project which deadlines are at risk", **tools_kwargs),
+            Tool(function=get_approval_waits, name="get_approval_waits", description="Statistics on how long pending approvals have been waiting", **tools_kwargs),
+        ],
+    )
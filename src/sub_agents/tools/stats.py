@@ -0,0 +1,41 @@
+from pydantic import BaseModel, Field
+from pydantic_ai import ToolReturn, RunContext, FunctionToolset, Tool
+
+from ..deps import Deps
+from ...serialization import dump_compact
+
+
+class StatsQuery(BaseModel):
+    person: str | None = Field(default=None, description="Also count the approvals of this approver, by status")
+    job_id: str | None = Field(default=None, description="Also count the pending approvals of this job")
+
+
+async def get_stats(ctx: RunContext[Deps], query: StatsQuery) -> ToolReturn:
+    """Count jobs and approvals by status, from totals the store keeps up to date, instead of listing records."""
+    jobs = await ctx.deps.jobs.status_counts()
+    approvals = await ctx.deps.approvals.status_counts()
+    stats: dict[str, dict[str, int | str]] = {
+        "jobs": {status.value: count for status, count in jobs.items()},
+        "approvals": {status.value: count for status, count in approvals.items()},
+    }
+    summary = f"{sum(jobs.values())} jobs and {sum(approvals.values())} approvals"
+    if query.person is not None:
+        counts = await ctx.deps.approvals.status_counts(query.person)
+        stats["person"] = {"name": query.person} | {status.value: count for status, count in counts.items()}
+        summary += f", {sum(counts.values())} of them for {query.person}"
+    if query.job_id is not None:
+        pending = await ctx.deps.approvals.pending_for_job(query.job_id)
+        stats["job"] = {"id": query.job_id, "pending_approvals": pending}
+        summary += f", {pending} pending for job {query.job_id}"
+    return ToolReturn(
+        return_value=summary,
+        content=dump_compact(stats),
+    )
+
+
+def create_stats_toolset(**tools_kwargs) -> FunctionToolset[Deps]:
+    return FunctionToolset(
+        tools=[
+            Tool(function=get_stats, name="get_stats", description="Count jobs and approvals by status, per approver or per job", **tools_kwargs),
+        ],
+    )
@@ -1,23 +1,79 @@
-from uuid import uuid4
-import os
-from dotenv import load_dotenv
+from datetime import datetime, timezone
+from difflib import get_close_matches
+from functools import lru_cache
+import re
+import secrets
+import threading
+import time
 
-from pydantic_ai.models import ModelSettings
-from pydantic_ai.providers.openai import OpenAIProvider
-from pydantic_ai.models.openai import OpenAIChatModel
+_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+_COUNTER_MAX = 0xFFF
 
-load_dotenv()
+SIMILAR_ID_NEIGHBOURS = 8
+"""How many IDs either side of a missing ID's sort position are considered as near misses."""
+
+
+def naive_utc(value: datetime) -> datetime:
+    """Aware datetimes converted to naive UTC, naive ones unchanged, so the two kinds sort together."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+class _Uuid7Generator:
+    """UUIDv7 integers (RFC 9562): a 48-bit millisecond timestamp, a 12-bit counter, then 62 random bits.
+
+    The counter keeps IDs strictly increasing within a millisecond; if it overflows, the
+    timestamp is advanced by one, so IDs never go backwards even if the clock does.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._counter = 0
+
+    def __call__(self) -> int:
+        with self._lock:
+            ms = time.time_ns() // 1_000_000
+            if ms > self._last_ms:
+                self._last_ms, self._counter = ms, 0
+            elif self._counter < _COUNTER_MAX:
+                self._counter += 1
+            else:
+                self._last_ms, self._counter = self._last_ms + 1, 0
+            ms, counter = self._last_ms, self._counter
+        return (ms << 80) | (0x7 << 76) | (counter << 64) | (0b10 << 62) | secrets.randbits(62)
+
+
+uuid7_int = _Uuid7Generator()
+
+
+def render_id(prefix: str, key: int) -> str:
+    digits = f"{key:032x}"
+    return f"{prefix}_{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
+@lru_cache(maxsize=1 << 16)
+def parse_id(prefix: str, record_id: str) -> int | None:
+    """The 128-bit integer of a `<prefix>_<uuid>` ID, or None if it has another shape.
+
+    Only the canonical lowercase UUID form is accepted, so render_id gives back the exact string.
+    Results are cached, so repeat lookups of the same ID are a dict hit.
+    """
+    head, _, value = record_id.partition("_")
+    if head != prefix or _UUID.fullmatch(value) is None:
+        return None
+    return int(value.replace("-", ""), 16)
 
 
 def prefixed_uuid(prefix: str) -> str:
-    return f"{prefix}_{uuid4()}"
+    """A new time-ordered ID like `job_<uuid7>`; IDs made later sort after earlier ones."""
+    return render_id(prefix, uuid7_int())
+
 
+def close_ids(record_id: str, candidates: list[str], limit: int = 3) -> list[str]:
+    """The candidates that look like a mistyped or truncated `record_id`, closest first.
 
-def model_factory() -> OpenAIChatModel:
-    return OpenAIChatModel(
-        model_name="gpt-5.2",
-        provider=OpenAIProvider(api_key=os.getenv("OPENAI_API_KEY")),
-        settings=ModelSettings(
-            max_tokens=1000,
-        )
-    )
\ No newline at end of file
+    The cutoff is high because unrelated IDs made around the same time share a long prefix.
+    """
+    return get_close_matches(record_id, candidates, n=limit, cutoff=0.8)
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta, timezone
+import random
+
+import pytest
+
+from src.schemas import Approval, ApprovalStatus, Job, JobStatus
+from src.stores import ColumnarApprovalStore, ColumnarJobStore, JobStore
+from src.utils import prefixed_uuid
+
+START = datetime(2026, 3, 1)
+
+
+def _jobs(count: int, seed: int) -> list[Job]:
+    # Few distinct deadlines, so most lookups have to bisect among rows sharing one.
+    rng = random.Random(seed)
+    return [
+        Job(
+            id=prefixed_uuid("job"),
+            name=f"job {i}",
+            deadline=START + timedelta(hours=rng.randrange(4)),
+            status=rng.choice(list(JobStatus)),
+        )
+        for i in range(count)
+    ]
+
+
+def _ids(jobs) -> list[str]:
+    return [job.id for job in jobs]
+
+
+def test_deadline_order_matches_job_store_through_updates_and_deletes():
+    jobs = _jobs(300, seed=1)
+    expected, columnar = JobStore(jobs), ColumnarJobStore(jobs)
+    rng = random.Random(2)
+    for job in rng.sample(jobs, 150):
+        if rng.random() < 0.3:
+            expected.delete(job.id)
+            columnar.delete(job.id)
+        else:
+            data = {"deadline": START + timedelta(hours=rng.randrange(4)), "status": rng.choice(list(JobStatus))}
+            expected.update(job.id, data)
+            columnar.update(job.id, data)
+    for job in _jobs(50, seed=3):
+        expected.add(job)
+        columnar.add(job)
+
+    assert _ids(columnar.query()) == _ids(expected.query())
+    window = {"gte_date": START + timedelta(hours=1), "lte_date": START + timedelta(hours=2)}
+    assert _ids(columnar.query(**window)) == _ids(expected.query(**window))
+    statuses = [JobStatus.PENDING, JobStatus.FAILED]
+    assert _ids(columnar.query(statuses=statuses)) == _ids(expected.query(statuses=statuses))
+    for job in list(expected.query())[::17]:
+        after = (job.deadline, job.id)
+        assert _ids(columnar.query(after=after)) == _ids(expected.query(after=after))
+
+
+def test_aware_deadlines_are_ordered_as_utc():
+    naive = Job(id=prefixed_uuid("job"), name="naive", deadline=START + timedelta(hours=1), status=JobStatus.PENDING)
+    aware = Job(
+        id=prefixed_uuid("job"),
+        name="aware",
+        deadline=(START + timedelta(hours=3)).replace(tzinfo=timezone(timedelta(hours=3))),
+        status=JobStatus.PENDING,
+    )
+    store = ColumnarJobStore([naive, aware])
+    assert [job.name for job in store.query()] == ["aware", "naive"]
+    assert store.get(aware.id).deadline == aware.deadline
+
+
+def test_interned_names_are_released_when_no_job_uses_them():
+    store = ColumnarJobStore()
+    jobs = [Job(id=prefixed_uuid("job"), name="shared", deadline=START, status=JobStatus.PENDING) for _ in range(2)]
+    for job in jobs:
+        store.add(job)
+    for i in range(100):
+        store.update(jobs[0].id, {"name": f"renamed {i}"})
+    assert set(store._string_codes) == {"shared", "renamed 99"}
+    assert len(store._strings) <= 3
+
+    store.delete(jobs[1].id)
+    store.delete(jobs[0].id)
+    assert not store._string_codes
+    store.add(Job(id=prefixed_uuid("job"), name="new", deadline=START, status=JobStatus.PENDING))
+    assert store.search("new").total == 1
+    assert len(store._strings) <= 3
+
+
+def test_interned_people_survive_a_failed_update():
+    approval, other = (
+        Approval(id=prefixed_uuid("approval"), person="ann", request="deploy", status=ApprovalStatus.PENDING)
+        for _ in range(2)
+    )
+    store = ColumnarApprovalStore([approval, other])
+    with pytest.raises(ValueError):
+        store.update_many({approval.id: {"person": "bob"}, other.id: {"status": "unknown"}})
+    assert set(store._string_codes) == {"ann"}
+    store.delete(other.id)
+    store.update(approval.id, {"person": "bob"})
+    assert set(store._string_codes) == {"bob"}
+    assert store.person_counts("bob")[ApprovalStatus.PENDING] == 1
+    assert store.person_counts("ann")[ApprovalStatus.PENDING] == 0
@@ -0,0 +1,20 @@
+from pydantic_ai.messages import (
+    ModelRequest, ModelResponse, RetryPromptPart, TextPart, ToolCallPart, ToolReturnPart, UserPromptPart,
+)
+
+from benchmarks.conversations import _current_turn
+
+
+def test_scripted_model_takes_the_prompt_from_the_user_request():
+    messages = [
+        ModelRequest(parts=[UserPromptPart("earlier question")]),
+        ModelResponse(parts=[TextPart("earlier answer")]),
+        ModelRequest(parts=[UserPromptPart("complete the job")]),
+        ModelResponse(parts=[ToolCallPart("get_job", {"job_id": "job_x"}, tool_call_id="get")]),
+        ModelRequest(parts=[ToolReturnPart("get_job", "found", tool_call_id="get"), UserPromptPart('{"id": "job_x"}')]),
+        ModelResponse(parts=[ToolCallPart("update_job", {"job_id": "job_x"}, tool_call_id="update")]),
+        ModelRequest(parts=[RetryPromptPart("bad status", tool_name="update_job", tool_call_id="update")]),
+    ]
+    prompt, turn = _current_turn(messages)
+    assert prompt == "complete the job"
+    assert turn == messages[2:]
@@ -0,0 +1,66 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from pydantic_ai import Agent, ModelMessage
+from pydantic_ai.messages import ModelResponse, RetryPromptPart, TextPart, ToolCallPart, ToolReturnPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+import src.estimations
+from src.agent_modes.deps import Deps as AgentModesDeps
+from src.agent_modes.tools.estimations import create_estimations_toolset as agent_modes_toolset
+from src.estimations import approval_waits, utc_today
+from src.repositories import InMemoryApprovalRepository
+from src.schemas import Approval, ApprovalStatus
+from src.stores import ApprovalStore, ColumnarApprovalStore
+from src.sub_agents.deps import Deps as SubAgentsDeps
+from src.sub_agents.tools.estimations import create_estimations_toolset as sub_agents_toolset
+from src.utils import prefixed_uuid
+
+
+@pytest.mark.parametrize("deps_type, toolset", [(AgentModesDeps, agent_modes_toolset), (SubAgentsDeps, sub_agents_toolset)])
+def test_approval_waits_top_is_bounded(deps_type, toolset):
+    schemas = {}
+    seen: list[list[ModelMessage]] = []
+
+    def model(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        schemas.update({tool.name: tool.parameters_json_schema for tool in info.function_tools})
+        seen.append(messages)
+        if len(seen) == 1:
+            return ModelResponse(parts=[ToolCallPart("get_approval_waits", {"top": -1}, tool_call_id="bad")])
+        if len(seen) == 2:
+            return ModelResponse(parts=[ToolCallPart("get_approval_waits", {"top": 2}, tool_call_id="good")])
+        return ModelResponse(parts=[TextPart("done")])
+
+    agent = Agent(FunctionModel(model), deps_type=deps_type, toolsets=[toolset()])
+    asyncio.run(agent.run("How long are approvals waiting?", deps=deps_type()))
+
+    top = schemas["get_approval_waits"]["properties"]["top"]
+    assert (top["minimum"], top["maximum"]) == (1, 50)
+    assert isinstance(seen[1][-1].parts[0], RetryPromptPart)
+    assert isinstance(seen[2][-1].parts[0], ToolReturnPart)
+
+
+def test_utc_today_uses_the_utc_date(monkeypatch):
+    # 23:30 in New York on 1 March is already 2 March in UTC.
+    instant = datetime(2026, 3, 1, 23, 30, tzinfo=timezone(timedelta(hours=-5)))
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return instant.astimezone(tz)
+
+    monkeypatch.setattr(src.estimations, "datetime", FrozenDatetime)
+    assert utc_today() == date(2026, 3, 2)
+
+
+@pytest.mark.parametrize("store_type", [ApprovalStore, ColumnarApprovalStore])
+def test_approval_waits_count_aware_requests_on_their_utc_day(store_type):
+    late_evening = datetime(2026, 3, 1, 22, 0, tzinfo=timezone(timedelta(hours=-5)))
+    approval = Approval(
+        id=prefixed_uuid("approval"), person="ann", request="deploy", status=ApprovalStatus.PENDING, created_at=late_evening,
+    )
+    approvals = InMemoryApprovalRepository(store_type([approval]))
+    by_person = asyncio.run(approvals.pending_by_person())
+    assert by_person == {"ann": {date(2026, 3, 2): 1}}
+    assert approval_waits(by_person, date(2026, 3, 2)).oldest_days == 0
@@ -0,0 +1,77 @@
+import asyncio
+from dataclasses import dataclass
+
+from pydantic_ai import Agent, ModelMessage, RunContext, ToolReturn
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, ToolCallPart, ToolReturnPart, UserPromptPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from src.history import create_history_processor
+
+
+@dataclass
+class HistoryDeps:
+    history_token_budget: int = 300
+    summary_token_budget: int = 100
+
+
+def _tool_returns_since_prompt(messages: list[ModelMessage]) -> int:
+    returns = 0
+    for message in reversed(messages):
+        if not isinstance(message, ModelRequest):
+            continue
+        tool_returns = sum(isinstance(part, ToolReturnPart) for part in message.parts)
+        if not tool_returns and any(isinstance(part, UserPromptPart) for part in message.parts):
+            break
+        returns += tool_returns
+    return returns
+
+
+def _run_pages(pages: int) -> list[list[ModelMessage]]:
+    """Run two turns that each page through a tool `pages` times, returning what the model saw."""
+    seen: list[list[ModelMessage]] = []
+
+    def model(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        seen.append(messages)
+        done = _tool_returns_since_prompt(messages)
+        if done < pages:
+            return ModelResponse(parts=[ToolCallPart("get_page", {"page": done}, tool_call_id=f"call_{len(seen)}")])
+        return ModelResponse(parts=[TextPart("done")])
+
+    agent = Agent(FunctionModel(model), deps_type=HistoryDeps, history_processors=[create_history_processor()])
+
+    @agent.tool
+    def get_page(ctx: RunContext[HistoryDeps], page: int) -> ToolReturn:
+        return ToolReturn(return_value=f"page {page}", content="record " * 200)
+
+    async def conversation() -> None:
+        history: list[ModelMessage] = []
+        for turn in range(2):
+            result = await agent.run(f"question {turn}", message_history=history, deps=HistoryDeps())
+            history = result.all_messages()
+
+    asyncio.run(conversation())
+    return seen
+
+
+def test_history_is_never_cut_between_a_tool_call_and_its_return():
+    seen = _run_pages(3)
+    assert len(seen) == 8
+    for messages in seen:
+        called = set()
+        for message in messages:
+            for part in message.parts:
+                if isinstance(part, ToolCallPart):
+                    called.add(part.tool_call_id)
+                elif isinstance(part, ToolReturnPart):
+                    assert part.tool_call_id in called
+
+
+def test_history_keeps_the_current_prompt_through_tool_round_trips():
+    seen = _run_pages(3)
+    for messages in seen[4:]:
+        prompts = [
+            part.content
+            for message in messages if isinstance(message, ModelRequest)
+            for part in message.parts if isinstance(part, UserPromptPart)
+        ]
+        assert "question 1" in prompts
@@ -0,0 +1,41 @@
+import asyncio
+import json
+import threading
+
+from pydantic_ai.usage import RunUsage
+
+from src.instrumentation import Instrumentation, Span
+from src.repositories import InMemoryApprovalRepository, InMemoryJobRepository
+
+
+def test_end_turn_writes_the_export_off_the_event_loop(tmp_path, monkeypatch):
+    instrumentation = Instrumentation(tmp_path)
+    instrumentation.record(Span("tool", "get_jobs", 0.0, 0.25))
+    writers = []
+    write_export = instrumentation._write_export
+
+    def recording_write(*args):
+        writers.append(threading.current_thread())
+        write_export(*args)
+
+    monkeypatch.setattr(instrumentation, "_write_export", recording_write)
+    asyncio.run(instrumentation.end_turn(
+        RunUsage(requests=2, input_tokens=10), InMemoryJobRepository(), InMemoryApprovalRepository(),
+    ))
+
+    assert writers and writers[0] is not threading.main_thread()
+    spans = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text().splitlines()]
+    assert [span["name"] for span in spans] == ["get_jobs"]
+    metrics = (tmp_path / "metrics.prom").read_text()
+    assert 'agent_requests_total{name="model"} 2' in metrics
+    assert 'agent_store_records{name="jobs"} 0' in metrics
+
+
+def test_exports_append_only_new_spans(tmp_path):
+    instrumentation = Instrumentation(tmp_path)
+    instrumentation.record(Span("model", "test", 0.0, 0.1))
+    instrumentation.export(tmp_path)
+    instrumentation.record(Span("model", "test", 1.0, 0.2))
+    instrumentation.export(tmp_path)
+    spans = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text().splitlines()]
+    assert [span["start"] for span in spans] == [0.0, 1.0]
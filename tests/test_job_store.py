@@ -0,0 +1,58 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.schemas import Job, JobStatus
+from src.stores import ColumnarJobStore, JobStore
+from src.stores.jobs import decode_cursor, encode_cursor
+from src.utils import prefixed_uuid
+
+PARIS = timezone(timedelta(hours=1))
+
+
+def _job(name: str, deadline: datetime, status: JobStatus = JobStatus.PENDING) -> Job:
+    return Job(id=prefixed_uuid("job"), name=name, deadline=deadline, status=status)
+
+
+def _mixed_jobs() -> list[Job]:
+    return [
+        _job("naive 10:00", datetime(2026, 3, 1, 10)),
+        _job("paris 10:30", datetime(2026, 3, 1, 10, 30, tzinfo=PARIS)),  # 09:30 UTC
+        _job("utc 11:00", datetime(2026, 3, 1, 11, tzinfo=timezone.utc)),
+        _job("naive 12:00", datetime(2026, 3, 1, 12), JobStatus.COMPLETED),
+    ]
+
+
+@pytest.mark.parametrize("store_type", [JobStore, ColumnarJobStore])
+@pytest.mark.parametrize("bulk", [True, False])
+def test_naive_and_aware_deadlines_sort_together_as_utc(store_type, bulk):
+    jobs = _mixed_jobs()
+    if bulk:
+        store = store_type(jobs)
+    else:
+        store = store_type()
+        for job in jobs:
+            store.add(job)
+    assert [job.name for job in store.query()] == ["paris 10:30", "naive 10:00", "utc 11:00", "naive 12:00"]
+
+
+@pytest.mark.parametrize("store_type", [JobStore, ColumnarJobStore])
+def test_query_bounds_and_cursors_accept_either_kind(store_type):
+    store = store_type(_mixed_jobs())
+    window = store.query(gte_date=datetime(2026, 3, 1, 10, 30, tzinfo=PARIS), lte_date=datetime(2026, 3, 1, 11))
+    assert [job.name for job in window] == ["paris 10:30", "naive 10:00", "utc 11:00"]
+
+    first = next(store.query())
+    after = decode_cursor(encode_cursor(first))
+    assert [job.name for job in store.query(after=after)] == ["naive 10:00", "utc 11:00", "naive 12:00"]
+
+
+@pytest.mark.parametrize("store_type", [JobStore, ColumnarJobStore])
+def test_updates_move_jobs_between_naive_and_aware_deadlines(store_type):
+    jobs = _mixed_jobs()
+    store = store_type(jobs)
+    store.update(jobs[0].id, {"deadline": datetime(2026, 3, 1, 13, tzinfo=PARIS)})  # 12:00 UTC
+    store.update(jobs[2].id, {"deadline": datetime(2026, 3, 1, 9)})
+    store.delete(jobs[3].id)
+    assert [job.name for job in store.query()] == ["utc 11:00", "paris 10:30", "naive 10:00"]
+    assert store.deadline_histogram() == {date(2026, 3, 1): 3}
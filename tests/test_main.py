@@ -0,0 +1,14 @@
+import sys
+
+import pytest
+
+from src.__main__ import main
+from src.registry import ARCHITECTURES
+
+
+def test_usage_lists_the_registry_architectures(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["src", "unknown"])
+    with pytest.raises(SystemExit) as exit_info:
+        main()
+    assert exit_info.value.code == 2
+    assert "{" + ",".join(ARCHITECTURES) + "}" in capsys.readouterr().err
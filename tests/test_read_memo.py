@@ -0,0 +1,56 @@
+import asyncio
+
+from src.read_memo import RunMemo
+
+
+class Loader:
+    def __init__(self, records: dict[str, str]):
+        self.records = records
+        self.loads = 0
+
+    async def __call__(self, record_id: str) -> str | None:
+        self.loads += 1
+        return self.records.get(record_id)
+
+
+def test_own_writes_only_invalidate_the_written_records():
+    memo, load = RunMemo(), Loader({"a": "a1", "b": "b1"})
+
+    async def scenario() -> list[str | None]:
+        reads = [await memo.get("run", 0, "a", load), await memo.get("run", 0, "b", load)]
+        load.records["b"] = "b2"
+        memo.discard("run", 0, 1, ["b"])
+        reads += [await memo.get("run", 1, "a", load), await memo.get("run", 1, "b", load)]
+        memo.put("run", 1, 2, "c", "c1")
+        reads.append(await memo.get("run", 2, "c", load))
+        return reads
+
+    assert asyncio.run(scenario()) == ["a1", "b1", "a1", "b2", "c1"]
+    assert (memo.hits, memo.misses, load.loads) == (2, 3, 3)
+
+
+def test_writes_by_others_clear_the_memo():
+    memo, load = RunMemo(), Loader({"a": "a1", "b": "b1"})
+
+    async def scenario() -> list[str | None]:
+        reads = [await memo.get("run", 0, "a", load)]
+        load.records["a"] = "a2"
+        # Version 1 came from another session, and this run's write then moved it to 2.
+        memo.discard("run", 1, 2, ["b"])
+        reads.append(await memo.get("run", 2, "a", load))
+        load.records["a"] = "a3"
+        reads.append(await memo.get("run", 3, "a", load))
+        return reads
+
+    assert asyncio.run(scenario()) == ["a1", "a2", "a3"]
+
+
+def test_a_new_run_starts_empty():
+    memo, load = RunMemo(), Loader({"a": "a1"})
+
+    async def scenario() -> None:
+        await memo.get("first", 0, "a", load)
+        await memo.get("second", 0, "a", load)
+
+    asyncio.run(scenario())
+    assert load.loads == 2
@@ -0,0 +1,68 @@
+import asyncio
+from dataclasses import dataclass, field
+
+from pydantic_ai import Agent, ModelMessage
+from pydantic_ai.messages import ModelRequest, ModelResponse, TextPart, UserPromptPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from src.recording import ConversationRecorder, load_recording
+from src.repositories import InMemoryApprovalRepository, InMemoryJobRepository
+from src.response_cache import ResponseCache
+from src.server import SessionServer
+
+
+@dataclass
+class RecordingDeps:
+    recorder: ConversationRecorder
+    response_cache: ResponseCache | None = None
+    jobs: InMemoryJobRepository = field(default_factory=InMemoryJobRepository)
+    approvals: InMemoryApprovalRepository = field(default_factory=InMemoryApprovalRepository)
+
+
+def _prompts(messages: list[ModelMessage]) -> list[str]:
+    return [
+        part.content
+        for message in messages if isinstance(message, ModelRequest)
+        for part in message.parts if isinstance(part, UserPromptPart)
+    ]
+
+
+def _answer(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+    return ModelResponse(parts=[TextPart(f"answer to {_prompts(messages)[-1]}")])
+
+
+def test_each_turn_records_its_own_messages_when_history_is_compacted(tmp_path):
+    recorder = ConversationRecorder(tmp_path / "turns.jsonl")
+    # Keep only the latest request, so the history the agent returns is shorter than the one it was given.
+    agent = Agent(FunctionModel(_answer), deps_type=RecordingDeps, history_processors=[lambda messages: messages[-1:]])
+    server = SessionServer(agent, lambda: RecordingDeps(recorder))
+
+    async def scenario() -> None:
+        for question in ["first", "second", "third"]:
+            await server.run_turn("session", question)
+
+    asyncio.run(scenario())
+    turns = load_recording(tmp_path / "turns.jsonl")
+    assert [turn.input for turn in turns] == ["first", "second", "third"]
+    for turn in turns:
+        assert _prompts(turn.messages) == [turn.input]
+        assert turn.messages[-1].parts[0].content == f"answer to {turn.input}"
+
+
+def test_cached_turns_record_the_prompt_and_the_cached_answer(tmp_path):
+    recorder = ConversationRecorder(tmp_path / "turns.jsonl")
+    cache = ResponseCache()
+    jobs = InMemoryJobRepository()
+    agent = Agent(FunctionModel(_answer), deps_type=RecordingDeps)
+    server = SessionServer(agent, lambda: RecordingDeps(recorder, cache, jobs))
+
+    async def scenario() -> None:
+        for _ in range(2):
+            await server.run_turn("session", "same question")
+
+    asyncio.run(scenario())
+    live, cached = load_recording(tmp_path / "turns.jsonl")
+    assert cache.hits == 1
+    assert [type(message) for message in cached.messages] == [ModelRequest, ModelResponse]
+    assert _prompts(cached.messages) == ["same question"]
+    assert cached.messages[-1].parts[0].content == live.messages[-1].parts[0].content
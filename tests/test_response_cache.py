@@ -0,0 +1,59 @@
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from pydantic_ai import Agent, ModelMessage
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from src.repositories import InMemoryApprovalRepository, InMemoryJobRepository, JobRepository
+from src.response_cache import ResponseCache
+from src.schemas import Job, JobStatus
+from src.server import SessionServer
+
+
+@dataclass
+class CacheDeps:
+    jobs: JobRepository = field(default_factory=InMemoryJobRepository)
+    approvals: InMemoryApprovalRepository = field(default_factory=InMemoryApprovalRepository)
+    response_cache: ResponseCache | None = None
+
+
+def _counting_agent() -> tuple[Agent, list[int]]:
+    calls: list[int] = []
+
+    def model(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        calls.append(len(messages))
+        return ModelResponse(parts=[TextPart(f"answer {len(calls)}")])
+
+    return Agent(FunctionModel(model), deps_type=CacheDeps), calls
+
+
+def test_repeated_question_in_one_session_hits_the_cache():
+    agent, calls = _counting_agent()
+    cache = ResponseCache()
+    jobs = InMemoryJobRepository()
+    server = SessionServer(agent, lambda: CacheDeps(jobs=jobs, response_cache=cache))
+
+    async def scenario() -> list[str]:
+        return [await server.run_turn("session", "How many jobs are pending?") for _ in range(3)]
+
+    assert asyncio.run(scenario()) == ["answer 1"] * 3
+    assert (cache.hits, cache.misses, len(calls)) == (2, 1, 1)
+    assert len(server.sessions["session"].history) == 6
+
+
+def test_cache_is_scoped_to_the_session_and_the_store_version():
+    agent, calls = _counting_agent()
+    cache = ResponseCache()
+    jobs = InMemoryJobRepository()
+    server = SessionServer(agent, lambda: CacheDeps(jobs=jobs, response_cache=cache))
+
+    async def scenario() -> None:
+        await server.run_turn("first", "what about that one?")
+        await server.run_turn("second", "what about that one?")
+        await jobs.add(Job(name="new", deadline=datetime(2026, 1, 1, tzinfo=timezone.utc), status=JobStatus.PENDING))
+        await server.run_turn("first", "what about that one?")
+
+    asyncio.run(scenario())
+    assert (cache.hits, len(calls)) == (0, 3)
@@ -0,0 +1,87 @@
+import asyncio
+from dataclasses import dataclass
+import json
+
+from pydantic_ai import Agent, ModelMessage
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from src.server import SessionServer
+
+
+@dataclass
+class ServerDeps:
+    pass
+
+
+def _server(release: asyncio.Event | None = None, **kwargs) -> SessionServer:
+    async def model(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        if release is not None:
+            await release.wait()
+        return ModelResponse(parts=[TextPart(f"{len(messages)} messages")])
+
+    return SessionServer(Agent(FunctionModel(model), deps_type=ServerDeps), ServerDeps, **kwargs)
+
+
+def test_least_recently_used_sessions_are_dropped_beyond_the_limit():
+    server = _server(max_sessions=2)
+
+    async def scenario() -> None:
+        for session_id in ["a", "b", "a", "c"]:
+            await server.run_turn(session_id, "hello")
+
+    asyncio.run(scenario())
+    assert list(server.sessions) == ["a", "c"]
+    assert len(server.sessions["a"].history) == 4
+
+
+def test_idle_sessions_are_dropped_after_their_ttl():
+    server = _server(session_ttl=60)
+
+    async def scenario() -> None:
+        await server.run_turn("idle", "hello")
+        await server.run_turn("active", "hello")
+        server.sessions["idle"].last_used -= 120
+        await server.run_turn("active", "again")
+
+    asyncio.run(scenario())
+    assert list(server.sessions) == ["active"]
+
+
+def test_sessions_with_a_turn_in_progress_are_kept():
+    async def scenario() -> SessionServer:
+        release = asyncio.Event()
+        server = _server(release, max_sessions=1)
+        busy = asyncio.create_task(server.run_turn("busy", "hello"))
+        await asyncio.sleep(0.01)
+        other = asyncio.create_task(server.run_turn("other", "hello"))
+        await asyncio.sleep(0.01)
+        assert set(server.sessions) == {"busy", "other"}
+        release.set()
+        await asyncio.gather(busy, other)
+        return server
+
+    server = asyncio.run(scenario())
+    assert len(server.sessions["busy"].history) == 2
+
+
+def test_close_request_forgets_the_session():
+    server = _server()
+
+    async def scenario() -> list[dict]:
+        return [
+            await server.handle_line(json.dumps(request).encode())
+            for request in [
+                {"session_id": "a", "input": "hello"},
+                {"session_id": "a", "close": True},
+                {"session_id": "a", "close": True},
+                {"close": True},
+            ]
+        ]
+
+    opened, closed, again, missing = asyncio.run(scenario())
+    assert opened == {"session_id": "a", "output": "1 messages"}
+    assert closed == {"session_id": "a", "closed": True}
+    assert again == {"session_id": "a", "closed": False}
+    assert missing["error"] == "bad_request"
+    assert not server.sessions
@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+import sqlite3
+import threading
+
+from src.repositories import SQLiteDatabase, SQLiteJobRepository
+from src.schemas import Job, JobStatus
+from src.utils import prefixed_uuid
+
+TOKYO = timezone(timedelta(hours=9))
+
+
+def _job(name: str, deadline: datetime) -> Job:
+    return Job(id=prefixed_uuid("job"), name=name, deadline=deadline, status=JobStatus.PENDING)
+
+
+def test_cancelled_write_rolls_back_and_returns_its_connection(tmp_path):
+    async def scenario() -> None:
+        database = SQLiteDatabase(str(tmp_path / "jobs.db"), pool_size=1)
+        jobs = SQLiteJobRepository(database)
+        started, release = threading.Event(), threading.Event()
+
+        def slow_insert(conn: sqlite3.Connection) -> None:
+            conn.execute("INSERT INTO jobs (id, name, deadline, status) VALUES ('job_x', 'x', '', 'pending')")
+            started.set()
+            release.wait()
+
+        write = asyncio.create_task(database.transaction(slow_insert))
+        await asyncio.to_thread(started.wait)
+        write.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        try:
+            await write
+        except asyncio.CancelledError:
+            pass
+        assert write.cancelled()
+
+        assert await jobs.count() == 0
+        assert await jobs.current_version() == 0
+        await jobs.add(_job("after", datetime(2026, 3, 1)))
+        assert (await jobs.count(), await jobs.current_version()) == (1, 1)
+        database.close()
+
+    asyncio.run(scenario())
+
+
+def test_deadlines_with_any_offset_are_stored_and_queried_as_utc(tmp_path):
+    async def scenario() -> None:
+        database = SQLiteDatabase(str(tmp_path / "jobs.db"))
+        jobs = SQLiteJobRepository(database)
+        await jobs.add(_job("utc 01:00", datetime(2026, 3, 1, 1, tzinfo=timezone.utc)))
+        await jobs.add(_job("tokyo 09:30", datetime(2026, 3, 1, 9, 30, tzinfo=TOKYO)))  # 00:30 UTC
+        await jobs.add(_job("naive 00:45", datetime(2026, 3, 1, 0, 45)))
+        assert [job.name for job in await jobs.query()] == ["tokyo 09:30", "naive 00:45", "utc 01:00"]
+        later = await jobs.query(gte_date=datetime(2026, 3, 1, 9, 40, tzinfo=TOKYO))
+        assert [job.name for job in later] == ["naive 00:45", "utc 01:00"]
+        tokyo = next(job for job in await jobs.query() if job.name == "tokyo 09:30")
+        assert tokyo.deadline == datetime(2026, 3, 1, 9, 30, tzinfo=TOKYO)
+        database.close()
+
+    asyncio.run(scenario())
+
+
+def test_opening_an_old_database_rewrites_timestamps_as_utc(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    SQLiteDatabase(path).close()
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO jobs VALUES ('job_old', 'old', '2026-03-01T09:30:00+09:00', 'pending')")
+    conn.close()
+
+    database = SQLiteDatabase(path)
+    stored = database._connections[0].execute("SELECT deadline FROM jobs").fetchone()[0]
+    assert stored == "2026-03-01T00:30:00.000000+00:00"
+    database.close()
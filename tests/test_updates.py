@@ -0,0 +1,72 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from src.repositories import InMemoryApprovalRepository, InMemoryJobRepository, SQLiteDatabase, SQLiteJobRepository
+from src.schemas import Approval, ApprovalStatus, ApprovalUpdate, Job, JobStatus, JobUpdate
+from src.stores import ApprovalStore, ColumnarApprovalStore, ColumnarJobStore, JobStore
+from src.utils import prefixed_uuid
+
+
+def _jobs() -> list[Job]:
+    return [
+        Job(id=prefixed_uuid("job"), name=f"job {i}", deadline=datetime(2026, 3, 1 + i), status=JobStatus.PENDING)
+        for i in range(2)
+    ]
+
+
+@pytest.mark.parametrize("update_type, field", [(JobUpdate, "name"), (JobUpdate, "status"), (ApprovalUpdate, "person")])
+def test_updates_reject_null_for_required_fields(update_type, field):
+    with pytest.raises(ValidationError):
+        update_type(id="some_id", **{field: None})
+    assert update_type(id="some_id").model_dump(exclude_unset=True) == {"id": "some_id"}
+
+
+@pytest.mark.parametrize("store_type", [JobStore, ColumnarJobStore])
+def test_job_update_many_applies_nothing_if_any_update_is_invalid(store_type):
+    jobs = _jobs()
+    repository = InMemoryJobRepository(store_type(jobs))
+
+    async def scenario() -> None:
+        with pytest.raises(ValidationError):
+            await repository.update_many({jobs[0].id: {"status": JobStatus.COMPLETED}, jobs[1].id: {"deadline": None}})
+        assert [job.status for job in await repository.query()] == [JobStatus.PENDING] * 2
+        assert (await repository.status_counts())[JobStatus.COMPLETED] == 0
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("store_type", [ApprovalStore, ColumnarApprovalStore])
+def test_approval_update_many_applies_nothing_if_any_update_is_invalid(store_type):
+    approvals = [
+        Approval(id=prefixed_uuid("approval"), person=person, request="deploy", status=ApprovalStatus.PENDING)
+        for person in ("ann", "bob")
+    ]
+    repository = InMemoryApprovalRepository(store_type(approvals))
+
+    async def scenario() -> None:
+        with pytest.raises(ValidationError):
+            await repository.update_many({approvals[0].id: {"person": "cy"}, approvals[1].id: {"status": "unknown"}})
+        assert (await repository.get(approvals[0].id)).person == "ann"
+        assert (await repository.status_counts(person="cy"))[ApprovalStatus.PENDING] == 0
+
+    asyncio.run(scenario())
+
+
+def test_sqlite_update_many_applies_nothing_if_any_update_is_invalid(tmp_path):
+    jobs = _jobs()
+
+    async def scenario() -> None:
+        database = SQLiteDatabase(str(tmp_path / "jobs.db"))
+        repository = SQLiteJobRepository(database)
+        await repository.add_many(jobs)
+        version = await repository.current_version()
+        with pytest.raises(ValidationError):
+            await repository.update_many({jobs[0].id: {"name": "renamed"}, jobs[1].id: {"status": None}})
+        assert [job.name for job in await repository.query()] == ["job 0", "job 1"]
+        assert await repository.current_version() == version
+        database.close()
+
+    asyncio.run(scenario())
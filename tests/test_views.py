@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from src.repositories import (
+    CopyOnWriteApprovalRepository,
+    CopyOnWriteJobRepository,
+    InMemoryApprovalRepository,
+    InMemoryJobRepository,
+)
+from src.schemas import Approval, ApprovalStatus, Job, JobStatus
+from src.stores import ApprovalStore, ColumnarApprovalStore, ColumnarJobStore, JobStore
+from src.utils import prefixed_uuid
+
+
+def _job(name: str) -> Job:
+    return Job(id=prefixed_uuid("job"), name=name, deadline=datetime(2026, 3, 1, tzinfo=timezone.utc), status=JobStatus.PENDING)
+
+
+@pytest.mark.parametrize("store_type", [JobStore, ColumnarJobStore])
+def test_job_snapshot_ignores_later_source_writes(store_type):
+    async def scenario():
+        kept, changed = _job("kept"), _job("changed")
+        source = InMemoryJobRepository(store_type([kept, changed]))
+        view = CopyOnWriteJobRepository(source)
+        await source.update(changed.id, {"status": JobStatus.COMPLETED})
+        await source.delete(kept.id)
+        await source.add(_job("added later"))
+        assert (await view.get(changed.id)).status == JobStatus.PENDING
+        assert await view.get(kept.id) is not None
+        assert await view.count() == 2
+        assert (await view.status_counts())[JobStatus.PENDING] == 2
+        assert [job.name for job in await view.query()] == ["kept", "changed"]
+        assert (await view.search("changed")).total == 1
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("store_type", [JobStore, ColumnarJobStore])
+def test_job_snapshot_writes_stay_private(store_type):
+    async def scenario():
+        job = _job("original")
+        source = InMemoryJobRepository(store_type([job]))
+        view = CopyOnWriteJobRepository(source)
+        await view.update(job.id, {"name": "renamed"})
+        await view.add(_job("extra"))
+        assert (await source.get(job.id)).name == "original"
+        assert await source.count() == 1
+        assert (await source.search("renamed")).total == 0
+        assert (await view.get(job.id)).name == "renamed"
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("store_type", [ApprovalStore, ColumnarApprovalStore])
+def test_approval_snapshot_is_isolated_both_ways(store_type):
+    async def scenario():
+        job_id = prefixed_uuid("job")
+        approval = Approval(id=prefixed_uuid("approval"), person="Ada", request="budget", status=ApprovalStatus.PENDING, job_id=job_id)
+        source = InMemoryApprovalRepository(store_type([approval]))
+        view = CopyOnWriteApprovalRepository(source)
+        await source.update(approval.id, {"status": ApprovalStatus.APPROVED})
+        assert await view.pending_for_job(job_id) == 1
+        assert (await view.status_counts("Ada"))[ApprovalStatus.PENDING] == 1
+        await view.delete(approval.id)
+        assert await source.pending_for_job(job_id) == 0
+        assert [record.id for record in await source.for_job(job_id)] == [approval.id]
+        assert await view.for_job(job_id) == []
+
+    asyncio.run(scenario())
+
+
+def test_update_replaces_records_instead_of_changing_them():
+    job = _job("original")
+    store = JobStore([job])
+    updated = store.update(job.id, {"name": "renamed"})
+    assert job.name == "original"
+    assert store.get(job.id) is updated